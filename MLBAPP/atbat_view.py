@@ -0,0 +1,164 @@
+import threading
+
+from win_probability import state_win_probability
+
+
+def _batting_line(player):
+    stats = (player or {}).get('seasonStats', {}).get('batting', {})
+    return {key: stats.get(key) for key in ('avg', 'homeRuns', 'rbi', 'ops')}
+
+
+def _pitching_line(player):
+    stats = (player or {}).get('seasonStats', {}).get('pitching', {})
+    return {key: stats.get(key) for key in ('era', 'wins', 'losses', 'strikeOuts', 'whip')}
+
+
+def compact_pitch(event):
+    """The few fields the strike zone plot needs from a pitch event"""
+    details = event.get('details', {})
+    pitch_data = event.get('pitchData', {})
+    coordinates = pitch_data.get('coordinates', {})
+    return {
+        'pitchNumber': event.get('pitchNumber'),
+        'description': details.get('description') or details.get('call', {}).get('description'),
+        'type': details.get('type', {}).get('code'),
+        'startSpeed': pitch_data.get('startSpeed'),
+        'x': coordinates.get('x'),
+        'y': coordinates.get('y'),
+        'pX': coordinates.get('pX'),
+        'pZ': coordinates.get('pZ'),
+        'count': event.get('count'),
+    }
+
+
+def occupied_bases(linescore, current_play):
+    """Which bases have a runner on them right now"""
+    offense = linescore.get('offense')
+    if offense is not None:
+        return {base: base in offense for base in ('first', 'second', 'third')}
+    bases = {'first': False, 'second': False, 'third': False}
+    names = {'1B': 'first', '2B': 'second', '3B': 'third'}
+    for runner in current_play.get('runners', []):
+        start = runner.get('movement', {}).get('start')
+        if start in names:
+            bases[names[start]] = True
+    return bases
+
+
+class AtBatView:
+    """Small precomputed view of a game's current at-bat, kept up to date from feed/live
+
+    Each update only looks at the game header and the current play; pitches already in the view
+    are not touched again, so the cost doesn't grow as the game goes on.
+    """
+
+    def __init__(self, game_pk):
+        self._lock = threading.Lock()
+        self.game_pk = game_pk
+        self.version = 0
+        self._feed = None
+        self._at_bat_index = None
+        self._pitch_events = 0
+        self._view = {'gamePk': game_pk, 'version': 0, 'pitches': []}
+
+    def update(self, feed):
+        """Bring the view up to date with a feed/live document; returns whether it changed"""
+        with self._lock:
+            if feed is self._feed:
+                return False
+            self._feed = feed
+            game_data = feed.get('gameData', {})
+            live_data = feed.get('liveData', {})
+            linescore = live_data.get('linescore', {})
+            current_play = live_data.get('plays', {}).get('currentPlay') or {}
+            about = current_play.get('about', {})
+
+            view = dict(self._view)
+            view['status'] = game_data.get('status', {}).get('abstractGameState')
+            view['detailedState'] = game_data.get('status', {}).get('detailedState')
+            view['dateTime'] = game_data.get('datetime', {}).get('dateTime')
+            view['teams'] = {
+                side: {
+                    'id': game_data.get('teams', {}).get(side, {}).get('id'),
+                    'name': game_data.get('teams', {}).get(side, {}).get('name'),
+                    'runs': linescore.get('teams', {}).get(side, {}).get('runs', 0),
+                }
+                for side in ('away', 'home')
+            }
+            view['inning'] = {'num': about.get('inning'), 'half': about.get('halfInning')}
+            count = current_play.get('count', {})
+            view['count'] = {key: count.get(key, 0) for key in ('balls', 'strikes', 'outs')}
+            view['bases'] = occupied_bases(linescore, current_play)
+            # One table lookup on the current state; no play history needed
+            view['winProbability'] = state_win_probability(
+                about.get('inning'), about.get('isTopInning', True), view['count']['outs'],
+                [base for base, name in (('1B', 'first'), ('2B', 'second'), ('3B', 'third')) if view['bases'][name]],
+                view['teams']['away']['runs'], view['teams']['home']['runs'])
+
+            at_bat_index = about.get('atBatIndex')
+            events = current_play.get('playEvents', [])
+            if at_bat_index != self._at_bat_index or len(events) < self._pitch_events:
+                # A new at-bat: look up the matchup and stat lines once
+                view['matchup'] = self._matchup(current_play, live_data.get('boxscore', {}))
+                view['pitches'] = []
+                self._at_bat_index = at_bat_index
+                self._pitch_events = 0
+            if len(events) > self._pitch_events:
+                view['pitches'] = view['pitches'] + [
+                    compact_pitch(event) for event in events[self._pitch_events:] if event.get('isPitch')
+                ]
+                self._pitch_events = len(events)
+
+            changed = any(view.get(key) != self._view.get(key) for key in view if key != 'version')
+            if changed:
+                self.version += 1
+                view['version'] = self.version
+                self._view = view
+            return changed
+
+    def _matchup(self, current_play, boxscore):
+        matchup = current_play.get('matchup', {})
+        batter = matchup.get('batter') or {}
+        pitcher = matchup.get('pitcher') or {}
+        players = {}
+        for side in ('away', 'home'):
+            players.update(boxscore.get('teams', {}).get(side, {}).get('players', {}))
+        if not batter and not pitcher:
+            return None
+        return {
+            'batter': {
+                'id': batter.get('id'),
+                'fullName': batter.get('fullName'),
+                'batSide': matchup.get('batSide', {}).get('code'),
+                'stats': _batting_line(players.get(f"ID{batter.get('id')}")),
+            },
+            'pitcher': {
+                'id': pitcher.get('id'),
+                'fullName': pitcher.get('fullName'),
+                'pitchHand': matchup.get('pitchHand', {}).get('code'),
+                'stats': _pitching_line(players.get(f"ID{pitcher.get('id')}")),
+            },
+        }
+
+    def payload(self):
+        with self._lock:
+            return self._view
+
+
+class AtBatViews:
+    """At-bat views for every game being followed, keyed by data source and gamePk"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def get(self, source, game_pk):
+        with self._lock:
+            view = self._views.get((source, game_pk))
+            if view is None:
+                view = self._views[(source, game_pk)] = AtBatView(game_pk)
+            return view
+
+    def discard(self, source, game_pk):
+        with self._lock:
+            self._views.pop((source, game_pk), None)
@@ -0,0 +1,141 @@
+"""Capture a full synthetic slate with the capture daemon against a local stub of the Stats API
+
+The stub plays a slate of synthetic games forward in real time, one new moment per game every
+--step seconds, serving the schedule, feed/live, timestamps and diffPatch. The daemon records it
+all into a temporary archive; the per-game lag and request counts are printed at the end.
+
+    python bench_capture.py [--games 15] [--moments 20] [--step 1] [--workers 4]
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from capture_daemon import CaptureDaemon
+from schedule_service import ScheduleService
+from synthetic import build_game, generate_season, synthetic_teams
+from time_travel import TimeTravelStore, json_diff
+
+
+class SlateStub:
+    """A local Stats API whose games each move on a moment every step seconds until they're final"""
+
+    def __init__(self, games=15, moments=20, step=1):
+        schedule = generate_season(synthetic_teams(games * 2), days=1)
+        self.date = schedule['dates'][0]['date']
+        self.games = {game['gamePk']: (game, build_game(game)['feed']) for game in schedule['dates'][0]['games']}
+        self.moments = moments
+        self.step = step
+        # Timecodes have whole seconds; start on one so each moment gets its own
+        self.started = math.ceil(time.time())
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                url = urlsplit(self.path)
+                body = stub.answer(url.path, {key: values[0] for key, values in parse_qs(url.query).items()})
+                data = json.dumps(body).encode('utf-8') if body is not None else b'{}'
+                self.send_response(200 if body is not None else 404)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def current(self):
+        """Index of the latest moment every game has reached"""
+        return max(min(int((time.time() - self.started) // self.step), self.moments - 1), 0)
+
+    def timecode(self, moment):
+        moment_time = datetime.datetime.fromtimestamp(self.started + moment * self.step, datetime.timezone.utc)
+        return moment_time.strftime('%Y%m%d_%H%M%S')
+
+    def feed(self, game_pk, moment):
+        """The game's feed as of a moment: a share of its plays, live until the last moment"""
+        _, feed = self.games[game_pk]
+        plays = feed['liveData']['plays']['allPlays']
+        count = max(math.ceil(len(plays) * moment / (self.moments - 1)), 1)
+        state = 'Final' if moment == self.moments - 1 else 'Live'
+        return dict(
+            feed,
+            metaData=dict(feed['metaData'], timeStamp=self.timecode(moment), wait=self.step),
+            gameData=dict(feed['gameData'], status=dict(feed['gameData']['status'], abstractGameState=state)),
+            liveData=dict(feed['liveData'], plays=dict(feed['liveData']['plays'], allPlays=plays[:count])),
+        )
+
+    def answer(self, path, params):
+        current = self.current()
+        if path == '/api/v1/schedule':
+            state = 'Final' if current == self.moments - 1 else 'Live'
+            games = [dict(game, status=dict(game['status'], abstractGameState=state)) for game, _ in self.games.values()]
+            return {'dates': [{'date': self.date, 'games': games}]}
+        parts = path.split('/')
+        if len(parts) < 6 or not parts[4].isdigit() or int(parts[4]) not in self.games:
+            return None
+        game_pk = int(parts[4])
+        if path.endswith('/feed/live'):
+            return self.feed(game_pk, current)
+        if path.endswith('/timestamps'):
+            return [self.timecode(moment) for moment in range(current + 1)]
+        if path.endswith('/diffPatch'):
+            timecodes = [self.timecode(moment) for moment in range(current + 1)]
+            start = params.get('startTimecode')
+            if start not in timecodes:
+                return self.feed(game_pk, current)
+            first = timecodes.index(start)
+            return [{'diff': json_diff(self.feed(game_pk, moment), self.feed(game_pk, moment + 1))}
+                    for moment in range(first, current)]
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--moments', type=int, default=20)
+    parser.add_argument('--step', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    archive = tempfile.mkdtemp(prefix='mlbapp-capture-')
+    with SlateStub(args.games, args.moments, args.step) as stub:
+        schedule = ScheduleService(os.path.join(tempfile.mkdtemp(prefix='mlbapp-schedule-'), 'schedule.sqlite3'),
+                                   base_url=stub.base_url)
+        started = time.perf_counter()
+        daemon = CaptureDaemon(archive, stub.date, args.workers, stub.base_url, rate=200, schedule=schedule)
+        metrics = daemon.run(duration=args.moments * args.step + 30)
+        elapsed = time.perf_counter() - started
+    store = TimeTravelStore(archive)
+    complete = sum(len(store.timecodes(game_pk)) == args.moments for game_pk in stub.games)
+    lags = [game['lagSecondsAvg'] for game in metrics.values()]
+    print(f"{len(metrics)} games, {args.workers} workers, {elapsed:.1f} s, {stub.requests} stub requests")
+    print(f"  every moment recorded for {complete}/{len(stub.games)} games")
+    print(f"  lag since the last successful poll: avg {sum(lags) / len(lags):.2f} s, "
+          f"worst game max {max(game['lagSecondsMax'] for game in metrics.values()):.2f} s")
+    print(f"  archive: {archive}")
+
+
+if __name__ == '__main__':
+    main()
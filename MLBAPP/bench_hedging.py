@@ -0,0 +1,86 @@
+"""Measure what hedged GETs do to tail latency against a stub upstream with latency spikes
+
+The stub answers in a couple of milliseconds, except that every spike_every-th request it
+receives stalls for spike_ms. The same sequence of requests is sent through a scheduler with
+hedging off and one with hedging on.
+
+    python bench_hedging.py [--requests 300] [--spike-every 33] [--spike-ms 300]
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from upstream_scheduler import UpstreamScheduler
+
+
+class LatencyStub:
+    """A local HTTP server that answers fast, but stalls on every spike_every-th request"""
+
+    def __init__(self, spike_every=33, spike_ms=300, base_ms=2):
+        counter = itertools.count(1)
+        body = json.dumps({'ok': True}).encode('utf-8')
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                number = next(counter)
+                time.sleep((spike_ms if number % spike_every == 0 else base_ms) / 1000)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1/game/%d/playByPlay"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def run(hedge, requests_count, spike_every, spike_ms):
+    """Latencies in seconds of requests_count sequential GETs through a fresh scheduler and stub"""
+    scheduler = UpstreamScheduler(rate=10000, burst=100, hedge=hedge)
+    latencies = []
+    with LatencyStub(spike_every, spike_ms) as stub:
+        for number in range(requests_count):
+            started = time.perf_counter()
+            response = scheduler.get(stub.url % (776000 + number), timeout=5)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return latencies, scheduler.stats()['hedges']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--spike-every', type=int, default=33)
+    parser.add_argument('--spike-ms', type=int, default=300)
+    args = parser.parse_args()
+
+    for hedge in (False, True):
+        latencies, hedges = run(hedge, args.requests, args.spike_every, args.spike_ms)
+        print(f"hedging {'on ' if hedge else 'off'}: "
+              + ', '.join(f"p{int(q * 100)} {percentile(latencies, q) * 1000:6.1f} ms" for q in (0.5, 0.95, 0.99))
+              + f", max {max(latencies) * 1000:6.1f} ms, hedges sent {hedges['sent']}, won {hedges['won']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Measure how much memory interning shared reference objects saves in the data cache
+
+Caches the recorded sections of mlbtests_output.txt and a synthetic slate's schedule, boxscores,
+play-by-play and feeds, each decoded from its own JSON text the way the cache receives them, once
+as decoded and once through the reference interner. Reports the memory each cache holds.
+
+    python bench_interning.py [--games 15]
+"""
+import argparse
+import datetime
+import gc
+import json
+import time
+import tracemalloc
+
+from bench_snapshot_store import recorded_sections
+from cache import SourceCache
+from interning import ReferenceInterner
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+
+def slate_bodies(games):
+    """(key, JSON text) for every payload the app would cache for a day's slate"""
+    schedule = generate_season(synthetic_teams(max(games * 2, 2)), start_date=datetime.date(2025, 5, 1), days=1)
+    yield 'schedule', json.dumps(schedule)
+    for game, documents in iter_season_documents(schedule):
+        for section, document in documents.items():
+            yield f"{game['gamePk']}/{section}", json.dumps(document)
+    for name, document in recorded_sections():
+        yield 'recorded' + name, json.dumps(document)
+
+
+def retained(bodies, intern):
+    """Bytes held by a cache filled with the bodies, and the seconds it took to fill it"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    cache = SourceCache(intern=intern)
+    for key, body in bodies:
+        cache.set('live', key, json.loads(body))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, elapsed, cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=15)
+    args = parser.parse_args()
+
+    bodies = list(slate_bodies(args.games))
+    plain, plain_time, _ = retained(bodies, None)
+    interner = ReferenceInterner()
+    interned, interned_time, _ = retained(bodies, interner.intern)
+
+    print(f"payloads: {len(bodies)}  JSON: {sum(len(body) for _, body in bodies) / 1e6:.1f} MB")
+    print(f"  as decoded:  {plain / 1e6:8.1f} MB  ({plain_time:.2f} s to fill)")
+    print(f"  interned:    {interned / 1e6:8.1f} MB  ({interned_time:.2f} s to fill)")
+    print(f"  saved {1 - interned / plain:.0%}; {interner.stats['entities']} shared entities "
+          f"for {len(interner)} links, reused {interner.stats['shared']} times")
+
+
+if __name__ == '__main__':
+    main()
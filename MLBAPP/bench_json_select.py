@@ -0,0 +1,85 @@
+"""Benchmark decoding only the at-bat paths of feed/live against decoding the whole document
+
+Each payload is decoded with json.loads and with select_paths for the paths the at-bat view
+reads, timing the best of several runs and measuring peak memory with tracemalloc. Pass recorded
+feed/live bodies (as saved from the API, e.g. with curl) to measure those; without any, synthetic
+games are generated and pretty-printed the way the API sends them.
+
+    python bench_json_select.py [feed.json ...] [--games 5] [--repeat 10]
+"""
+import argparse
+import datetime
+import json
+import time
+import tracemalloc
+
+from json_select import select_paths, prune
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+# Same paths as ATBAT_FEED_PATHS in app.py, without importing the app
+PATHS = ('gameData.status', 'gameData.datetime', 'gameData.teams',
+         'liveData.linescore', 'liveData.plays.currentPlay', 'liveData.boxscore')
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def synthetic_payloads(games):
+    schedule = generate_season(synthetic_teams(max(games * 2, 2)), start_date=datetime.date(2025, 5, 1), days=1)
+    payloads = []
+    for game, documents in iter_season_documents(schedule):
+        payloads.append((f"synthetic {game['gamePk']}", json.dumps(documents['feed'], indent=2).encode('utf-8')))
+        if len(payloads) == games:
+            break
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    payloads = []
+    for name in args.files:
+        with open(name, 'rb') as f:
+            payloads.append((name, f.read()))
+    if not payloads:
+        payloads = synthetic_payloads(args.games)
+
+    print(f"{'payload':<24} {'size':>8} {'json.loads':>12} {'select':>10} {'loads peak':>11} {'select peak':>12}")
+    totals = [0.0, 0.0]
+    for name, body in payloads:
+        if select_paths(body, PATHS) != prune(json.loads(body), PATHS):
+            raise SystemExit(f"select_paths disagrees with json.loads on {name}")
+        full = best_time(lambda: json.loads(body), args.repeat)
+        selected = best_time(lambda: select_paths(body, PATHS), args.repeat)
+        full_peak = peak_memory(lambda: json.loads(body))
+        selected_peak = peak_memory(lambda: select_paths(body, PATHS))
+        totals[0] += full
+        totals[1] += selected
+        print(f"{name[-24:]:<24} {len(body) / 1e6:6.2f}MB {full * 1000:10.2f}ms {selected * 1000:8.2f}ms "
+              f"{full_peak / 1e6:9.1f}MB {selected_peak / 1e6:10.1f}MB")
+    print(f"Decode time, all payloads: {totals[0] * 1000:.1f} ms full, {totals[1] * 1000:.1f} ms selected "
+          f"({totals[0] / max(totals[1], 1e-9):.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
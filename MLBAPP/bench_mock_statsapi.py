@@ -0,0 +1,140 @@
+"""Measure how many requests a second the mock Stats API sustains, with no network involved
+
+Starts mock_statsapi.py in its own process and drives it from --connections keep-alive
+connections, cycling through a mix of recorded, synthetic and schema-generated endpoints
+(--large adds whole playByPlay and feed/live documents). With --proxy it then times the app's
+own routes in live mode against the mock instead.
+
+    python bench_mock_statsapi.py [--connections 32] [--requests 20000] [--large] [--proxy]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SMALL_TARGETS = [
+    '/api/v1/gameStatus',
+    '/api/v1/jobTypes',
+    '/api/v1/game/776570/linescore',
+    '/api/v1/people/660271',
+    '/api/v1/teams/147/roster',
+    '/api/v1/venues/3313',
+    '/api/v1.1/game/776570/feed/live/timestamps',
+    '/api/v1/schedule?sportId=1&date=2025-08-27',
+]
+LARGE_TARGETS = [
+    '/api/v1/game/776570/playByPlay',
+    '/api/v1.1/game/776570/feed/live',
+    '/api/v1/game/776570/boxscore',
+]
+
+PROXY_ROUTES = [
+    '/api/scoreboard?source=live',
+    '/api/game/776570/boxscore?source=live',
+    '/api/game/776570/playByPlay?source=live',
+    '/api/game/776570/atbat?source=live',
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(port, *options):
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, 'mock_statsapi.py'), '--port', str(port), *options],
+                               stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('mock Stats API did not start')
+
+
+async def client(port, targets, count, offset, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for number in range(count):
+        target = targets[(offset + number) % len(targets)]
+        started = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: mock\r\nAccept-Encoding: gzip\r\n\r\n".encode('latin-1'))
+        await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':', 1)[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+async def load(port, targets, connections, requests):
+    latencies = []
+    per_connection = requests // connections
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, targets, per_connection, index, latencies) for index in range(connections)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def run_proxy(port, rounds):
+    """Time the app's live routes with upstream pointed at the mock"""
+    os.environ['MLB_API_BASE_URL'] = f'http://127.0.0.1:{port}'
+    os.environ.setdefault('MLB_UPSTREAM_RATE', '100000')
+    # Keep the app's on-disk caches away from the real ones
+    scratch = tempfile.mkdtemp(prefix='mlbapp-bench-')
+    for name, path in (('MLB_SHARED_CACHE', 'shared_cache.sqlite3'), ('MLB_HTTP_CACHE', 'http_cache.sqlite3'),
+                       ('MLB_SEASON_STATS', 'season_stats'), ('MLB_PLAY_INDEX', 'play_index'),
+                       ('MLB_TIME_TRAVEL', 'time_travel'), ('MLB_SCHEDULE_CACHE', 'schedule_cache.sqlite3')):
+        os.environ[name] = os.path.join(scratch, path)
+    sys.path.insert(0, HERE)
+    import app as mlb_app
+    client = mlb_app.app.test_client()
+    for route in PROXY_ROUTES:
+        client.get(route)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            client.get(route)
+        elapsed = time.perf_counter() - started
+        print(f"  {route:45s} {rounds / elapsed:8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--large', action='store_true')
+    parser.add_argument('--proxy', action='store_true')
+    args = parser.parse_args()
+
+    port = free_port()
+    process = start_mock(port)
+    try:
+        targets = SMALL_TARGETS + (LARGE_TARGETS if args.large else [])
+        # Warm the mock's response cache, then measure
+        asyncio.run(load(port, targets, 1, len(targets)))
+        elapsed, latencies = asyncio.run(load(port, targets, args.connections, args.requests))
+        print(f"{len(latencies)} requests over {args.connections} connections in {elapsed:.2f} s: "
+              f"{len(latencies) / elapsed:.0f} req/s, p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+        if args.proxy:
+            print("app routes in live mode against the mock:")
+            run_proxy(port, 200)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
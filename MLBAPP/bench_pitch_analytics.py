@@ -0,0 +1,109 @@
+"""Benchmark the columnar pitch analytics on a season-sized synthetic dataset
+
+Generates a synthetic season (30 teams, 162 days by default, ~900k pitches), ingests every game
+into a PitchAnalytics table and times each query. For comparison it also times the same pitch-mix
+question answered by looping over the nested play dicts, on a sample of games, and scales that
+up to the full season.
+
+    python bench_pitch_analytics.py [--days 162] [--teams 30] [--naive-games 200]
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from pitch_analytics import PitchAnalytics
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+
+def naive_pitch_mix(games, pitcher):
+    """Pitch mix by walking the nested play dicts, as a route would without the columnar table"""
+    counts = defaultdict(int)
+    speeds = defaultdict(float)
+    for all_plays in games:
+        for play in all_plays:
+            if play.get('matchup', {}).get('pitcher', {}).get('id') != pitcher:
+                continue
+            for event in play.get('playEvents', []):
+                if event.get('isPitch'):
+                    code = event.get('details', {}).get('type', {}).get('code')
+                    counts[code] += 1
+                    speeds[code] += event.get('pitchData', {}).get('startSpeed') or 0.0
+    return {code: (counts[code], speeds[code] / counts[code]) for code in counts}
+
+
+def timed(label, function, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<42} {best * 1000:9.2f} ms")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=162)
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--naive-games', type=int, default=200)
+    args = parser.parse_args()
+
+    schedule = generate_season(synthetic_teams(args.teams), days=args.days)
+    engine = PitchAnalytics()
+    sample = []
+    games = 0
+    generate_seconds = ingest_seconds = 0.0
+
+    print(f"Generating and ingesting {args.days} days for {args.teams} teams...")
+    documents = iter_season_documents(schedule)
+    while True:
+        started = time.perf_counter()
+        try:
+            game, document = next(documents)
+        except StopIteration:
+            break
+        generate_seconds += time.perf_counter() - started
+        all_plays = document['playByPlay']['allPlays']
+
+        started = time.perf_counter()
+        engine.ingest(game['gamePk'], all_plays, game.get('gameDate'))
+        ingest_seconds += time.perf_counter() - started
+
+        if len(sample) < args.naive_games:
+            sample.append(all_plays)
+        games += 1
+
+    started = time.perf_counter()
+    columns = engine.table.columns
+    ingest_seconds += time.perf_counter() - started
+    pitches = len(columns['game_pk'])
+    size = sum(column.nbytes for column in columns.values())
+    print(f"  games: {games}  pitches: {pitches}  table size: {size / 1e6:.1f} MB")
+    print(f"  synthetic generation: {generate_seconds:.1f} s")
+    print(f"  ingest: {ingest_seconds:.2f} s ({pitches / max(ingest_seconds, 1e-9):,.0f} pitches/s)")
+
+    # The busiest pitcher makes the per-pitcher queries as heavy as they get
+    pitcher_ids, counts = np.unique(columns['pitcher'], return_counts=True)
+    pitcher = int(pitcher_ids[np.argmax(counts)])
+    batter_ids, counts = np.unique(columns['batter'], return_counts=True)
+    batter = int(batter_ids[np.argmax(counts)])
+
+    print("Vectorized queries over the full season:")
+    vectorized, _ = timed('pitch mix (one pitcher)', lambda: engine.pitch_mix(pitcher))
+    timed('velocity distribution (one pitcher)', lambda: engine.velocity_distribution(pitcher))
+    timed('batter vs pitch type (one batter)', lambda: engine.batter_vs_pitch_type(batter))
+    timed('zone heatmap (every pitch)', lambda: engine.zone_heatmap())
+    timed('zone heatmap (one pitch type)', lambda: engine.zone_heatmap(pitch_type='FF'))
+
+    print(f"Nested-dict loop on {len(sample)} games, scaled to {games}:")
+    naive, _ = timed('pitch mix (one pitcher)', lambda: naive_pitch_mix(sample, pitcher), repeat=3)
+    scaled = naive * games / max(len(sample), 1)
+    print(f"  {'pitch mix, scaled to the season':<42} {scaled * 1000:9.2f} ms")
+    print(f"Speedup for pitch mix: {scaled / vectorized:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark play search on a season-sized synthetic dataset
+
+Indexes every play of a synthetic season (30 teams, 162 days by default, ~220k plays), writes
+the index to a temporary directory, reloads it and times a set of typical searches.
+
+    python bench_play_index.py [--days 162] [--teams 30]
+"""
+import argparse
+import tempfile
+import time
+
+from play_index import PlayIndex
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+
+def timed(label, function, repeat=20):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<48} {best * 1000:8.3f} ms  ({result['total']} plays)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=162)
+    parser.add_argument('--teams', type=int, default=30)
+    args = parser.parse_args()
+
+    schedule = generate_season(synthetic_teams(args.teams), days=args.days)
+    path = tempfile.mkdtemp(prefix='mlbapp-play-index-')
+    index = PlayIndex(path)
+    indexing = 0.0
+    first_game = None
+    print(f"Generating and indexing {args.days} days for {args.teams} teams...")
+    for game, documents in iter_season_documents(schedule):
+        started = time.perf_counter()
+        index.add_plays(game['gamePk'], documents['playByPlay']['allPlays'], game['gameDate'])
+        indexing += time.perf_counter() - started
+        first_game = first_game or documents['playByPlay']['allPlays']
+    started = time.perf_counter()
+    index.flush()
+    indexing += time.perf_counter() - started
+    print(f"  plays: {len(index)}  indexing: {indexing:.2f} s")
+
+    started = time.perf_counter()
+    index = PlayIndex(path)
+    print(f"  reload from disk: {time.perf_counter() - started:.2f} s")
+
+    batter = first_game[0]['matchup']['batter']['id']
+    pitcher = first_game[0]['matchup']['pitcher']['id']
+    dates = schedule['dates']
+    month_start, month_end = dates[len(dates) // 2]['date'], dates[min(len(dates) // 2 + 30, len(dates) - 1)]['date']
+
+    print("Searches over the full season:")
+    timed('home runs by one batter', lambda: index.search(event_type='home_run', batter=batter))
+    timed('bases-loaded walks in a month', lambda: index.search(event_type='walk', men_on_base='Loaded',
+                                                                start_date=month_start, end_date=month_end))
+    timed('strikeouts by one pitcher', lambda: index.search(event_type='strikeout', pitcher=pitcher))
+    timed('"homers left field" in the 9th', lambda: index.search(text='homers left field', inning=9))
+    timed('every single (first page)', lambda: index.search(event_type='single'))
+    timed('"doubles" text search', lambda: index.search(text='doubles'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Measure how much the deduplicating snapshot store saves on a day of captures
+
+Stores the recorded sections of mlbtests_output.txt, then a synthetic slate captured the way a
+poller would capture it: every game's feed/live once every few plays. Reports the bytes those
+captures take as indented JSON (how mlbtests.py writes them), as gzipped JSON per capture, and in
+the snapshot store.
+
+    python bench_snapshot_store.py [--games 15] [--every 5] [--threshold 256]
+"""
+import argparse
+import copy
+import datetime
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+
+from snapshot_store import SnapshotStore
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+RECORDED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mlbtests_output.txt')
+SECTION = re.compile(r'^--- (.+) ---$', re.M)
+
+
+def recorded_sections():
+    with open(RECORDED_FILE, 'r', encoding='utf-8') as f:
+        content = f.read()
+    markers = list(SECTION.finditer(content))
+    for marker, following in zip(markers, markers[1:] + [None]):
+        body = content[marker.end():following.start() if following else len(content)].strip()
+        yield marker.group(1), json.loads(body)
+
+
+def day_of_captures(games, every):
+    """(name, feed/live document) for each game captured every few plays through the game"""
+    schedule = generate_season(synthetic_teams(max(games * 2, 2)), start_date=datetime.date(2025, 5, 1), days=1)
+    for game, documents in iter_season_documents(schedule):
+        feed = documents['feed']
+        plays = feed['liveData']['plays']['allPlays']
+        for count in range(every, len(plays) + every, every):
+            capture = copy.copy(feed)
+            capture['liveData'] = dict(feed['liveData'])
+            capture['liveData']['plays'] = dict(feed['liveData']['plays'])
+            capture['liveData']['plays']['allPlays'] = plays[:count]
+            capture['liveData']['plays']['currentPlay'] = plays[min(count, len(plays)) - 1]
+            yield f"{game['gamePk']}/{count:03d}", capture
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--every', type=int, default=5)
+    parser.add_argument('--threshold', type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='mlbapp-snapshots-') as directory:
+        store = SnapshotStore(os.path.join(directory, 'snapshots.sqlite3'), threshold=args.threshold)
+        indented = gzipped = 0
+        started = time.perf_counter()
+        captures = [('recorded' + name, document) for name, document in recorded_sections()]
+        captures += list(day_of_captures(args.games, args.every))
+        for name, document in captures:
+            text = json.dumps(document, indent=2).encode('utf-8')
+            indented += len(text)
+            gzipped += len(gzip.compress(text, 6))
+            store.put(name, document)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for name, document in captures[::10]:
+            assert store.get(name) == json.loads(json.dumps(document))
+        read = (time.perf_counter() - started) / len(captures[::10])
+
+        stats = store.stats()
+        print(f"captures: {stats['snapshots']}  unique subtrees: {stats['objects']}")
+        print(f"  indented JSON:      {indented / 1e6:8.1f} MB")
+        print(f"  compact JSON:       {stats['logicalBytes'] / 1e6:8.1f} MB")
+        print(f"  gzip per capture:   {gzipped / 1e6:8.1f} MB")
+        print(f"  snapshot store:     {stats['storedBytes'] / 1e6:8.1f} MB "
+              f"(dedupe ratio {stats['dedupeRatio']}x over compact JSON, {indented / stats['storedBytes']:.0f}x over indented)")
+        print(f"  write: {elapsed:.1f} s including serialization  read: {read * 1000:.1f} ms per capture")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Time win probability and RE24 for live polling and for backfilling archived games
+
+For a slate of synthetic games, compares recomputing every play's values from allPlays on
+each poll (one poll per play) with the incremental engine, then times backfilling whole
+archived games in one vectorized pass per game.
+
+    python bench_win_probability.py [--days 7] [--teams 30]
+"""
+import argparse
+import time
+
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+from win_probability import WinProbabilityEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--teams', type=int, default=30)
+    args = parser.parse_args()
+
+    schedule = generate_season(synthetic_teams(args.teams), days=args.days)
+    games = [documents['playByPlay']['allPlays'] for _, documents in iter_season_documents(schedule)]
+    plays = sum(len(game) for game in games)
+    print(f"{len(games)} games, {plays} plays")
+
+    # One poll per play; the first slate only, recomputing is quadratic
+    slate = games[:len(games) // args.days or 1]
+    started = time.perf_counter()
+    for game in slate:
+        for count in range(1, len(game) + 1):
+            WinProbabilityEngine().ingest(game[:count])
+    recompute = time.perf_counter() - started
+    started = time.perf_counter()
+    for game in slate:
+        engine = WinProbabilityEngine()
+        for count in range(1, len(game) + 1):
+            engine.ingest(game[:count])
+    incremental = time.perf_counter() - started
+    polls = sum(len(game) for game in slate)
+    print(f"  live polling, {polls} polls: recompute {recompute * 1e6 / polls:7.1f} us/poll, "
+          f"incremental {incremental * 1e6 / polls:7.1f} us/poll")
+
+    started = time.perf_counter()
+    for game in games:
+        WinProbabilityEngine().ingest(game)
+    backfill = time.perf_counter() - started
+    print(f"  backfill: {backfill:.2f} s for {len(games)} games ({backfill * 1e6 / plays:.1f} us/play)")
+
+
+if __name__ == '__main__':
+    main()
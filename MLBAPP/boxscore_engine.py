@@ -0,0 +1,407 @@
+import threading
+
+# Plate appearance outcomes, by result.eventType; any other play (a caught stealing or pickoff
+# that ends an inning) isn't a plate appearance for its batter
+HIT_BASES = {'single': 1, 'double': 2, 'triple': 3, 'home_run': 4}
+HIT_COUNTERS = {'double': 'doubles', 'triple': 'triples', 'home_run': 'homeRuns'}
+WALKS = ('walk', 'intent_walk')
+STRIKEOUTS = ('strikeout', 'strikeout_double_play', 'strikeout_triple_play')
+SAC_FLIES = ('sac_fly', 'sac_fly_double_play')
+SAC_BUNTS = ('sac_bunt', 'sac_bunt_double_play')
+NOT_AT_BATS = WALKS + SAC_FLIES + SAC_BUNTS + ('hit_by_pitch', 'catcher_interf')
+OUTS_IN_PLAY = (
+    'field_out', 'force_out', 'double_play', 'triple_play', 'grounded_into_double_play',
+    'grounded_into_triple_play', 'fielders_choice', 'fielders_choice_out', 'field_error',
+) + STRIKEOUTS
+PLATE_APPEARANCES = frozenset(tuple(HIT_BASES) + NOT_AT_BATS + OUTS_IN_PLAY)
+
+# Batted-ball trajectory of an out -> the counter it goes in; fly, line and pop outs are air outs
+TRAJECTORY_OUTS = {
+    'ground_ball': 'groundOuts', 'bunt_grounder': 'groundOuts',
+    'fly_ball': 'flyOuts', 'line_drive': 'lineOuts', 'bunt_line_drive': 'lineOuts',
+    'popup': 'popOuts', 'bunt_popup': 'popOuts',
+}
+
+BATTING_COUNTERS = (
+    'flyOuts', 'groundOuts', 'airOuts', 'runs', 'doubles', 'triples', 'homeRuns', 'strikeOuts',
+    'baseOnBalls', 'intentionalWalks', 'hits', 'hitByPitch', 'atBats', 'caughtStealing', 'stolenBases',
+    'groundIntoDoublePlay', 'groundIntoTriplePlay', 'plateAppearances', 'totalBases', 'rbi',
+    'leftOnBase', 'sacBunts', 'sacFlies', 'catchersInterference', 'popOuts', 'lineOuts',
+)
+
+PITCHING_COUNTERS = (
+    'flyOuts', 'groundOuts', 'airOuts', 'runs', 'doubles', 'triples', 'homeRuns', 'strikeOuts',
+    'baseOnBalls', 'intentionalWalks', 'hits', 'hitByPitch', 'atBats', 'caughtStealing', 'stolenBases',
+    'numberOfPitches', 'earnedRuns', 'battersFaced', 'outs', 'balls', 'strikes', 'hitBatsmen',
+    'rbi', 'catchersInterference', 'sacBunts', 'sacFlies', 'popOuts', 'lineOuts',
+)
+
+FIELDING_COUNTERS = ('assists', 'putOuts', 'errors')
+
+# Fielding credits charged as errors; catcher's interference is an error on the catcher
+ERROR_CREDITS = ('f_fielding_error', 'f_throwing_error', 'c_catcher_interf')
+
+BASES = ('1B', '2B', '3B')
+
+
+def _rate(numerator, denominator, places=3):
+    if not denominator:
+        return '.---'
+    text = f"{numerator / denominator:.{places}f}"
+    return text[1:] if text.startswith('0.') else text
+
+
+def _innings_pitched(outs):
+    return f"{outs // 3}.{outs % 3}"
+
+
+def _ordinal(n):
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+class _Side:
+    """Counters for one team: its batters, its pitchers, its fielding and its line"""
+
+    def __init__(self):
+        self.batting = {}
+        self.pitching = {}
+        self.people = {}
+        self.lineup = []
+        self.orders = {}
+        self.plate_appearances = 0
+        self.pitchers = []
+        self.current_pitcher = None
+        self.fielding = dict.fromkeys(FIELDING_COUNTERS, 0)
+        self.innings = {}
+
+    def person(self, person):
+        # Substitution events name players by id only; keep the fullest record seen
+        if 'fullName' in person or person['id'] not in self.people:
+            self.people[person['id']] = person
+
+    def batter(self, person):
+        line = self.batting.get(person['id'])
+        if line is None:
+            line = self.batting[person['id']] = dict.fromkeys(BATTING_COUNTERS, 0)
+        self.person(person)
+        return line
+
+    def pitcher(self, person):
+        line = self.pitching.get(person['id'])
+        if line is None:
+            line = self.pitching[person['id']] = dict.fromkeys(PITCHING_COUNTERS, 0)
+            self.pitchers.append(person['id'])
+        self.person(person)
+        return line
+
+    def join_lineup(self, person, batting_order):
+        self.person(person)
+        if person['id'] not in self.orders:
+            self.orders[person['id']] = batting_order
+            self.lineup.append(person['id'])
+
+    def inning(self, number, batting=False):
+        """The team's line for an inning; it has runs once the team has batted in that inning"""
+        line = self.innings.get(number)
+        if line is None:
+            line = self.innings[number] = {'hits': 0, 'errors': 0, 'leftOnBase': 0}
+        if batting and 'runs' not in line:
+            line['runs'] = 0
+        return line
+
+
+class BoxscoreEngine:
+    """Boxscore and linescore of one game, kept up to date from its plays
+
+    Completed plays are consumed once each, in order, and every one only bumps the counters of
+    the players, innings and teams it touches, so following a game costs the same per play from
+    the first inning to the last and needs nothing but the play stream.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.sides = {'away': _Side(), 'home': _Side()}
+        self.consumed = 0
+        self.last_play = None
+        self._half = None
+        self._bases = {}
+
+    def ingest(self, all_plays):
+        """Consume the completed plays not seen yet; returns how many were added"""
+        with self._lock:
+            if len(all_plays) < self.consumed:
+                # Upstream took plays back (a corrected or restarted game): count again from the start
+                self._reset()
+            added = 0
+            for play in all_plays[self.consumed:]:
+                if not play.get('about', {}).get('isComplete', True):
+                    break
+                self._add(play)
+                self.consumed += 1
+                added += 1
+            return added
+
+    def _add(self, play):
+        about = play['about']
+        result = play.get('result', {})
+        matchup = play.get('matchup', {})
+        event_type = result.get('eventType')
+        number = about.get('inning', 1)
+        top = about.get('isTopInning', about.get('halfInning') == 'top')
+        offense = self.sides['away' if top else 'home']
+        defense = self.sides['home' if top else 'away']
+        inning = offense.inning(number, batting=True)
+        defense.inning(number)
+        if self._half != (number, top):
+            self._half, self._bases = (number, top), {}
+
+        # Who was pitching at each event: the previous pitcher until a substitution in this play
+        pitcher = defense.current_pitcher or matchup.get('pitcher')
+        pitcher_at = {}
+        last_pitch = None
+        for event in play.get('playEvents', []):
+            details = event.get('details', {})
+            change = details.get('eventType') or ''
+            if event.get('isSubstitution') and event.get('player') and event.get('battingOrder'):
+                side = offense if change == 'offensive_substitution' else defense
+                side.join_lineup(event['player'], event['battingOrder'])
+            if change == 'pitching_substitution' and event.get('player'):
+                pitcher = event['player']
+            pitcher_at[event.get('index')] = pitcher
+            if event.get('isPitch'):
+                last_pitch = event
+                line = defense.pitcher(pitcher)
+                line['numberOfPitches'] += 1
+                if details.get('isStrike') or details.get('isInPlay'):
+                    line['strikes'] += 1
+                elif details.get('isBall'):
+                    line['balls'] += 1
+        if matchup.get('pitcher'):
+            pitcher = matchup['pitcher']
+        defense.current_pitcher = pitcher
+
+        if event_type in PLATE_APPEARANCES and matchup.get('batter'):
+            self._plate_appearance(play, event_type, offense, defense, inning, matchup['batter'], pitcher, last_pitch)
+
+        # Runner movements: runs, steals, outs and the fielding credits behind them
+        bases = dict(self._bases)
+        for runner in play.get('runners', []):
+            movement = runner.get('movement', {})
+            details = runner.get('details', {})
+            person = details.get('runner')
+            runner_event = details.get('eventType') or ''
+            charged = pitcher_at.get(details.get('playIndex'), pitcher)
+            if person:
+                bases[person['id']] = None if movement.get('isOut') else movement.get('end')
+            if person and runner_event.startswith('stolen_base'):
+                offense.batter(person)['stolenBases'] += 1
+                defense.pitcher(charged)['stolenBases'] += 1
+            elif person and 'caught_stealing' in runner_event:
+                offense.batter(person)['caughtStealing'] += 1
+                defense.pitcher(charged)['caughtStealing'] += 1
+            if person and movement.get('end') == 'score':
+                offense.batter(person)['runs'] += 1
+                inning['runs'] += 1
+                responsible = defense.pitcher(details.get('responsiblePitcher') or charged)
+                responsible['runs'] += 1
+                if details.get('earned'):
+                    responsible['earnedRuns'] += 1
+            if movement.get('isOut'):
+                defense.pitcher(charged)['outs'] += 1
+            for credit in runner.get('credits', []):
+                if credit.get('credit') == 'f_putout':
+                    defense.fielding['putOuts'] += 1
+                elif credit.get('credit') == 'f_assist':
+                    defense.fielding['assists'] += 1
+                elif credit.get('credit') in ERROR_CREDITS:
+                    defense.fielding['errors'] += 1
+                    defense.inning(number)['errors'] += 1
+        self._bases = {person_id: base for person_id, base in bases.items() if base in BASES}
+
+        # Runners stranded when the half inning ends
+        if play.get('count', {}).get('outs') == 3:
+            inning['leftOnBase'] += len(self._bases)
+            self._bases = {}
+        self.last_play = play
+
+    def _plate_appearance(self, play, event_type, offense, defense, inning, batter, pitcher, last_pitch):
+        result = play.get('result', {})
+        batting = offense.batter(batter)
+        pitching = defense.pitcher(pitcher)
+
+        # Starters come up in order, so the team's first nine plate appearances set the lineup;
+        # substitutes join it through the substitution events, which carry their batting order
+        if offense.plate_appearances < 9:
+            offense.join_lineup(batter, str((offense.plate_appearances + 1) * 100))
+        offense.plate_appearances += 1
+
+        for line in (batting, pitching):
+            line['plateAppearances' if line is batting else 'battersFaced'] += 1
+            line['rbi'] += result.get('rbi', 0)
+            if event_type not in NOT_AT_BATS:
+                line['atBats'] += 1
+            if event_type in HIT_BASES:
+                line['hits'] += 1
+                if event_type in HIT_COUNTERS:
+                    line[HIT_COUNTERS[event_type]] += 1
+            elif event_type in WALKS:
+                line['baseOnBalls'] += 1
+                if event_type == 'intent_walk':
+                    line['intentionalWalks'] += 1
+            elif event_type in STRIKEOUTS:
+                line['strikeOuts'] += 1
+            elif event_type == 'hit_by_pitch':
+                line['hitByPitch'] += 1
+            elif event_type == 'catcher_interf':
+                line['catchersInterference'] += 1
+            elif event_type in SAC_FLIES:
+                line['sacFlies'] += 1
+            elif event_type in SAC_BUNTS:
+                line['sacBunts'] += 1
+        if event_type in HIT_BASES:
+            batting['totalBases'] += HIT_BASES[event_type]
+            inning['hits'] += 1
+        if event_type == 'hit_by_pitch':
+            pitching['hitBatsmen'] += 1
+        if event_type == 'grounded_into_double_play':
+            batting['groundIntoDoublePlay'] += 1
+        elif event_type == 'grounded_into_triple_play':
+            batting['groundIntoTriplePlay'] += 1
+
+        if result.get('isOut'):
+            # Batted-ball outs by trajectory, force outs included
+            trajectory = ((last_pitch or {}).get('hitData') or {}).get('trajectory')
+            if event_type not in STRIKEOUTS and trajectory in TRAJECTORY_OUTS:
+                counter = TRAJECTORY_OUTS[trajectory]
+                for line in (batting, pitching):
+                    line[counter] += 1
+                    if counter != 'groundOuts':
+                        line['airOuts'] += 1
+            # A batter whose plate appearance ends in an out is charged with the runners who
+            # were on base and didn't score
+            scored = {runner.get('details', {}).get('runner', {}).get('id')
+                      for runner in play.get('runners', []) if runner.get('movement', {}).get('end') == 'score'}
+            batting['leftOnBase'] += sum(1 for person_id in self._bases if person_id not in scored)
+
+    def boxscore(self, teams=None):
+        """The game's boxscore in StatsAPI shape, with the linescore under 'linescore'
+
+        teams maps 'away'/'home' to the team objects to show; players carry what the plays say
+        about them (person, batting order, game stats), not roster details like positions.
+        """
+        with self._lock:
+            result = {'teams': {}}
+            for side_name, side in self.sides.items():
+                players = {}
+                for person_id in side.lineup:
+                    players[f"ID{person_id}"] = dict(self._player(side, person_id),
+                                                     battingOrder=side.orders[person_id])
+                for person_id in side.pitchers:
+                    players.setdefault(f"ID{person_id}", self._player(side, person_id))
+                # Batting orders are slot * 100 + the substitute's number in that slot
+                by_order = sorted(side.lineup, key=lambda person_id: int(side.orders[person_id]))
+                current = {int(side.orders[person_id]) // 100: person_id for person_id in by_order}
+                result['teams'][side_name] = {
+                    'team': (teams or {}).get(side_name, {}),
+                    'teamStats': self._team_stats(side),
+                    'players': players,
+                    'batters': by_order + [person_id for person_id in side.pitchers if person_id not in side.orders],
+                    'pitchers': list(side.pitchers),
+                    'battingOrder': [current[slot] for slot in sorted(current)],
+                }
+            result['linescore'] = self._linescore()
+            return result
+
+    def _player(self, side, person_id):
+        stats = {'batting': {}, 'pitching': {}}
+        batting = side.batting.get(person_id)
+        if batting is not None and (batting['plateAppearances'] or person_id not in side.pitching):
+            stats['batting'] = dict(batting, gamesPlayed=1,
+                                    summary=f"{batting['hits']}-{batting['atBats']}")
+        pitching = side.pitching.get(person_id)
+        if pitching is not None:
+            stats['pitching'] = dict(pitching, gamesPlayed=1, pitchesThrown=pitching['numberOfPitches'],
+                                     inningsPitched=_innings_pitched(pitching['outs']))
+        return {'person': side.people[person_id], 'stats': stats}
+
+    def _team_stats(self, side):
+        batting = dict.fromkeys(BATTING_COUNTERS, 0)
+        for line in side.batting.values():
+            for key in BATTING_COUNTERS:
+                batting[key] += line[key]
+        on_base = batting['hits'] + batting['baseOnBalls'] + batting['hitByPitch']
+        batting.update(
+            avg=_rate(batting['hits'], batting['atBats']),
+            obp=_rate(on_base, batting['atBats'] + batting['baseOnBalls'] + batting['hitByPitch'] + batting['sacFlies']),
+            slg=_rate(batting['totalBases'], batting['atBats']),
+        )
+        pitching = dict.fromkeys(PITCHING_COUNTERS, 0)
+        for line in side.pitching.values():
+            for key in PITCHING_COUNTERS:
+                pitching[key] += line[key]
+        pitching.update(
+            inningsPitched=_innings_pitched(pitching['outs']),
+            pitchesThrown=pitching['numberOfPitches'],
+            era=_rate(27 * pitching['earnedRuns'], pitching['outs'], places=2),
+            whip=_rate(3 * (pitching['baseOnBalls'] + pitching['hits']), pitching['outs'], places=2),
+        )
+        return {'batting': batting, 'pitching': pitching, 'fielding': dict(side.fielding)}
+
+    def _linescore(self):
+        away, home = self.sides['away'], self.sides['home']
+        innings = []
+        for number in sorted(set(away.innings) | set(home.innings)):
+            entry = {'num': number, 'ordinalNum': _ordinal(number)}
+            for side_name, side in (('away', away), ('home', home)):
+                line = side.innings.get(number)
+                entry[side_name] = dict(line) if line else {'hits': 0, 'errors': 0, 'leftOnBase': 0}
+            innings.append(entry)
+        linescore = {
+            'scheduledInnings': 9,
+            'innings': innings,
+            'teams': {
+                side_name: {
+                    'runs': sum(line.get('runs', 0) for line in side.innings.values()),
+                    'hits': sum(line['hits'] for line in side.innings.values()),
+                    'errors': side.fielding['errors'],
+                    'leftOnBase': sum(line['leftOnBase'] for line in side.innings.values()),
+                }
+                for side_name, side in self.sides.items()
+            },
+        }
+        if self.last_play:
+            about = self.last_play['about']
+            linescore.update({
+                'currentInning': about.get('inning'),
+                'currentInningOrdinal': _ordinal(about.get('inning', 1)),
+                'isTopInning': about.get('isTopInning'),
+                'inningHalf': 'Top' if about.get('isTopInning') else 'Bottom',
+                'outs': self.last_play.get('count', {}).get('outs', 0),
+            })
+        return linescore
+
+    def __len__(self):
+        return self.consumed
+
+
+class BoxscoreEngines:
+    """Boxscore engines for every game being followed, keyed by data source and gamePk"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines = {}
+
+    def get(self, source, game_pk):
+        with self._lock:
+            engine = self._engines.get((source, game_pk))
+            if engine is None:
+                engine = self._engines[(source, game_pk)] = BoxscoreEngine()
+            return engine
+
+    def discard(self, source, game_pk):
+        with self._lock:
+            self._engines.pop((source, game_pk), None)
@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+# Data sources the app can serve from. Each one gets its own cache namespace so
+# switching sources never evicts what another viewer has already warmed up.
+DATA_SOURCES = ('local', 'archive', 'live')
+
+# Source used when neither the request nor the session asks for one
+DEFAULT_DATA_SOURCE = 'local'
+
+# SQLite file shared by every worker process on this machine; set to '' to keep caches per process
+SHARED_CACHE_PATH = os.environ.get(
+    'MLB_SHARED_CACHE', os.path.join(tempfile.gettempdir(), 'mlbapp_shared_cache.sqlite3'))
+
+# Sources whose payloads are shared across workers. Local data is parsed from a file every
+# worker already has, so sharing it would only trade one decode for another.
+SHARED_SOURCES = ('live', 'archive')
+
+# Shared entries older than this many seconds are purged, and past this many the oldest go first.
+# Readers keep their decoded copies in memory; a purged entry is only fetched again when stale.
+SHARED_MAX_AGE = 24 * 3600
+SHARED_MAX_ENTRIES = 20000
+
+# Seconds between purges of old shared entries and expired leases, per worker
+PURGE_INTERVAL = 60
+
+
+class SourceCache:
+    """Cache of parsed payloads partitioned by data source"""
+
+    def __init__(self, sources=DATA_SOURCES, intern=None):
+        self._lock = threading.Lock()
+        self._intern = intern
+        self._namespaces = {source: {} for source in sources}
+        self._stats = {source: {'hits': 0, 'misses': 0} for source in sources}
+
+    def get(self, source, key, max_age=None):
+        """Return the cached value for key in source's namespace, or None"""
+        with self._lock:
+            entry = self._namespaces[source].get(key)
+            if entry is not None and (max_age is None or time.time() - entry[1] <= max_age):
+                self._stats[source]['hits'] += 1
+                return entry[0]
+            self._stats[source]['misses'] += 1
+            return None
+
+    def entry(self, source, key):
+        """Return (value, stored_at) for key without touching the hit/miss counters"""
+        with self._lock:
+            return self._namespaces[source].get(key)
+
+    def set(self, source, key, value, stored_at=None):
+        """Store value for key in source's namespace, canonicalized first if there's an intern step"""
+        if self._intern is not None:
+            value = self._intern(value)
+        with self._lock:
+            self._namespaces[source][key] = (value, time.time() if stored_at is None else stored_at)
+        return value
+
+    def __contains__(self, item):
+        source, key = item
+        with self._lock:
+            return key in self._namespaces[source]
+
+    def clear(self, source=None):
+        """Drop cached entries for one source, or for every source"""
+        with self._lock:
+            for name, namespace in self._namespaces.items():
+                if source is None or name == source:
+                    namespace.clear()
+
+    def stats(self):
+        """Per-source entry counts and hit/miss counters"""
+        with self._lock:
+            return {
+                source: dict(self._stats[source], entries=len(namespace))
+                for source, namespace in self._namespaces.items()
+            }
+
+
+class SharedStore:
+    """Serialized payloads in a SQLite (WAL) file that every local worker process can read"""
+
+    def __init__(self, path, max_age=SHARED_MAX_AGE, max_entries=SHARED_MAX_ENTRIES):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "source TEXT, key TEXT, stored_at REAL, payload BLOB, PRIMARY KEY (source, key))")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "source TEXT, key TEXT, holder TEXT, expires_at REAL, PRIMARY KEY (source, key))")
+        self._purge_lock = threading.Lock()
+        self._purged_at = 0.0
+
+    def _connect(self):
+        # sqlite3 connections are per thread; each thread of each worker opens its own
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def stored_at(self, source, key):
+        """When the shared copy of key was written, or None if there isn't one"""
+        row = self._connect().execute(
+            "SELECT stored_at FROM entries WHERE source = ? AND key = ?", (source, key)).fetchone()
+        return row[0] if row else None
+
+    def load(self, source, key):
+        """Return (value, stored_at) for key, or None"""
+        row = self._connect().execute(
+            "SELECT payload, stored_at FROM entries WHERE source = ? AND key = ?", (source, key)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def save(self, source, key, value, stored_at):
+        payload = zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'), 1)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (source, key, stored_at, payload) VALUES (?, ?, ?, ?)",
+                (source, key, stored_at, payload))
+        # Every distinct key (each feed/live?timecode= among them) would otherwise stay for good
+        now = time.time()
+        with self._purge_lock:
+            if now - self._purged_at < PURGE_INTERVAL:
+                return
+            self._purged_at = now
+        self.purge(now)
+
+    def purge(self, now=None):
+        """Drop entries past max_age, then the oldest past max_entries, and expired leases;
+        returns how many entries went"""
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            purged = conn.execute("DELETE FROM entries WHERE stored_at < ?", (now - self.max_age,)).rowcount
+            purged += conn.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+            conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+        return purged
+
+    def try_lease(self, source, key, holder, seconds):
+        """Claim the right to refresh key for a few seconds; False if another worker holds it"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO leases (source, key, holder, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (source, key) DO UPDATE SET holder = excluded.holder, "
+                "expires_at = excluded.expires_at WHERE leases.expires_at < ?",
+                (source, key, holder, now + seconds, now))
+            return cursor.rowcount == 1
+
+    def release_lease(self, source, key, holder):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE source = ? AND key = ? AND holder = ?", (source, key, holder))
+
+    def clear(self, source=None):
+        with self._connect() as conn:
+            if source is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE source = ?", (source,))
+
+
+class TieredCache:
+    """In-process L1 in front of a SharedStore, so one worker's refresh is visible to all of them"""
+
+    def __init__(self, shared=None, sources=DATA_SOURCES, shared_sources=SHARED_SOURCES, intern=None):
+        self.l1 = SourceCache(sources, intern)
+        self.shared = shared
+        self.shared_sources = set(shared_sources) if shared is not None else set()
+        self._lock = threading.Lock()
+        self._leases = set()
+        self._stats = {source: {'hits': 0, 'misses': 0, 'shared_loads': 0} for source in sources}
+
+    def get(self, source, key, max_age=None):
+        """Return the freshest cached value for key, reading through to the shared tier"""
+        entry = self._lookup(source, key)
+        with self._lock:
+            if entry is not None and (max_age is None or time.time() - entry[1] <= max_age):
+                self._stats[source]['hits'] += 1
+                return entry[0]
+            self._stats[source]['misses'] += 1
+            return None
+
+    def _lookup(self, source, key):
+        entry = self.l1.entry(source, key)
+        if source not in self.shared_sources:
+            return entry
+        shared_at = self.shared.stored_at(source, key)
+        if shared_at is None:
+            return entry
+        if entry is not None and entry[1] >= shared_at:
+            return entry
+        # Another worker published a newer copy; decode it once into our L1
+        loaded = self.shared.load(source, key)
+        if loaded is None:
+            return entry
+        self.l1.set(source, key, loaded[0], stored_at=loaded[1])
+        with self._lock:
+            self._stats[source]['shared_loads'] += 1
+        return self.l1.entry(source, key)
+
+    def set(self, source, key, value):
+        """Store value in both tiers; returns the copy now in L1, which readers will get"""
+        stored_at = time.time()
+        cached = self.l1.set(source, key, value, stored_at=stored_at)
+        if source in self.shared_sources:
+            self.shared.save(source, key, value, stored_at)
+        return cached
+
+    def acquire_refresh(self, source, key, seconds=10):
+        """Claim the refresh of key so concurrent workers don't all fetch it from upstream"""
+        holder = f"{os.getpid()}:{threading.get_ident()}"
+        if source in self.shared_sources:
+            return self.shared.try_lease(source, key, holder, seconds)
+        with self._lock:
+            if (source, key) in self._leases:
+                return False
+            self._leases.add((source, key))
+            return True
+
+    def release_refresh(self, source, key):
+        holder = f"{os.getpid()}:{threading.get_ident()}"
+        if source in self.shared_sources:
+            self.shared.release_lease(source, key, holder)
+        else:
+            with self._lock:
+                self._leases.discard((source, key))
+
+    def wait_for(self, source, key, max_age=None, timeout=2.0, interval=0.05):
+        """Wait for another worker's refresh of key to land; None if it doesn't in time"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            value = self.get(source, key, max_age=max_age)
+            if value is not None:
+                return value
+            time.sleep(interval)
+        return None
+
+    def __contains__(self, item):
+        return self._lookup(*item) is not None
+
+    def clear(self, source=None):
+        self.l1.clear(source)
+        if self.shared is not None:
+            self.shared.clear(source)
+
+    def stats(self):
+        """Per-source L1 entry counts, hit/miss counters and shared-tier loads"""
+        entries = self.l1.stats()
+        with self._lock:
+            return {
+                source: dict(self._stats[source], entries=entries[source]['entries'])
+                for source in self._stats
+            }
@@ -0,0 +1,328 @@
+"""Record every game of a day's slate into the feed/live archive
+
+The day's games come from the schedule, through the schedule cache the scripts share. Each game that isn't final goes to one of a pool of
+worker processes, which follows it through /feed/live/timestamps (cheap, tells whether anything
+changed) and /feed/live/diffPatch (the changes since the last moment recorded). Every moment is
+recorded into the same archive the app serves ?timecode= requests from, with the patches of all
+a worker's games fsynced together every few seconds. The daemon is the archive's only writer; the
+app reads it. Per-game polling and lag metrics are written to capture_metrics.json in the archive.
+
+    python capture_daemon.py [--date YYYY-MM-DD] [--workers 4] [--archive PATH]
+"""
+import argparse
+import datetime
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+from file_lock import FileLock
+from schedule_service import ScheduleService, SCHEDULE_CACHE_PATH
+from time_travel import TimeTravelStore, TIME_TRAVEL_PATH, apply_patch
+from upstream_scheduler import UpstreamScheduler, UPSTREAM_RATE
+
+MLB_API_BASE_URL = os.environ.get('MLB_API_BASE_URL', "https://statsapi.mlb.com")
+
+# Games the daemon follows, by abstractGameState
+CAPTURE_STATES = ('Preview', 'Live')
+
+# Seconds between polls of a game that's live and doesn't say (GUMBO's metaData.wait), and of one
+# that hasn't started
+LIVE_POLL_INTERVAL = 10
+PREVIEW_POLL_INTERVAL = 120
+
+# Seconds before a game that failed to poll is tried again
+RETRY_INTERVAL = 5
+
+# Seconds between fsyncs of a worker's archive writes, between metric reports, and between looks
+# at the schedule for games that weren't there (or weren't assigned) before
+SYNC_INTERVAL = 2
+REPORT_INTERVAL = 2
+DISCOVER_INTERVAL = 300
+
+METRICS_FILE = 'capture_metrics.json'
+
+# Held by the daemon writing an archive, for as long as it runs
+LOCK_FILE = '.capture.lock'
+
+
+def make_fetch(base_url, rate):
+    """fetch(path, params=None) -> decoded JSON, paced by a scheduler of its own at rate per second"""
+    scheduler = UpstreamScheduler(rate=rate, burst=max(int(rate), 1))
+
+    def fetch(path, params=None):
+        response = scheduler.get(f"{base_url}{path}", params=params, timeout=10,
+                                 headers={'Accept-Encoding': 'gzip'})
+        if response.status_code != 200:
+            raise IOError(f"{path} answered {response.status_code}")
+        return json.loads(response.content)
+
+    return fetch
+
+
+def slate_games(schedule, date):
+    """[(gamePk, abstractGameState)] of a date's schedule, from a ScheduleService"""
+    return [(game['gamePk'], game.get('status', {}).get('abstractGameState')) for game in schedule.games(date)]
+
+
+class GameCapture:
+    """Follows one game's feed/live and records each new moment of it into a TimeTravelStore
+
+    The whole feed is fetched once; after that a poll asks for the timestamps, and only when
+    there's a newer one for the diffPatch from the last moment recorded, so a quiet game costs
+    one small request per poll.
+    """
+
+    def __init__(self, game_pk, store, fetch, clock=time.time):
+        self.game_pk = game_pk
+        self.store = store
+        self.fetch = fetch
+        self.clock = clock
+        self.document = None
+        self.metrics = {
+            'gamePk': game_pk,
+            'state': None,
+            'polls': 0,
+            'requests': 0,
+            'recorded': 0,
+            'errors': 0,
+            'timecode': None,
+            'lagSeconds': None,
+            'lagSecondsAvg': None,
+            'lagSecondsMax': None,
+        }
+        self._lags = 0.0
+        self._lag_count = 0
+        # clock() when the last poll that succeeded finished
+        self._polled_at = None
+
+    @property
+    def timecode(self):
+        return self.document['metaData']['timeStamp'] if self.document else None
+
+    def _get(self, suffix, params=None):
+        self.metrics['requests'] += 1
+        return self.fetch(f'/api/v1.1/game/{self.game_pk}/feed/live{suffix}', params)
+
+    def _record(self, document):
+        self.document = document
+        if self.store.record(self.game_pk, document):
+            self.metrics['recorded'] += 1
+
+    def poll(self):
+        """Catch up with the game; returns seconds until the next poll, or None once it's final"""
+        self.metrics['polls'] += 1
+        if self.document is None:
+            self._record(self._get(''))
+        else:
+            timecodes = self._get('/timestamps')
+            if timecodes and timecodes[-1] > self.timecode:
+                changes = self._get('/diffPatch', {'startTimecode': self.timecode, 'endTimecode': timecodes[-1]})
+                if isinstance(changes, dict):
+                    # Too far behind for patches; upstream sends the whole feed instead
+                    self._record(changes)
+                else:
+                    try:
+                        for change in changes:
+                            self._record(apply_patch(self.document, change.get('diff', [])))
+                    except Exception:
+                        # A patch that fails partway leaves the document half-applied; start over
+                        # from the whole feed next time
+                        self.document = None
+                        raise
+        # Anything upstream had by the last successful poll is in the archive, so what it has now
+        # reaches the archive at most this late
+        now = self.clock()
+        metrics = self.metrics
+        if self._polled_at is not None:
+            lag = now - self._polled_at
+            self._lags += lag
+            self._lag_count += 1
+            metrics['lagSeconds'] = round(lag, 3)
+            metrics['lagSecondsAvg'] = round(self._lags / self._lag_count, 3)
+            metrics['lagSecondsMax'] = max(metrics['lagSecondsMax'] or 0.0, metrics['lagSeconds'])
+        self._polled_at = now
+        metrics['timecode'] = self.timecode
+        state = self.document.get('gameData', {}).get('status', {}).get('abstractGameState')
+        metrics['state'] = state
+        if state == 'Final':
+            return None
+        if state == 'Live':
+            return self.document.get('metaData', {}).get('wait', LIVE_POLL_INTERVAL)
+        return PREVIEW_POLL_INTERVAL
+
+
+def run_worker(worker, assignments, reports, archive, base_url, rate):
+    """Worker process: poll the games it's given, each when it's due, until told to stop (None)
+
+    Games still going when it's told to stop are left where they are; what was recorded is synced.
+    """
+    store = TimeTravelStore(archive)
+    fetch = make_fetch(base_url, rate)
+    captures = {}
+    due = []
+    stopping = False
+    last_sync = last_report = time.monotonic()
+
+    def report(final=False):
+        reports.put((worker, [dict(capture.metrics) for capture in captures.values()], final))
+
+    while not stopping:
+        # New games, or the signal to stop
+        timeout = max(min(due[0][0] - time.monotonic(), SYNC_INTERVAL), 0) if due else SYNC_INTERVAL
+        try:
+            while True:
+                game_pk = assignments.get(timeout=timeout)
+                timeout = 0
+                if game_pk is None:
+                    stopping = True
+                elif game_pk not in captures:
+                    captures[game_pk] = GameCapture(game_pk, store, fetch)
+                    heapq.heappush(due, (time.monotonic(), game_pk))
+        except queue.Empty:
+            pass
+
+        while due and due[0][0] <= time.monotonic() and not stopping:
+            _, game_pk = heapq.heappop(due)
+            capture = captures[game_pk]
+            try:
+                delay = capture.poll()
+            except Exception as e:
+                print(f"Worker {worker}: error polling game {game_pk}: {str(e)}")
+                capture.metrics['errors'] += 1
+                delay = RETRY_INTERVAL
+            if delay is not None:
+                heapq.heappush(due, (time.monotonic() + delay, game_pk))
+
+        now = time.monotonic()
+        if now - last_sync >= SYNC_INTERVAL:
+            store.sync()
+            last_sync = now
+        if now - last_report >= REPORT_INTERVAL:
+            report()
+            last_report = now
+    store.close()
+    report(final=True)
+
+
+class CaptureDaemon:
+    """Hands a date's unfinished games to worker processes and gathers their metrics
+
+    Games go to the worker with the fewest so far and stay with it, so each game's history has
+    one writer. A lock file in the archive keeps a second daemon out of it, and the app only
+    reads the archive. Each worker gets an equal share of the upstream request rate.
+    """
+
+    def __init__(self, archive=None, date=None, workers=4, base_url=MLB_API_BASE_URL, rate=UPSTREAM_RATE,
+                 schedule=None):
+        self.archive = archive or os.path.join(TIME_TRAVEL_PATH, 'live')
+        self.date = date or datetime.date.today().isoformat()
+        self.workers = workers
+        self.base_url = base_url
+        self.rate = rate
+        self.schedule = schedule or ScheduleService(SCHEDULE_CACHE_PATH, base_url=base_url)
+        self.assigned = {}
+        self.metrics = {}
+        self._loads = [0] * workers
+
+    def discover(self, assignments):
+        """Assign the schedule's unfinished games that aren't assigned yet; returns how many were"""
+        added = 0
+        for game_pk, state in slate_games(self.schedule, self.date):
+            if state not in CAPTURE_STATES or game_pk in self.assigned:
+                continue
+            worker = self._loads.index(min(self._loads))
+            self._loads[worker] += 1
+            self.assigned[game_pk] = worker
+            assignments[worker].put(game_pk)
+            added += 1
+        return added
+
+    def _gather(self, reports, timeout):
+        """Take one worker report into the metrics; returns (worker, final) or None"""
+        try:
+            worker, games, final = reports.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        for game in games:
+            self.metrics[game['gamePk']] = dict(game, worker=worker)
+        return worker, final
+
+    def write_metrics(self):
+        os.makedirs(self.archive, exist_ok=True)
+        path = os.path.join(self.archive, METRICS_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'date': self.date, 'games': [self.metrics[pk] for pk in sorted(self.metrics)]}, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def run(self, duration=None):
+        """Capture until every assigned game is final and none are left to find, or duration runs out"""
+        os.makedirs(self.archive, exist_ok=True)
+        archive_lock = FileLock(os.path.join(self.archive, LOCK_FILE))
+        if not archive_lock.acquire(blocking=False):
+            raise RuntimeError(f"Another capture daemon is writing to {self.archive}")
+        try:
+            return self._run(duration)
+        finally:
+            archive_lock.release()
+
+    def _run(self, duration):
+        assignments = [multiprocessing.Queue() for _ in range(self.workers)]
+        reports = multiprocessing.Queue()
+        processes = [multiprocessing.Process(
+            target=run_worker, name=f'capture-{worker}',
+            args=(worker, assignments[worker], reports, self.archive, self.base_url, self.rate / self.workers))
+            for worker in range(self.workers)]
+        for process in processes:
+            process.start()
+        started = time.monotonic()
+        last_discover = started
+        try:
+            print(f"Capturing {self.discover(assignments)} games of {self.date} with {self.workers} workers")
+            while duration is None or time.monotonic() - started < duration:
+                self._gather(reports, REPORT_INTERVAL)
+                self.write_metrics()
+                finished = all(self.metrics.get(pk, {}).get('state') == 'Final' for pk in self.assigned)
+                if time.monotonic() - last_discover >= DISCOVER_INTERVAL or finished:
+                    last_discover = time.monotonic()
+                    if not self.discover(assignments) and finished:
+                        break
+        finally:
+            for worker_queue in assignments:
+                worker_queue.put(None)
+            # Workers finish the poll they're in (10 s at most, the request timeout), sync and report
+            remaining = set(range(self.workers))
+            while remaining:
+                gathered = self._gather(reports, SYNC_INTERVAL + 10)
+                if gathered is None:
+                    break
+                if gathered[1]:
+                    remaining.discard(gathered[0])
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+            self.write_metrics()
+        return self.metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--date', help='YYYY-MM-DD, today by default')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--archive', help=f'archive directory, {os.path.join(TIME_TRAVEL_PATH, "live")} by default')
+    parser.add_argument('--base-url', default=MLB_API_BASE_URL)
+    parser.add_argument('--duration', type=float, help='seconds to capture for, until the slate is over by default')
+    args = parser.parse_args()
+
+    daemon = CaptureDaemon(args.archive, args.date, args.workers, args.base_url)
+    for game in daemon.run(args.duration).values():
+        print(f"gamePk: {game['gamePk']} | {game['state']} | worker {game['worker']} | "
+              f"{game['recorded']} moments in {game['requests']} requests | "
+              f"lag avg {game['lagSecondsAvg']} s, max {game['lagSecondsMax']} s | errors {game['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import os
+import tempfile
+
+# Keep the shared and on-disk HTTP caches used by the tests away from the real ones
+_cache_dir = tempfile.mkdtemp(prefix='mlbapp-tests-')
+os.environ.setdefault('MLB_SHARED_CACHE', os.path.join(_cache_dir, 'shared_cache.sqlite3'))
+os.environ.setdefault('MLB_HTTP_CACHE', os.path.join(_cache_dir, 'http_cache.sqlite3'))
+os.environ.setdefault('MLB_SEASON_STATS', os.path.join(_cache_dir, 'season_stats'))
+os.environ.setdefault('MLB_PLAY_INDEX', os.path.join(_cache_dir, 'play_index'))
+os.environ.setdefault('MLB_SCHEDULE_CACHE', os.path.join(_cache_dir, 'schedule_cache.sqlite3'))
+os.environ.setdefault('MLB_TIME_TRAVEL', os.path.join(_cache_dir, 'time_travel'))
+# Fake upstreams answer instantly; don't pace the tests like the real one
+os.environ.setdefault('MLB_UPSTREAM_RATE', '1000')
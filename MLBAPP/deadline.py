@@ -0,0 +1,54 @@
+import contextlib
+import contextvars
+import time
+
+# Absolute time.monotonic() by which the work of the current request should be done
+_deadline = contextvars.ContextVar('deadline', default=None)
+
+
+def start(seconds):
+    """Give the current context a budget of seconds, never later than one it already has
+
+    Returns a token for finish().
+    """
+    ends = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        ends = min(ends, current)
+    return _deadline.set(ends)
+
+
+def finish(token):
+    _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def budget(seconds):
+    """Run a block with at most seconds to spend"""
+    token = start(seconds)
+    try:
+        yield
+    finally:
+        finish(token)
+
+
+@contextlib.contextmanager
+def separate(seconds):
+    """Run a block with a budget of its own, however much the enclosing one has left
+
+    For work meant to outlast the request's budget, like each refresh of a long-poll.
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        finish(token)
+
+
+def remaining(default=None):
+    """Seconds left in the current budget, or default if there isn't one (never below 0)"""
+    ends = _deadline.get()
+    if ends is None:
+        return default
+    left = max(ends - time.monotonic(), 0.0)
+    return left if default is None else min(left, default)
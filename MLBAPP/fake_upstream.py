@@ -0,0 +1,10 @@
+import json
+
+
+class FakeResponse:
+    """Stands in for a requests response from a fake upstream: a 200 with a JSON body"""
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self.content = json.dumps(data).encode('utf-8')
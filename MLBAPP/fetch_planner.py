@@ -0,0 +1,69 @@
+from urllib.parse import urlencode
+
+# Fields each route reads from a game, beyond the bare schedule entry
+ROUTE_NEEDS = {
+    'scoreboard': ('linescore', 'decisions', 'probablePitcher', 'team'),
+    'boxscore': ('linescore', 'team'),
+    'feed/live': ('team', 'venue'),
+    'atbat': ('linescore',),
+    'team': ('team',),
+}
+
+# Schedule hydration that embeds each field (see StatsAPI-Hydrations.pdf)
+FIELD_HYDRATIONS = {
+    'linescore': 'linescore',
+    'decisions': 'decisions',
+    'probablePitcher': 'probablePitcher',
+    'team': 'team',
+    'venue': 'venue',
+}
+
+# Routes a slate refresh serves by default
+SLATE_ROUTES = ('scoreboard', 'boxscore', 'feed/live', 'atbat', 'team')
+
+
+def game_linescore_endpoint(game_pk):
+    return f"/api/v1/game/{game_pk}/linescore"
+
+
+class SchedulePlan:
+    """One hydrated schedule request covering everything a set of routes needs"""
+
+    def __init__(self, routes, hydrations):
+        self.routes = tuple(routes)
+        self.hydrations = tuple(hydrations)
+
+    def endpoint(self, date, sport_id=1):
+        params = {'sportId': sport_id, 'date': date}
+        if self.hydrations:
+            params['hydrate'] = ','.join(self.hydrations)
+        return f"/api/v1/schedule?{urlencode(params, safe=',')}"
+
+    def __repr__(self):
+        return f"SchedulePlan(routes={self.routes}, hydrations={self.hydrations})"
+
+
+def plan_schedule_fetch(routes=SLATE_ROUTES):
+    """Work out the hydrations a set of routes needs from the schedule"""
+    fields = set()
+    for route in routes:
+        if route not in ROUTE_NEEDS:
+            raise ValueError(f"Unknown route for schedule planning: {route}")
+        fields.update(ROUTE_NEEDS[route])
+    return SchedulePlan(routes, sorted(FIELD_HYDRATIONS[field] for field in fields))
+
+
+def fan_out(schedule_data, plan, store):
+    """Split a hydrated schedule into the per-game linescores routes would otherwise fetch one by one
+
+    store(endpoint, payload) is called once per entry; returns the number of entries stored.
+    """
+    stored = 0
+    if 'linescore' not in plan.hydrations:
+        return stored
+    for date in schedule_data.get('dates', []):
+        for game in date.get('games', []):
+            if game.get('gamePk') is not None and game.get('linescore'):
+                store(game_linescore_endpoint(game['gamePk']), game['linescore'])
+                stored += 1
+    return stored
@@ -0,0 +1,56 @@
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # No flock (Windows): there are no forked workers to coordinate with, only threads
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive lock on a file, held against other processes and other threads of this one
+
+    The lock belongs to the open file, so it goes away with the process that holds it; a crashed
+    writer never leaves it taken.
+
+        with FileLock(os.path.join(directory, '.lock')):
+            ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def acquire(self, blocking=True):
+        """Take the lock; without blocking, returns False at once if someone else has it"""
+        if not self._lock.acquire(blocking):
+            return False
+        file = open(self.path, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except OSError:
+                file.close()
+                self._lock.release()
+                return False
+        self._file = file
+        return True
+
+    def release(self):
+        file, self._file = self._file, None
+        # Closing the file drops the flock
+        file.close()
+        self._lock.release()
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
@@ -0,0 +1,231 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from upstream_scheduler import upstream
+
+# Where responses persist between runs of the app and the scripts
+HTTP_CACHE_PATH = os.environ.get(
+    'MLB_HTTP_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'mlbapp', 'http_cache.sqlite3'))
+
+# Disk budget for cached bodies; least recently used entries are evicted beyond it
+HTTP_CACHE_MAX_BYTES = int(os.environ.get('MLB_HTTP_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Seconds a response is served without asking upstream, by path. First match wins.
+# Reference data barely changes during a season. Game state (linescores, boxscores, play-by-play,
+# feeds) changes every pitch, so it's never served without asking: a stale copy is revalidated
+# with its ETag and served again only on a 304.
+FRESHNESS_RULES = [
+    (re.compile(r'/api/v1/teams/?$'), 24 * 3600),
+    (re.compile(r'/api/v1/teams/\d+/?$'), 24 * 3600),
+    (re.compile(r'/api/v1/teams/\d+/roster'), 6 * 3600),
+    (re.compile(r'/api/v1/venues/'), 7 * 24 * 3600),
+    (re.compile(r'/api/v1/gameStatus'), 24 * 3600),
+    (re.compile(r'/api/v1/game/\d+/content'), 3600),
+    (re.compile(r'/contextMetricsAverages'), 3600),
+    (re.compile(r'/feed/live'), 0),
+    (re.compile(r'/api/v1/game/\d+/'), 0),
+]
+DEFAULT_FRESHNESS = 60
+
+# Seconds a schedule that doesn't reach today is fresh for; one that does carries live scores,
+# so it's game state
+PAST_SCHEDULE_FRESHNESS = 3600
+
+# Seconds between exact totals of the bodies on disk; in between, stores keep a running total
+SIZE_CHECK_INTERVAL = 60
+
+# zlib level for stored bodies; large feeds are stored on every change, so speed comes first
+COMPRESS_LEVEL = 1
+
+# Only touch an entry's access time this often, so cache hits stay read-only
+ACCESS_TOUCH_INTERVAL = 60
+
+
+def normalize_url(url, params=None):
+    """Cache key for a request: lower-cased scheme and host, query parameters merged and sorted"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=False)
+    if params:
+        query += [(key, str(value)) for key, value in params.items() if value is not None]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                       urlencode(sorted(query), safe=','), ''))
+
+
+def freshness_for(url):
+    """Seconds a cached response for url stays fresh"""
+    parts = urlsplit(url)
+    path = parts.path
+    if re.search(r'/api/v1/schedule/?$', path):
+        query = dict(parse_qsl(parts.query))
+        last = query.get('endDate') or query.get('date')
+        today = time.strftime('%Y-%m-%d')
+        return PAST_SCHEDULE_FRESHNESS if last and last[:10] < today else 0
+    for pattern, seconds in FRESHNESS_RULES:
+        if pattern.search(path):
+            return seconds
+    return DEFAULT_FRESHNESS
+
+
+class CachedResponse:
+    """The parts of a requests.Response the app and scripts use, for cached or fresh bodies"""
+
+    def __init__(self, url, status_code, content, headers=None, from_cache=False, fetched_at=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.from_cache = from_cache
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """Persistent response cache with per-endpoint freshness, conditional revalidation and LRU eviction"""
+
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES, fetch=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._fetch = fetch
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, status INTEGER, body BLOB, headers TEXT, etag TEXT, "
+                "last_modified TEXT, fetched_at REAL, accessed_at REAL, size INTEGER)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'fetched': 0, 'stale_on_error': 0, 'evicted': 0}
+        # Running total of the bytes on disk, counted exactly now and then (other processes write too)
+        self._size_lock = threading.Lock()
+        self._total = self.size()
+        self._counted_at = time.time()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url, params=None, headers=None, timeout=10, freshness=None):
+        """GET url through the cache; returns a CachedResponse"""
+        key = normalize_url(url, params)
+        if freshness is None:
+            freshness = freshness_for(key)
+        row = self._connect().execute(
+            "SELECT status, body, headers, etag, last_modified, fetched_at, accessed_at, size "
+            "FROM responses WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is not None and now - row[5] <= freshness:
+            self.stats['fresh_hits'] += 1
+            if now - row[6] > ACCESS_TOUCH_INTERVAL:
+                self._touch(key, now)
+            return self._from_row(key, row)
+
+        request_headers = dict(headers or {})
+        request_headers.setdefault('Accept-Encoding', 'gzip')
+        if row is not None:
+            # Ask upstream whether our copy is still current
+            if row[3]:
+                request_headers['If-None-Match'] = row[3]
+            if row[4]:
+                request_headers['If-Modified-Since'] = row[4]
+
+        try:
+            response = (self._fetch or upstream.get)(key, headers=request_headers, timeout=timeout)
+        except requests.RequestException:
+            if row is None:
+                raise
+            print(f"Upstream unavailable for {key}, serving cached copy")
+            self.stats['stale_on_error'] += 1
+            return self._from_row(key, row)
+
+        if response.status_code == 304 and row is not None:
+            self.stats['revalidated'] += 1
+            with self._connect() as conn:
+                conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            return self._from_row(key, row, fetched_at=now)
+
+        self.stats['fetched'] += 1
+        result = CachedResponse(key, response.status_code, response.content,
+                                headers=response.headers, fetched_at=now)
+        # A response that's never fresh and can't be revalidated would never be served again
+        reusable = freshness > 0 or response.headers.get('ETag') or response.headers.get('Last-Modified')
+        if response.status_code == 200 and reusable:
+            self._store(key, result, now, replaced=row[7] if row is not None else 0)
+        return result
+
+    def _from_row(self, key, row, fetched_at=None):
+        return CachedResponse(key, row[0], zlib.decompress(row[1]), headers=json.loads(row[2]),
+                              from_cache=True, fetched_at=fetched_at or row[5])
+
+    def _touch(self, key, now):
+        with self._connect() as conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+    def _store(self, key, response, now, replaced=0):
+        body = zlib.compress(response.content, COMPRESS_LEVEL)
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() in ('content-type', 'etag', 'last-modified', 'cache-control')}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, status, body, headers, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.status_code, body, json.dumps(headers),
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body)))
+        with self._size_lock:
+            self._total += len(body) - replaced
+            if self._total <= self.max_bytes and now - self._counted_at < SIZE_CHECK_INTERVAL:
+                return
+        self._evict(now)
+
+    def _evict(self, now):
+        """Drop least recently used responses until the cache fits in max_bytes"""
+        conn = self._connect()
+        total = self.size()
+        if total > self.max_bytes:
+            with conn:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    self.stats['evicted'] += 1
+        with self._size_lock:
+            self._total = total
+            self._counted_at = now
+
+    def size(self):
+        """Bytes of compressed bodies on disk"""
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+        with self._size_lock:
+            self._total = 0
@@ -0,0 +1,90 @@
+import copy
+import re
+import sys
+import threading
+
+# Objects with one of these links are reference entities: the same team, venue, league or person
+# is repeated in every schedule, boxscore and feed that mentions it
+REFERENCE_LINK = re.compile(r'^/api/v1/(?:teams|venues|people|league|divisions|sports)/\d+$')
+
+# String values up to this long are interned; longer ones (descriptions) are rarely repeated
+MAX_INTERNED_LENGTH = 64
+
+# Distinct shapes kept per entity; payloads hydrate the same team or person differently
+MAX_VARIANTS = 8
+
+
+class FrozenDict(dict):
+    """A dict shared by many cached payloads, so changing it raises instead of changing all of them
+
+    Copies (copy.copy, copy.deepcopy, .copy(), dict(...)) are plain dicts that can be changed.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Shared reference data can't be changed in place; replace it with a copy")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+
+class ReferenceInterner:
+    """Canonicalizes payloads as they enter the cache
+
+    Keys and short strings are interned, and every team, venue, league, division, sport and person
+    object is replaced by one shared, frozen instance per distinct shape of that entity. Dozens of
+    cached games then hold one copy of each club and player instead of one per payload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entities = {}
+        self.stats = {'payloads': 0, 'entities': 0, 'shared': 0}
+
+    def intern(self, payload):
+        """A canonical copy of a decoded JSON payload"""
+        with self._lock:
+            self.stats['payloads'] += 1
+            return self._canonical(payload)
+
+    def _canonical(self, value):
+        if isinstance(value, dict):
+            if type(value) is FrozenDict:
+                return value
+            result = {sys.intern(key) if type(key) is str else key: self._canonical(item)
+                      for key, item in value.items()}
+            link = result.get('link')
+            if type(link) is str and REFERENCE_LINK.match(link):
+                return self._entity(link, result)
+            return result
+        if isinstance(value, list):
+            return [self._canonical(item) for item in value]
+        if type(value) is str and len(value) <= MAX_INTERNED_LENGTH:
+            return sys.intern(value)
+        return value
+
+    def _entity(self, link, value):
+        variants = self._entities.setdefault(link, [])
+        for variant in variants:
+            if variant == value:
+                self.stats['shared'] += 1
+                return variant
+        if len(variants) >= MAX_VARIANTS:
+            return value
+        frozen = FrozenDict(value)
+        variants.append(frozen)
+        self.stats['entities'] += 1
+        return frozen
+
+    def __len__(self):
+        return len(self._entities)
@@ -0,0 +1,158 @@
+import json
+import re
+
+import numpy as np
+
+WHITESPACE = re.compile(rb'\s*')
+SCALAR = re.compile(rb'"(?:[^"\\]|\\.)*"|[^,\]}\s]+', re.S)
+
+OPEN_BRACE, OPEN_BRACKET = b'{['
+
+# Byte classes for the structural scan: 1 opens, 2 closes, 3 quotes, 4 backslashes
+CLASSES = bytearray(256)
+for character in b'{[':
+    CLASSES[character] = 1
+for character in b'}]':
+    CLASSES[character] = 2
+CLASSES[ord('"')] = 3
+CLASSES[ord('\\')] = 4
+CLASSES = bytes(CLASSES)
+OPEN, CLOSE, QUOTE, BACKSLASH = 1, 2, 3, 4
+
+# Bytes classified at a time, so the scan's temporaries stay small next to the document
+SCAN_CHUNK = 1 << 20
+
+
+class StructuralIndex:
+    """Where the brackets of a JSON document are and how deeply each is nested
+
+    Built with a few vectorized passes over the raw bytes, the same idea as the first stage of
+    simdjson: quotes outside strings and brackets outside strings are located, and a running sum of
+    the brackets gives the nesting depth anywhere in the document. With that, any subtree can be
+    found and its exact byte span handed to json.loads, while everything else is never decoded.
+    """
+
+    def __init__(self, body):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.body = body
+        positions = []
+        kinds = []
+        for offset in range(0, len(body), SCAN_CHUNK):
+            classes = np.frombuffer(body[offset:offset + SCAN_CHUNK].translate(CLASSES), dtype=np.uint8)
+            found = np.flatnonzero(classes != 0).astype(np.int32)
+            kinds.append(classes[found])
+            positions.append(found + offset)
+        positions = np.concatenate(positions) if positions else np.zeros(0, dtype=np.int32)
+        kinds = np.concatenate(kinds) if kinds else np.zeros(0, dtype=np.uint8)
+
+        # Backslashes only occur inside strings and are rare; whatever each one escapes is dropped
+        backslashes = positions[kinds == BACKSLASH]
+        if len(backslashes):
+            escaped = []
+            for position in backslashes.tolist():
+                if escaped and escaped[-1] == position:
+                    continue
+                escaped.append(position + 1)
+            keep = (kinds != BACKSLASH) & ~np.isin(positions, escaped)
+            positions = positions[keep]
+            kinds = kinds[keep]
+
+        self.quotes = positions[kinds == QUOTE]
+        # An even number of quotes before a bracket means it's outside any string
+        brackets = kinds != QUOTE
+        brackets[brackets] = np.searchsorted(self.quotes, positions[brackets]) % 2 == 0
+        self.brackets = positions[brackets]
+        self.opens = kinds[brackets] == OPEN
+        self.depths = np.cumsum(np.where(self.opens, 1, -1), dtype=np.int32)
+
+    def depth_at(self, position):
+        """Nesting depth at a byte offset outside any string"""
+        k = int(np.searchsorted(self.brackets, position, side='right')) - 1
+        return int(self.depths[k]) if k >= 0 else 0
+
+    def in_string(self, position):
+        return int(np.searchsorted(self.quotes, position)) % 2 == 1
+
+    def value_span(self, start):
+        """(start, end) byte span of the JSON value starting at or after start"""
+        start = WHITESPACE.match(self.body, start).end()
+        if self.body[start] in (OPEN_BRACE, OPEN_BRACKET):
+            k = int(np.searchsorted(self.brackets, start))
+            depth = self.depths[k]
+            # The matching bracket is the first one after it that brings the depth back down
+            closing = int(np.argmax(self.depths[k + 1:] < depth))
+            return start, int(self.brackets[k + 1 + closing]) + 1
+        match = SCALAR.match(self.body, start)
+        return start, match.end()
+
+    def find_key(self, span, key):
+        """Start of the value for key in the object spanning span, or None
+
+        An object's own keys can only sit between its child objects and arrays, so only those
+        gaps are searched, however large the children are.
+        """
+        start, end = span
+        if self.body[start] != OPEN_BRACE:
+            return None
+        first = int(np.searchsorted(self.brackets, start))
+        last = int(np.searchsorted(self.brackets, end - 1))
+        depth = self.depths[first]
+        depths = self.depths[first + 1:last]
+        opens = self.opens[first + 1:last]
+        child_starts = self.brackets[first + 1:last][opens & (depths == depth + 1)]
+        child_ends = self.brackets[first + 1:last][~opens & (depths == depth)] + 1
+        needle = b'"' + key.encode('utf-8') + b'"'
+        for gap_start, gap_end in zip([start + 1, *child_ends.tolist()], [*child_starts.tolist(), end - 1]):
+            position = self.body.find(needle, gap_start, gap_end)
+            while position != -1:
+                after = WHITESPACE.match(self.body, position + len(needle)).end()
+                if self.body[after:after + 1] == b':' and not self.in_string(position):
+                    return after + 1
+                position = self.body.find(needle, position + 1, gap_end)
+        return None
+
+
+def select_paths(body, paths):
+    """Decode only the given dotted paths of a JSON document into a pruned copy of it
+
+    Objects along each path are rebuilt with only the keys asked for, so the result can be read
+    the same way as the full document. Paths that aren't in the document are left out.
+    """
+    index = StructuralIndex(body)
+    spans = {(): index.value_span(0)}
+    result = {}
+    for path in paths:
+        parts = tuple(path.split('.'))
+        for depth in range(1, len(parts) + 1):
+            prefix = parts[:depth]
+            if prefix not in spans:
+                value_start = index.find_key(spans[prefix[:-1]], parts[depth - 1])
+                if value_start is None:
+                    break
+                spans[prefix] = index.value_span(value_start)
+        else:
+            start, end = spans[parts]
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = json.loads(index.body[start:end])
+    return result
+
+
+def prune(document, paths):
+    """The same selection as select_paths, from an already decoded document"""
+    result = {}
+    for path in paths:
+        parts = path.split('.')
+        value = document
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return result
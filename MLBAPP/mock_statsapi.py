@@ -0,0 +1,330 @@
+"""A local mock of the Stats API, routed by the path templates of StatsAPI-Spec.json
+
+Each GET is answered, in order of preference, from a recorded response (mlbtests_output.txt),
+from a captured game archive (the time travel store the capture daemon writes), from the
+synthetic game engine for per-game endpoints, or with a body generated from the response schema
+in the spec. Latency, errors and gzip are configurable. It's a single asyncio server speaking
+HTTP/1.1 with keep-alive, answering from pre-serialized bodies, so it holds thousands of requests
+a second on one core.
+
+    python mock_statsapi.py [--port 8089] [--latency-ms 0] [--jitter-ms 0] [--error-rate 0] [--no-gzip]
+
+Point the app or the scripts at it with MLB_API_BASE_URL=http://127.0.0.1:8089.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import threading
+from collections import Counter, OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from bench_snapshot_store import recorded_sections
+from synthetic import SyntheticGameEngine, default_schedule_game
+from time_travel import TimeTravelStore
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'StatsAPI-Spec.json')
+
+# Nesting followed when generating a body from a schema; deeper objects are left out
+MAX_SCHEMA_DEPTH = 6
+
+# Distinct URLs whose serialized (and gzipped) answers are kept
+RESPONSE_CACHE_SIZE = 4096
+
+# Bodies shorter than this are never gzipped, as the real service does
+GZIP_MIN_BYTES = 256
+
+REASONS = {200: 'OK', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error',
+           503: 'Service Unavailable'}
+
+# Per-game endpoints the synthetic engine can answer for any gamePk
+SYNTHETIC_SECTIONS = {
+    '/api/v1/game/{game_pk}/boxscore': 'boxscore',
+    '/api/v1/game/{game_pk}/linescore': 'linescore',
+    '/api/v1/game/{game_pk}/playByPlay': 'playByPlay',
+    '/api/v1.1/game/{game_pk}/feed/live': 'feed',
+}
+
+
+def _not_found(path):
+    return {'messageNumber': 10, 'message': f'Object not found: {path}', 'timestamp': '', 'traceId': None}
+
+
+def compile_template(template):
+    """Regex for a spec path template; gamePk and game_pk parameters are both captured as game_pk"""
+    pattern = re.sub(r'\{(\w+)\}', lambda match: f"(?P<{'game_pk' if match.group(1) in ('gamePk', 'game_pk') else match.group(1)}>[^/]+)",
+                     re.escape(template).replace(r'\{', '{').replace(r'\}', '}'))
+    return re.compile(f'^{pattern}/?$')
+
+
+def template_key(template):
+    return re.sub(r'\{(gamePk|game_pk)\}', '{game_pk}', template)
+
+
+class SchemaBodies:
+    """Example bodies built from the spec's schemas: the first enum value, zeros, 'string' and so on"""
+
+    def __init__(self, spec):
+        self.schemas = spec.get('components', {}).get('schemas', {})
+
+    def build(self, schema, depth=0, seen=()):
+        if '$ref' in schema:
+            name = schema['$ref'].rsplit('/', 1)[-1]
+            if name in seen or name not in self.schemas:
+                return None
+            return self.build(self.schemas[name], depth, seen + (name,))
+        if 'allOf' in schema:
+            merged = {}
+            for part in schema['allOf']:
+                value = self.build(part, depth, seen)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        if 'enum' in schema:
+            return schema['enum'][0]
+        kind = schema.get('type')
+        if kind == 'object' or 'properties' in schema:
+            if depth >= MAX_SCHEMA_DEPTH:
+                return None
+            body = {}
+            for name, prop in schema.get('properties', {}).items():
+                value = self.build(prop, depth + 1, seen)
+                if value is not None:
+                    body[name] = value
+            return body
+        if kind == 'array':
+            item = self.build(schema.get('items', {}), depth + 1, seen) if depth < MAX_SCHEMA_DEPTH else None
+            return [item] if item is not None else []
+        if kind == 'string':
+            return {'date-time': '2025-08-27T17:05:00Z', 'date': '2025-08-27'}.get(schema.get('format'), 'string')
+        if kind == 'integer':
+            return 0
+        if kind == 'number':
+            return 0.0
+        if kind == 'boolean':
+            return False
+        return None
+
+    def for_operation(self, operation):
+        content = operation.get('responses', {}).get('200', {}).get('content', {})
+        for media in content.values():
+            if 'schema' in media:
+                return self.build(media['schema'])
+        return {}
+
+
+class MockStatsApi:
+    """Answers Stats API GETs; see the module docstring for where answers come from"""
+
+    def __init__(self, spec_path=SPEC_PATH, recorded=True, archive=None, latency_ms=0, jitter_ms=0,
+                 error_rate=0.0, error_status=503, gzip_enabled=True, seed=0):
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        bodies = SchemaBodies(spec)
+        # Literal segments win over parameters: /game/lastPitch before /game/{gamePk}
+        templates = sorted((template for template, item in spec.get('paths', {}).items() if 'get' in item),
+                           key=lambda template: (-template.count('/'), template.count('{'), template))
+        self.routes = [(template, compile_template(template), spec['paths'][template]['get']) for template in templates]
+        self._bodies = bodies
+        self._schema_bodies = {}
+        self.recorded = dict(recorded_sections()) if recorded is True else dict(recorded or {})
+        self.archive = TimeTravelStore(archive) if archive else None
+        self.synthetic = SyntheticGameEngine()
+        self._schedule_games = {game['gamePk']: game
+                                for day in self.recorded.get('/api/v1/schedule', {}).get('dates', [])
+                                for game in day.get('games', [])}
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.gzip_enabled = gzip_enabled
+        self._random = random.Random(seed)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def match(self, path):
+        """(template, path parameters, operation) of the spec route for a path, or None"""
+        for template, pattern, operation in self.routes:
+            found = pattern.match(path)
+            if found:
+                return template, found.groupdict(), operation
+        return None
+
+    def _answer(self, path, query):
+        """(status, document, origin, cacheable) for a GET"""
+        path = path.rstrip('/') or '/'
+        if path in self.recorded:
+            return 200, self.recorded[path], 'recorded', True
+        matched = self.match(path)
+        if matched is None:
+            return 404, _not_found(path), 'missing', True
+        template, params, operation = matched
+        key = template_key(template)
+        game_pk = params.get('game_pk')
+        if game_pk is not None and game_pk.isdigit():
+            game_pk = int(game_pk)
+            if self.archive is not None and key.startswith('/api/v1.1/game/{game_pk}/feed/live'):
+                timecodes = self.archive.timecodes(game_pk)
+                if timecodes:
+                    if key.endswith('/timestamps'):
+                        return 200, timecodes, 'archive', False
+                    if key.endswith('/feed/live'):
+                        found = self.archive.body(game_pk, query.get('timecode', timecodes[-1]))
+                        if found is not None:
+                            return 200, json.loads(found[1]), 'archive', False
+            if key in SYNTHETIC_SECTIONS:
+                schedule_game = self._schedule_games.get(game_pk) or default_schedule_game(game_pk)
+                return 200, self.synthetic.documents(game_pk, schedule_game)[SYNTHETIC_SECTIONS[key]], 'synthetic', True
+            if key.endswith('/feed/live/timestamps'):
+                feed = self.synthetic.documents(game_pk, self._schedule_games.get(game_pk) or default_schedule_game(game_pk))['feed']
+                return 200, [feed['metaData']['timeStamp']], 'synthetic', True
+            if key.endswith('/feed/live/diffPatch'):
+                return 200, [], 'synthetic', True
+        if template not in self._schema_bodies:
+            self._schema_bodies[template] = self._bodies.for_operation(operation)
+        return 200, self._schema_bodies[template], 'schema', True
+
+    def respond(self, target):
+        """(status, body bytes, gzipped body bytes or None) for a GET target, from the cache if possible"""
+        with self._lock:
+            cached = self._cache.get(target)
+            if cached is not None:
+                self._cache.move_to_end(target)
+                self.stats[cached[3]] += 1
+                return cached[:3]
+        url = urlsplit(target)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        status, document, origin, cacheable = self._answer(url.path, query)
+        body = json.dumps(document, separators=(',', ':')).encode('utf-8')
+        gzipped = gzip.compress(body, 5) if self.gzip_enabled and len(body) >= GZIP_MIN_BYTES else None
+        with self._lock:
+            self.stats[origin] += 1
+            if cacheable:
+                self._cache[target] = (status, body, gzipped, origin)
+                if len(self._cache) > RESPONSE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return status, body, gzipped
+
+    async def handle(self, reader, writer):
+        """One client connection: requests answered in order until it closes or asks to"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0') != '0':
+                    await reader.readexactly(int(headers['content-length']))
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+
+                self.stats['requests'] += 1
+                if method != 'GET':
+                    status, body, gzipped = 405, json.dumps(_not_found(target)).encode('utf-8'), None
+                elif target.startswith('/__mock/stats'):
+                    status, body, gzipped = 200, json.dumps(dict(self.stats)).encode('utf-8'), None
+                elif self.error_rate and self._random.random() < self.error_rate:
+                    self.stats['errors'] += 1
+                    status, body, gzipped = self.error_status, b'{"message":"Injected error"}', None
+                else:
+                    status, body, gzipped = self.respond(target)
+                if self.latency or self.jitter:
+                    await asyncio.sleep(self.latency + self._random.random() * self.jitter)
+
+                use_gzip = gzipped is not None and 'gzip' in headers.get('accept-encoding', '')
+                payload = gzipped if use_gzip else body
+                head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                        f"Content-Type: application/json;charset=UTF-8\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        + ("Content-Encoding: gzip\r\n" if use_gzip else "")
+                        + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode('latin-1'))
+                writer.write(payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8089):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"Mock Stats API on http://{host}:{server.sockets[0].getsockname()[1]} "
+              f"({len(self.routes)} routes, {len(self.recorded)} recorded)")
+        async with server:
+            await server.serve_forever()
+
+    def running(self, host='127.0.0.1', port=0):
+        """Context manager that serves in a background thread; its value has the base_url"""
+        return _BackgroundServer(self, host, port)
+
+
+class _BackgroundServer:
+    def __init__(self, mock, host, port):
+        self.mock = mock
+        self.host = host
+        self.port = port
+        self.base_url = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='mock-statsapi', daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self.mock.handle, self.host, self.port, backlog=1024))
+        self.base_url = f"http://{self.host}:{self._server.sockets[0].getsockname()[1]}"
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--spec', default=SPEC_PATH)
+    parser.add_argument('--archive', help='captured game archive to serve feed/live from (see capture_daemon.py)')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--no-gzip', action='store_true')
+    args = parser.parse_args()
+
+    mock = MockStatsApi(args.spec, archive=args.archive, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        error_rate=args.error_rate, error_status=args.error_status, gzip_enabled=not args.no_gzip)
+    try:
+        asyncio.run(mock.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
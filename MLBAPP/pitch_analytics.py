@@ -0,0 +1,347 @@
+import threading
+
+import numpy as np
+
+# Call codes that mean the batter swung, and the subset that missed
+SWING_CALLS = ('S', 'W', 'F', 'T', 'L', 'M', 'O', 'X', 'D', 'E', 'Q', 'R')
+WHIFF_CALLS = ('S', 'W', 'M', 'Q')
+IN_PLAY_CALLS = ('X', 'D', 'E')
+HIT_EVENTS = ('single', 'double', 'triple', 'home_run')
+
+# Plate location grid for heatmaps, in feet from the middle of the plate and above the ground
+HEATMAP_X_RANGE = (-2.0, 2.0)
+HEATMAP_Z_RANGE = (0.0, 5.0)
+
+HANDS = {'L': 0, 'R': 1, 'S': 2}
+
+COLUMNS = (
+    ('game_pk', np.int64),
+    ('game_date', np.int32),
+    ('at_bat', np.int32),
+    ('pitch_number', np.int16),
+    ('pitcher', np.int64),
+    ('batter', np.int64),
+    ('bat_side', np.int8),
+    ('pitch_hand', np.int8),
+    ('pitch_type', np.int16),
+    ('call', np.int16),
+    ('event', np.int16),
+    ('ends_at_bat', np.bool_),
+    ('start_speed', np.float32),
+    ('px', np.float32),
+    ('pz', np.float32),
+    ('zone', np.int8),
+    ('break_horizontal', np.float32),
+    ('break_vertical', np.float32),
+    ('spin_rate', np.float32),
+)
+
+
+def date_number(date):
+    """'2025-08-27' -> 20250827, the form dates are stored and filtered in"""
+    if date is None:
+        return None
+    return int(str(date)[:10].replace('-', ''))
+
+
+def _number(value):
+    return np.nan if value is None else value
+
+
+class Vocabulary:
+    """Small string <-> integer code table for categorical columns"""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        return self._codes.get(value, -1)
+
+    def codes(self, values):
+        return np.array([self.lookup(value) for value in values], dtype=np.int16)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class PitchTable:
+    """Every pitch from a set of games as one NumPy array per field
+
+    Games are appended in chunks and the chunks are only concatenated when a query needs the
+    columns, so ingesting a season doesn't copy the table once per game.
+    """
+
+    def __init__(self):
+        self.pitch_types = Vocabulary()
+        self.pitch_type_names = {}
+        self.calls = Vocabulary()
+        self.events = Vocabulary()
+        self.events.code(None)
+        self._chunks = []
+        self._columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+
+    def append_game(self, game_pk, all_plays, game_date=None):
+        """Flatten one game's plays into rows; returns the number of pitches added"""
+        rows = {name: [] for name, _ in COLUMNS}
+        day = date_number(game_date) or 0
+        for at_bat, play in enumerate(all_plays):
+            matchup = play.get('matchup', {})
+            pitcher = matchup.get('pitcher', {}).get('id', 0)
+            batter = matchup.get('batter', {}).get('id', 0)
+            bat_side = HANDS.get(matchup.get('batSide', {}).get('code'), -1)
+            pitch_hand = HANDS.get(matchup.get('pitchHand', {}).get('code'), -1)
+            event = self.events.code(play.get('result', {}).get('eventType'))
+            pitches = [event_ for event_ in play.get('playEvents', []) if event_.get('isPitch')]
+            for number, pitch in enumerate(pitches):
+                details = pitch.get('details', {})
+                pitch_data = pitch.get('pitchData', {})
+                coordinates = pitch_data.get('coordinates', {})
+                breaks = pitch_data.get('breaks', {})
+                pitch_type = details.get('type', {})
+                code = pitch_type.get('code')
+                if code and code not in self.pitch_type_names:
+                    self.pitch_type_names[code] = pitch_type.get('description')
+                last = number == len(pitches) - 1 and play.get('about', {}).get('isComplete', True)
+
+                rows['game_pk'].append(game_pk)
+                rows['game_date'].append(day)
+                rows['at_bat'].append(play.get('about', {}).get('atBatIndex', at_bat))
+                rows['pitch_number'].append(pitch.get('pitchNumber') or number + 1)
+                rows['pitcher'].append(pitcher)
+                rows['batter'].append(batter)
+                rows['bat_side'].append(bat_side)
+                rows['pitch_hand'].append(pitch_hand)
+                rows['pitch_type'].append(self.pitch_types.code(code))
+                rows['call'].append(self.calls.code(details.get('call', {}).get('code') or details.get('code')))
+                rows['event'].append(event if last else 0)
+                rows['ends_at_bat'].append(last)
+                rows['start_speed'].append(_number(pitch_data.get('startSpeed')))
+                rows['px'].append(_number(coordinates.get('pX')))
+                rows['pz'].append(_number(coordinates.get('pZ')))
+                rows['zone'].append(pitch_data.get('zone') or 0)
+                rows['break_horizontal'].append(_number(breaks.get('breakHorizontal')))
+                rows['break_vertical'].append(_number(breaks.get('breakVerticalInduced')))
+                rows['spin_rate'].append(_number(breaks.get('spinRate')))
+        if rows['game_pk']:
+            self._chunks.append({name: np.array(rows[name], dtype=dtype) for name, dtype in COLUMNS})
+        return len(rows['game_pk'])
+
+    @property
+    def columns(self):
+        if self._chunks:
+            self._columns = {
+                name: np.concatenate([self._columns[name]] + [chunk[name] for chunk in self._chunks])
+                for name, _ in COLUMNS
+            }
+            self._chunks = []
+        return self._columns
+
+    def __len__(self):
+        return len(self._columns['game_pk']) + sum(len(chunk['game_pk']) for chunk in self._chunks)
+
+
+def _mean(sums, counts):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return [None if np.isnan(value) else round(float(value), 1) for value in means]
+
+
+def _grouped_mean(codes, values, size):
+    """Per-group mean of a float column, ignoring missing values"""
+    valid = ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=size)
+    counts = np.bincount(codes[valid], minlength=size)
+    return _mean(sums, counts)
+
+
+def _rate(numerator, denominator):
+    return round(numerator / denominator, 3) if denominator else None
+
+
+class PitchAnalytics:
+    """Pitch-level analytics over a PitchTable, computed with vectorized group-bys"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.table = PitchTable()
+        self.games = set()
+
+    def ingest(self, game_pk, all_plays, game_date=None):
+        """Add a finished game's pitches once; returns the number of pitches added"""
+        with self._lock:
+            if game_pk in self.games:
+                return 0
+            self.games.add(game_pk)
+            return self.table.append_game(game_pk, all_plays, game_date)
+
+    def _select(self, fields, pitcher=None, batter=None, pitch_type=None, start_date=None, end_date=None):
+        """The given columns for the pitches matching every filter"""
+        columns = self.table.columns
+        mask = None
+        conditions = []
+        if pitcher is not None:
+            conditions.append(columns['pitcher'] == pitcher)
+        if batter is not None:
+            conditions.append(columns['batter'] == batter)
+        if pitch_type is not None:
+            conditions.append(columns['pitch_type'] == self.table.pitch_types.lookup(pitch_type))
+        if start_date is not None:
+            conditions.append(columns['game_date'] >= date_number(start_date))
+        if end_date is not None:
+            conditions.append(columns['game_date'] <= date_number(end_date))
+        for condition in conditions:
+            mask = condition if mask is None else mask & condition
+        if mask is None:
+            return {name: columns[name] for name in fields}
+        # Gather only the matching rows' indices once, then each column with them
+        rows = np.flatnonzero(mask)
+        return {name: columns[name][rows] for name in fields}
+
+    def _in(self, codes, vocabulary, values):
+        return np.isin(codes, vocabulary.codes(values))
+
+    def pitch_mix(self, pitcher, **filters):
+        """How often a pitcher throws each pitch type, with its velocity, movement and whiff rate"""
+        with self._lock:
+            rows = self._select(('pitch_type', 'call', 'start_speed', 'break_horizontal', 'break_vertical', 'spin_rate'),
+                                pitcher=pitcher, **filters)
+            size = len(self.table.pitch_types)
+            types = rows['pitch_type']
+            counts = np.bincount(types, minlength=size)
+            whiffs = np.bincount(types[self._in(rows['call'], self.table.calls, WHIFF_CALLS)], minlength=size)
+            swings = np.bincount(types[self._in(rows['call'], self.table.calls, SWING_CALLS)], minlength=size)
+            speed = _grouped_mean(types, rows['start_speed'], size)
+            max_speed = np.full(size, np.nan)
+            valid = ~np.isnan(rows['start_speed'])
+            np.fmax.at(max_speed, types[valid], rows['start_speed'][valid])
+            horizontal = _grouped_mean(types, rows['break_horizontal'], size)
+            vertical = _grouped_mean(types, rows['break_vertical'], size)
+            spin = _grouped_mean(types, rows['spin_rate'], size)
+            total = int(counts.sum())
+            mix = []
+            for code in np.flatnonzero(counts):
+                pitch_type = self.table.pitch_types.values[code]
+                mix.append({
+                    'type': pitch_type,
+                    'description': self.table.pitch_type_names.get(pitch_type),
+                    'count': int(counts[code]),
+                    'percent': round(100.0 * counts[code] / total, 1),
+                    'avgSpeed': speed[code],
+                    'maxSpeed': None if np.isnan(max_speed[code]) else round(float(max_speed[code]), 1),
+                    'avgBreakHorizontal': horizontal[code],
+                    'avgBreakVertical': vertical[code],
+                    'avgSpinRate': None if spin[code] is None else round(spin[code]),
+                    'whiffRate': _rate(int(whiffs[code]), int(swings[code])),
+                })
+            mix.sort(key=lambda entry: -entry['count'])
+            return {'pitcher': pitcher, 'pitches': total, 'mix': mix}
+
+    def zone_heatmap(self, pitcher=None, batter=None, pitch_type=None, bins=12, **filters):
+        """Pitch counts over a grid of plate locations, plus counts per StatsAPI zone"""
+        with self._lock:
+            rows = self._select(('px', 'pz', 'zone'), pitcher=pitcher, batter=batter, pitch_type=pitch_type, **filters)
+            px, pz = rows['px'], rows['pz']
+            x_edges = np.linspace(*HEATMAP_X_RANGE, bins + 1)
+            z_edges = np.linspace(*HEATMAP_Z_RANGE, bins + 1)
+            # Bin by arithmetic rather than a search, clamping the far edges into the last cell
+            column = np.floor((px - HEATMAP_X_RANGE[0]) * (bins / (HEATMAP_X_RANGE[1] - HEATMAP_X_RANGE[0])))
+            row = np.floor((pz - HEATMAP_Z_RANGE[0]) * (bins / (HEATMAP_Z_RANGE[1] - HEATMAP_Z_RANGE[0])))
+            column[px == HEATMAP_X_RANGE[1]] = bins - 1
+            row[pz == HEATMAP_Z_RANGE[1]] = bins - 1
+            located = (column >= 0) & (column < bins) & (row >= 0) & (row < bins)
+            cells = column[located].astype(np.int64) * bins + row[located].astype(np.int64)
+            counts = np.bincount(cells, minlength=bins * bins).reshape(bins, bins)
+            zones = np.bincount(rows['zone'].astype(np.int64), minlength=15)
+            return {
+                'pitcher': pitcher,
+                'batter': batter,
+                'pitchType': pitch_type,
+                'pitches': len(px),
+                'plotted': int(located.sum()),
+                'xEdges': [round(float(edge), 3) for edge in x_edges],
+                'zEdges': [round(float(edge), 3) for edge in z_edges],
+                # counts[i][j] is the cell between xEdges[i..i+1] and zEdges[j..j+1]
+                'counts': counts.astype(int).tolist(),
+                'zones': {str(zone): int(zones[zone]) for zone in range(1, len(zones)) if zones[zone]},
+            }
+
+    def velocity_distribution(self, pitcher, bin_width=1.0, **filters):
+        """Histogram and percentiles of a pitcher's velocity for each pitch type"""
+        with self._lock:
+            rows = self._select(('pitch_type', 'start_speed'), pitcher=pitcher, **filters)
+            valid = ~np.isnan(rows['start_speed'])
+            speeds = rows['start_speed'][valid].astype(np.float64)
+            types = rows['pitch_type'][valid]
+            if not len(speeds):
+                return {'pitcher': pitcher, 'binWidth': bin_width, 'edges': [], 'types': []}
+            low = np.floor(speeds.min() / bin_width) * bin_width
+            high = np.ceil(speeds.max() / bin_width) * bin_width + bin_width
+            edges = np.arange(low, high + bin_width / 2, bin_width)
+            size = len(self.table.pitch_types)
+            histogram, _, _ = np.histogram2d(types, speeds, bins=[np.arange(size + 1) - 0.5, edges])
+
+            order = np.lexsort((speeds, types))
+            sorted_types, sorted_speeds = types[order], speeds[order]
+            starts = np.searchsorted(sorted_types, np.arange(size), side='left')
+            ends = np.searchsorted(sorted_types, np.arange(size), side='right')
+            result = []
+            for code in np.flatnonzero(ends > starts):
+                group = sorted_speeds[starts[code]:ends[code]]
+                p10, p50, p90 = np.percentile(group, [10, 50, 90])
+                result.append({
+                    'type': self.table.pitch_types.values[code],
+                    'count': len(group),
+                    'mean': round(float(group.mean()), 1),
+                    'std': round(float(group.std()), 2),
+                    'p10': round(float(p10), 1),
+                    'p50': round(float(p50), 1),
+                    'p90': round(float(p90), 1),
+                    'counts': histogram[code].astype(int).tolist(),
+                })
+            result.sort(key=lambda entry: -entry['count'])
+            return {
+                'pitcher': pitcher,
+                'binWidth': bin_width,
+                'edges': [round(float(edge), 1) for edge in edges],
+                'types': result,
+            }
+
+    def batter_vs_pitch_type(self, batter, **filters):
+        """How a batter fares against each pitch type"""
+        with self._lock:
+            rows = self._select(('pitch_type', 'call', 'event', 'ends_at_bat', 'start_speed'), batter=batter, **filters)
+            size = len(self.table.pitch_types)
+            types = rows['pitch_type']
+            calls = rows['call']
+            pitches = np.bincount(types, minlength=size)
+            swings = np.bincount(types[self._in(calls, self.table.calls, SWING_CALLS)], minlength=size)
+            whiffs = np.bincount(types[self._in(calls, self.table.calls, WHIFF_CALLS)], minlength=size)
+            in_play = np.bincount(types[self._in(calls, self.table.calls, IN_PLAY_CALLS)], minlength=size)
+            ended = np.bincount(types[rows['ends_at_bat']], minlength=size)
+            hits = np.bincount(types[self._in(rows['event'], self.table.events, HIT_EVENTS)], minlength=size)
+            speed = _grouped_mean(types, rows['start_speed'], size)
+            splits = []
+            for code in np.flatnonzero(pitches):
+                pitch_type = self.table.pitch_types.values[code]
+                splits.append({
+                    'type': pitch_type,
+                    'description': self.table.pitch_type_names.get(pitch_type),
+                    'pitches': int(pitches[code]),
+                    'swings': int(swings[code]),
+                    'whiffs': int(whiffs[code]),
+                    'whiffRate': _rate(int(whiffs[code]), int(swings[code])),
+                    'inPlay': int(in_play[code]),
+                    'plateAppearancesEnded': int(ended[code]),
+                    'hits': int(hits[code]),
+                    'avgSpeed': speed[code],
+                })
+            splits.sort(key=lambda entry: -entry['pitches'])
+            return {'batter': batter, 'pitches': int(pitches.sum()), 'splits': splits}
@@ -0,0 +1,356 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from file_lock import FileLock
+
+# Where the play index persists, one directory per data source
+PLAY_INDEX_PATH = os.environ.get(
+    'MLB_PLAY_INDEX', os.path.join(os.path.expanduser('~'), '.cache', 'mlbapp', 'play_index'))
+
+# Pending plays are written out as a new segment once there are this many
+FLUSH_EVERY = 5000
+
+# Segments merged into one once there are more than this many
+MAX_SEGMENTS = 16
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(('a', 'an', 'and', 'the', 'to', 'of', 'on', 'in', 'at', 'by', 'for'))
+
+INT_COLUMNS = (
+    ('game_pk', np.int64),
+    ('at_bat', np.int32),
+    ('game_date', np.int32),
+    ('inning', np.int16),
+    ('half', np.int8),
+    ('batter', np.int64),
+    ('pitcher', np.int64),
+)
+TEXT_COLUMNS = ('description', 'event_type', 'men_on_base')
+
+HALVES = ('top', 'bottom')
+
+
+def tokenize(text):
+    return [token for token in TOKEN.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+def date_number(date):
+    """'2025-08-27' -> 20250827, the form dates are stored and filtered in"""
+    if date is None:
+        return None
+    return int(str(date)[:10].replace('-', ''))
+
+
+def date_string(number):
+    number = int(number)
+    return f"{number // 10000:04d}-{number // 100 % 100:02d}-{number % 100:02d}"
+
+
+def men_on_base(play):
+    """StatsAPI's menOnBase split (Empty, Men_On, RISP, Loaded), worked out from the runners if absent"""
+    split = play.get('matchup', {}).get('splits', {}).get('menOnBase')
+    if split:
+        return split
+    bases = set()
+    for runner in play.get('runners', []):
+        movement = runner.get('movement', {})
+        origin = movement.get('originBase') or movement.get('start')
+        if origin in ('1B', '2B', '3B'):
+            bases.add(origin)
+    if len(bases) == 3:
+        return 'Loaded'
+    if '2B' in bases or '3B' in bases:
+        return 'RISP'
+    return 'Men_On' if bases else 'Empty'
+
+
+def play_terms(row):
+    """Every term a play is found under"""
+    terms = {f"w:{token}" for token in tokenize(row['description'])}
+    terms.add(f"e:{row['event_type']}")
+    terms.add(f"b:{row['batter']}")
+    terms.add(f"p:{row['pitcher']}")
+    terms.add(f"i:{row['inning']}")
+    terms.add(f"h:{HALVES[row['half']] if row['half'] in (0, 1) else ''}")
+    terms.add(f"g:{row['game_pk']}")
+    terms.add(f"m:{row['men_on_base']}")
+    return terms
+
+
+class PlayIndex:
+    """Inverted index over completed plays, persisted as immutable segments
+
+    Plays get consecutive document ids. Each term maps to a sorted array of document ids, so a
+    query is an intersection of the arrays for its terms, smallest first. New plays go to a
+    pending buffer that is searchable straight away and written out as a segment on flush.
+
+    Worker processes can share the directory. Flushes take turns through a lock file and first
+    take in the segments others wrote, dropping pending plays one of them already stored;
+    refresh() does the same for a reader.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.RLock()
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._file_lock = FileLock(os.path.join(path, '.lock'))
+        self._load()
+
+    def _segments(self):
+        return sorted(name for name in os.listdir(self.path) if name.startswith('segment-'))
+
+    def _load(self):
+        while True:
+            segments = self._segments()
+            try:
+                return self._read(segments)
+            except FileNotFoundError:
+                # Another process compacted the segments away while they were being read
+                continue
+
+    def _read(self, segments):
+        ints = {name: [] for name, _ in INT_COLUMNS}
+        texts = {name: [] for name in TEXT_COLUMNS}
+        postings = {}
+        finished = set()
+        base = 0
+        for segment in segments:
+            directory = os.path.join(self.path, segment)
+            for name, _ in INT_COLUMNS:
+                ints[name].append(np.load(os.path.join(directory, f"{name}.npy")))
+            with open(os.path.join(directory, 'documents.json'), 'r', encoding='utf-8') as f:
+                documents = json.load(f)
+            for name in TEXT_COLUMNS:
+                texts[name].extend(documents[name])
+            finished.update(documents.get('finished', []))
+            with open(os.path.join(directory, 'terms.json'), 'r', encoding='utf-8') as f:
+                terms = json.load(f)
+            offsets = np.load(os.path.join(directory, 'offsets.npy'))
+            doc_ids = np.load(os.path.join(directory, 'doc_ids.npy'))
+            for n, term in enumerate(terms):
+                postings.setdefault(term, []).append(doc_ids[offsets[n]:offsets[n + 1]].astype(np.int32) + base)
+            base += len(ints['game_pk'][-1])
+
+        self._ints = {name: np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+                      for (name, dtype), arrays in zip(INT_COLUMNS, ints.values())}
+        self._texts = texts
+        self._stored = base
+        self._postings = {term: np.concatenate(arrays) if len(arrays) > 1 else arrays[0]
+                          for term, arrays in postings.items()}
+        self._pending_rows = []
+        self._pending_postings = {}
+        self._merged = {}
+        self._indexed = set(zip(self._ints['game_pk'].tolist(), self._ints['at_bat'].tolist()))
+        self.finished = finished
+        self._pending_finished = set()
+        self._loaded = segments
+
+    def refresh(self):
+        """Take in the segments other processes have written, keeping what's pending here"""
+        with self._lock:
+            if self._segments() == self._loaded:
+                return
+            rows, finished = self._pending_rows, self._pending_finished
+            self._load()
+            for row in rows:
+                if (row['game_pk'], row['at_bat']) not in self._indexed:
+                    self._add_row(row)
+            self._pending_finished = finished - self.finished
+            self.finished |= finished
+
+    def __len__(self):
+        with self._lock:
+            return self._stored + len(self._pending_rows)
+
+    def add_plays(self, game_pk, all_plays, game_date=None, start=0):
+        """Index a game's completed plays that aren't indexed yet; returns how many were added
+
+        all_plays may be just the game's plays from index start on.
+        """
+        added = 0
+        with self._lock:
+            for index, play in enumerate(all_plays, start):
+                about = play.get('about', {})
+                at_bat = about.get('atBatIndex', index)
+                if not about.get('isComplete', True) or (game_pk, at_bat) in self._indexed:
+                    continue
+                matchup = play.get('matchup', {})
+                self._add_row({
+                    'game_pk': game_pk,
+                    'at_bat': at_bat,
+                    'game_date': date_number(game_date) or 0,
+                    'inning': about.get('inning', 0),
+                    'half': HALVES.index(about.get('halfInning')) if about.get('halfInning') in HALVES else -1,
+                    'batter': matchup.get('batter', {}).get('id', 0),
+                    'pitcher': matchup.get('pitcher', {}).get('id', 0),
+                    'description': play.get('result', {}).get('description', ''),
+                    'event_type': play.get('result', {}).get('eventType', ''),
+                    'men_on_base': men_on_base(play),
+                })
+                added += 1
+            if len(self._pending_rows) >= FLUSH_EVERY:
+                self.flush()
+        return added
+
+    def _add_row(self, row):
+        doc_id = self._stored + len(self._pending_rows)
+        self._pending_rows.append(row)
+        for term in play_terms(row):
+            self._pending_postings.setdefault(term, []).append(doc_id)
+            self._merged.pop(term, None)
+        self._indexed.add((row['game_pk'], row['at_bat']))
+
+    def mark_finished(self, game_pk):
+        """Record that every play of a game is indexed, so it is never re-read"""
+        with self._lock:
+            if game_pk not in self.finished:
+                self.finished.add(game_pk)
+                self._pending_finished.add(game_pk)
+
+    def flush(self):
+        """Write pending plays out as a segment; returns the number written"""
+        with self._lock, self._file_lock:
+            self.refresh()
+            rows = self._pending_rows
+            if not rows and not self._pending_finished:
+                return 0
+            segments = self._segments()
+            number = int(segments[-1].split('-')[1]) + 1 if segments else 1
+            ints = {name: np.array([row[name] for row in rows], dtype=dtype) for name, dtype in INT_COLUMNS}
+            texts = {name: [row[name] for row in rows] for name in TEXT_COLUMNS}
+            local = {term: np.array(ids, dtype=np.int32) - self._stored
+                     for term, ids in self._pending_postings.items()}
+            self._write_segment(number, ints, texts, local, self._pending_finished)
+            self._pending_finished = set()
+
+            for name, _ in INT_COLUMNS:
+                self._ints[name] = np.concatenate([self._ints[name], ints[name]])
+            for name in TEXT_COLUMNS:
+                self._texts[name].extend(texts[name])
+            for term, ids in self._pending_postings.items():
+                ids = np.array(ids, dtype=np.int32)
+                known = self._postings.get(term)
+                self._postings[term] = ids if known is None else np.concatenate([known, ids])
+            self._stored += len(rows)
+            self._pending_rows = []
+            self._pending_postings = {}
+            self._merged = {}
+            self._loaded = self._segments()
+            if len(segments) + 1 > MAX_SEGMENTS:
+                self.compact()
+            return len(rows)
+
+    def _write_segment(self, number, ints, texts, postings, finished):
+        staging = tempfile.mkdtemp(prefix='.segment-', dir=self.path)
+        for name, values in ints.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values)
+        with open(os.path.join(staging, 'documents.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(texts, finished=sorted(finished)), f)
+        terms = sorted(postings)
+        lengths = [len(postings[term]) for term in terms]
+        offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        doc_ids = np.concatenate([postings[term] for term in terms]) if terms else np.empty(0, dtype=np.int32)
+        np.save(os.path.join(staging, 'offsets.npy'), offsets)
+        np.save(os.path.join(staging, 'doc_ids.npy'), doc_ids.astype(np.int32))
+        with open(os.path.join(staging, 'terms.json'), 'w', encoding='utf-8') as f:
+            json.dump(terms, f)
+        os.replace(staging, os.path.join(self.path, f"segment-{number:06d}"))
+
+    def compact(self):
+        """Rewrite every stored segment as one; flush calls it with the lock file held"""
+        with self._lock:
+            segments = self._segments()
+            if len(segments) < 2:
+                return
+            number = int(segments[-1].split('-')[1]) + 1
+            self._write_segment(number, self._ints, self._texts, self._postings,
+                                self.finished - self._pending_finished)
+            for segment in segments:
+                shutil.rmtree(os.path.join(self.path, segment), ignore_errors=True)
+            self._loaded = self._segments()
+
+    def _posting(self, term):
+        """Sorted document ids for a term, stored and pending together"""
+        merged = self._merged.get(term)
+        if merged is None:
+            stored = self._postings.get(term)
+            pending = self._pending_postings.get(term)
+            if pending:
+                pending = np.array(pending, dtype=np.int32)
+                merged = pending if stored is None else np.concatenate([stored, pending])
+            else:
+                merged = stored if stored is not None else np.empty(0, dtype=np.int32)
+            self._merged[term] = merged
+        return merged
+
+    def _column(self, name, doc_ids):
+        """Values of an integer column for a set of document ids"""
+        stored = doc_ids[doc_ids < self._stored]
+        values = self._ints[name][stored]
+        if len(stored) == len(doc_ids):
+            return values
+        pending = [self._pending_rows[doc_id - self._stored][name] for doc_id in doc_ids[len(stored):]]
+        return np.concatenate([values, np.array(pending, dtype=values.dtype)])
+
+    def _row(self, doc_id):
+        if doc_id >= self._stored:
+            row = self._pending_rows[doc_id - self._stored]
+        else:
+            row = {name: self._ints[name][doc_id].item() for name, _ in INT_COLUMNS}
+            row.update({name: self._texts[name][doc_id] for name in TEXT_COLUMNS})
+        return {
+            'gamePk': row['game_pk'],
+            'atBatIndex': row['at_bat'],
+            'date': date_string(row['game_date']) if row['game_date'] else None,
+            'inning': row['inning'],
+            'halfInning': HALVES[row['half']] if row['half'] in (0, 1) else None,
+            'batter': row['batter'],
+            'pitcher': row['pitcher'],
+            'eventType': row['event_type'],
+            'menOnBase': row['men_on_base'],
+            'description': row['description'],
+        }
+
+    def search(self, text=None, event_type=None, batter=None, pitcher=None, inning=None, half_inning=None,
+               game_pk=None, men_on_base=None, start_date=None, end_date=None, limit=50, offset=0):
+        """Plays matching every given condition, most recent first"""
+        terms = [f"w:{token}" for token in tokenize(text)]
+        for prefix, value in (('e', event_type), ('b', batter), ('p', pitcher), ('i', inning),
+                              ('h', half_inning), ('g', game_pk), ('m', men_on_base)):
+            if value is not None and value != '':
+                terms.append(f"{prefix}:{value}")
+        with self._lock:
+            if terms:
+                postings = sorted((self._posting(term) for term in terms), key=len)
+                matches = postings[0]
+                for posting in postings[1:]:
+                    if not len(matches):
+                        break
+                    matches = np.intersect1d(matches, posting, assume_unique=True)
+            else:
+                matches = np.arange(self._stored + len(self._pending_rows), dtype=np.int32)
+
+            if start_date is not None or end_date is not None:
+                dates = self._column('game_date', matches)
+                keep = np.ones(len(matches), dtype=bool)
+                if start_date is not None:
+                    keep &= dates >= date_number(start_date)
+                if end_date is not None:
+                    keep &= dates <= date_number(end_date)
+                matches = matches[keep]
+
+            # Most recent first: by date, then game, then at-bat, all descending
+            order = np.lexsort((self._column('at_bat', matches), self._column('game_pk', matches),
+                                self._column('game_date', matches)))[::-1]
+            page = matches[order[offset:offset + limit]]
+            return {
+                'total': int(len(matches)),
+                'offset': offset,
+                'plays': [self._row(int(doc_id)) for doc_id in page],
+            }
@@ -0,0 +1,98 @@
+import threading
+
+
+class PlayLog:
+    """Append-only log of one game's plays, fed from successive playByPlay payloads
+
+    Completed plays never change once logged, so each update only looks at the play that was
+    still in progress and anything after it, and each cursor read only copies what's new.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.plays = []
+
+    def ingest(self, all_plays, prepare=None):
+        """Append new plays and refresh the in-progress one; returns how many plays changed
+
+        The changed plays are always the last ones of all_plays, so all_plays[-changed:] is what
+        anything else fed from the same payloads has yet to see.
+        """
+        with self._lock:
+            start = len(self.plays)
+            if self.plays and not self.plays[-1].get('about', {}).get('isComplete', True):
+                start -= 1
+            changed = 0
+            for index in range(start, len(all_plays)):
+                play = all_plays[index]
+                if index < len(self.plays):
+                    logged = self.plays[index]
+                    if (len(play.get('playEvents', [])) == len(logged.get('playEvents', []))
+                            and play.get('about', {}).get('isComplete') == logged.get('about', {}).get('isComplete')):
+                        continue
+                    self.plays[index] = prepare(play) if prepare else play
+                else:
+                    self.plays.append(prepare(play) if prepare else play)
+                changed += 1
+            return changed
+
+    def cursor(self):
+        """Cursor just past everything in the log"""
+        with self._lock:
+            return self._cursor()
+
+    def _cursor(self):
+        if not self.plays:
+            return {'since': 0, 'pitchSince': 0}
+        last = self.plays[-1]
+        if last.get('about', {}).get('isComplete', True):
+            return {'since': len(self.plays), 'pitchSince': 0}
+        return {'since': len(self.plays) - 1, 'pitchSince': len(last.get('playEvents', []))}
+
+    def since(self, at_bat_index, pitch_since=0):
+        """Plays and pitch events added since a client's cursor, plus the cursor to send next time
+
+        The cursor means the client holds every play before at_bat_index in full and the first
+        pitch_since playEvents of play at_bat_index. A play returned with pitchOffset > 0
+        carries only the playEvents after that offset.
+        """
+        with self._lock:
+            at_bat_index = max(at_bat_index, 0)
+            plays = []
+            if at_bat_index < len(self.plays):
+                head = self.plays[at_bat_index]
+                events = head.get('playEvents', [])
+                if 0 < pitch_since <= len(events):
+                    if len(events) > pitch_since or head.get('about', {}).get('isComplete', True):
+                        plays.append(dict(head, playEvents=events[pitch_since:], pitchOffset=pitch_since))
+                else:
+                    plays.append(head)
+                plays.extend(self.plays[at_bat_index + 1:])
+            return {
+                'allPlays': plays,
+                'cursor': self._cursor(),
+                'totalPlays': len(self.plays),
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self.plays)
+
+
+class PlayLogs:
+    """Play logs for every game being followed, keyed by data source and gamePk"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._logs = {}
+
+    def get(self, source, game_pk):
+        with self._lock:
+            log = self._logs.get((source, game_pk))
+            if log is None:
+                log = self._logs[(source, game_pk)] = PlayLog()
+            return log
+
+    def discard(self, source, game_pk):
+        with self._lock:
+            self._logs.pop((source, game_pk), None)
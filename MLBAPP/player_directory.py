@@ -0,0 +1,154 @@
+import bisect
+import re
+import sys
+import threading
+import unicodedata
+
+NON_NAME = re.compile(r"[^a-z0-9 ]+")
+
+# Person fields kept in the directory, from whichever source has them
+PERSON_FIELDS = ('fullName', 'firstName', 'lastName', 'primaryNumber', 'currentAge', 'height', 'weight')
+
+
+def normalize_name(name):
+    """Lowercase, accent-free, punctuation-free form of a name for prefix matching"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return ' '.join(NON_NAME.sub('', text.replace('-', ' ')).split())
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def name_keys(person):
+    """Keys a person is found under: the full name, and from the last name on"""
+    full = normalize_name(person.get('fullName'))
+    keys = {full} if full else set()
+    last = normalize_name(person.get('lastName'))
+    if not last and ' ' in full:
+        last = full.split(' ', 1)[1]
+    if last:
+        first = normalize_name(person.get('firstName')) or full.split(' ', 1)[0]
+        keys.add(f"{last} {first}".strip())
+    return keys
+
+
+class PlayerDirectory:
+    """Every player seen in rosters, boxscores and plays, by id and by name prefix
+
+    People are kept as small dicts whose strings are interned, so the thousands of repeated
+    positions, hands and team names share one copy. Names are indexed in a sorted array of
+    normalized keys; a prefix search is a binary search plus a short forward scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._people = {}
+        self._keys = []
+        self._ids = []
+
+    def __len__(self):
+        return len(self._people)
+
+    def get(self, person_id):
+        return self._people.get(person_id)
+
+    def add(self, person, team=None, position=None, bat_side=None, pitch_hand=None, jersey_number=None):
+        """Add or update a person; returns whether anything changed"""
+        person_id = person.get('id')
+        if not person_id:
+            return False
+        update = {field: _intern(person[field]) for field in PERSON_FIELDS if person.get(field) is not None}
+        update['link'] = _intern(person.get('link') or f"/api/v1/people/{person_id}")
+        if team:
+            update['currentTeam'] = {'id': team.get('id'), 'name': _intern(team.get('name'))}
+        position = position or person.get('primaryPosition')
+        if position:
+            update['primaryPosition'] = {
+                'code': _intern(position.get('code')),
+                'abbreviation': _intern(position.get('abbreviation')),
+            }
+        for field, value in (('batSide', bat_side or person.get('batSide')),
+                             ('pitchHand', pitch_hand or person.get('pitchHand'))):
+            if value and value.get('code'):
+                update[field] = {'code': _intern(value['code'])}
+        if jersey_number:
+            update['primaryNumber'] = _intern(str(jersey_number))
+
+        with self._lock:
+            known = self._people.get(person_id)
+            if known is not None and all(known.get(field) == value for field, value in update.items()):
+                return False
+            merged = dict(known or {'id': person_id}, **update)
+            old_keys = name_keys(known) if known else set()
+            new_keys = name_keys(merged)
+            for key in old_keys - new_keys:
+                self._remove_key(key, person_id)
+            for key in new_keys - old_keys:
+                self._insert_key(key, person_id)
+            self._people[person_id] = merged
+            return True
+
+    def _insert_key(self, key, person_id):
+        key = _intern(key)
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key and self._ids[index] < person_id:
+            index += 1
+        self._keys.insert(index, key)
+        self._ids.insert(index, person_id)
+
+    def _remove_key(self, key, person_id):
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and self._keys[index] == key:
+            if self._ids[index] == person_id:
+                del self._keys[index]
+                del self._ids[index]
+                return
+            index += 1
+
+    def add_roster(self, team, roster):
+        """Add everyone on a /teams/{id}/roster payload; returns how many changed"""
+        changed = 0
+        for entry in roster.get('roster', []):
+            changed += self.add(entry.get('person', {}), team=team, position=entry.get('position'),
+                                jersey_number=entry.get('jerseyNumber'))
+        return changed
+
+    def add_boxscore(self, boxscore):
+        """Add everyone in a boxscore's players maps; returns how many changed"""
+        changed = 0
+        for side in ('away', 'home'):
+            team_data = boxscore.get('teams', {}).get(side, {})
+            for player in team_data.get('players', {}).values():
+                changed += self.add(player.get('person', {}), team=team_data.get('team'),
+                                    position=player.get('position'), jersey_number=player.get('jerseyNumber'))
+        return changed
+
+    def add_plays(self, all_plays):
+        """Add the batter and pitcher of every play; returns how many changed"""
+        changed = 0
+        for play in all_plays:
+            matchup = play.get('matchup', {})
+            changed += self.add(matchup.get('batter', {}), bat_side=matchup.get('batSide'))
+            changed += self.add(matchup.get('pitcher', {}), pitch_hand=matchup.get('pitchHand'))
+        return changed
+
+    def search(self, prefix, limit=10):
+        """People whose full name or last name starts with a prefix, in name order"""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            index = bisect.bisect_left(self._keys, prefix)
+            while index < len(self._keys) and len(results) < limit:
+                if not self._keys[index].startswith(prefix):
+                    break
+                person_id = self._ids[index]
+                if person_id not in seen:
+                    seen.add(person_id)
+                    results.append(self._people[person_id])
+                index += 1
+        return results
@@ -0,0 +1,159 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from team_reference import MLB_SPORT_ID
+from upstream_scheduler import upstream
+
+# Where schedule days persist between runs of the app and the scripts
+SCHEDULE_CACHE_PATH = os.environ.get(
+    'MLB_SCHEDULE_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'mlbapp', 'schedule_cache.sqlite3'))
+
+MLB_API_BASE_URL = os.environ.get('MLB_API_BASE_URL', "https://statsapi.mlb.com")
+
+# Seconds a day's schedule is reused, by what's going on that day. A past day whose games are
+# all final (or that had none) doesn't change again and is kept for good.
+LIVE_TTL = 10
+TODAY_TTL = 60
+FUTURE_TTL = 3600
+
+
+def _day(value):
+    return value if isinstance(value, str) else value.strftime('%Y-%m-%d')
+
+
+def day_range(start, end):
+    """YYYY-MM-DD strings from start to end, both included"""
+    first = datetime.date.fromisoformat(_day(start))
+    last = datetime.date.fromisoformat(_day(end))
+    return [(first + datetime.timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+
+def ttl_for(entry, today):
+    """Seconds a day's schedule entry stays fresh, or None if it never goes stale"""
+    states = {game.get('status', {}).get('abstractGameState') for game in entry.get('games', [])}
+    if 'Live' in states:
+        return LIVE_TTL
+    if entry['date'] < today and states <= {'Final'}:
+        return None
+    return TODAY_TTL if entry['date'] <= today else FUTURE_TTL
+
+
+class ScheduleService:
+    """Schedule days shared by the scripts and game discovery, fetched a date range at a time
+
+    A query for a range of days asks upstream once, with startDate/endDate, for the span of the
+    days it doesn't have fresh; the answer is split into one entry per day, each kept on disk as
+    long as ttl_for allows. Past days whose games are all final never expire, so looking back over
+    the last two weeks costs one request the first time and at most one for today after that.
+    """
+
+    def __init__(self, path=SCHEDULE_CACHE_PATH, fetch=None, base_url=MLB_API_BASE_URL, clock=time.time):
+        self.path = path
+        self.base_url = base_url
+        self._fetch = fetch
+        self._clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schedule_days ("
+                "key TEXT PRIMARY KEY, body BLOB, fetched_at REAL, expires_at REAL)")
+        self.stats = {'requests': 0, 'hits': 0, 'fetchedDays': 0}
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(date, hydrate):
+        return f"{hydrate or ''}|{date}"
+
+    def _today(self):
+        return datetime.datetime.fromtimestamp(self._clock()).strftime('%Y-%m-%d')
+
+    def days(self, start, end, hydrate=None, max_age=None):
+        """{date: {'date', 'games', ...}} for every day from start to end, in order
+
+        max_age caps, in seconds, how old an entry that can still change may be; settled days
+        are served whatever their age.
+        """
+        wanted = day_range(start, end)
+        now = self._clock()
+        conn = self._connect()
+        found = {}
+        for date in wanted:
+            row = conn.execute("SELECT body, fetched_at, expires_at FROM schedule_days WHERE key = ?",
+                               (self._key(date, hydrate),)).fetchone()
+            if row is None:
+                continue
+            body, fetched_at, expires_at = row
+            if expires_at is None or (expires_at > now and (max_age is None or fetched_at + max_age > now)):
+                found[date] = json.loads(zlib.decompress(body))
+        missing = [date for date in wanted if date not in found]
+        self.stats['hits'] += len(wanted) - len(missing)
+        if missing:
+            found.update(self._fetch_range(missing[0], missing[-1], hydrate))
+        return {date: found[date] for date in wanted if date in found}
+
+    def _fetch_range(self, start, end, hydrate):
+        """Fetch the days from start to end in one request and store each; returns them by date"""
+        params = {'sportId': MLB_SPORT_ID, 'startDate': start, 'endDate': end}
+        if hydrate:
+            params['hydrate'] = hydrate
+        self.stats['requests'] += 1
+        try:
+            response = (self._fetch or upstream.get)(f"{self.base_url}/api/v1/schedule", params=params, timeout=10)
+            if response.status_code != 200:
+                print(f"Failed to get schedule {start} to {end}: {response.status_code}")
+                return {}
+            data = json.loads(response.content)
+        except Exception as e:
+            print(f"Error fetching schedule {start} to {end}: {str(e)}")
+            return {}
+        # Days without games aren't in the answer; they're stored empty so they aren't asked for again
+        days = {date: {'date': date, 'totalGames': 0, 'games': []} for date in day_range(start, end)}
+        days.update({entry['date']: entry for entry in data.get('dates', []) if entry.get('date') in days})
+        now, today = self._clock(), self._today()
+        with self._connect() as conn:
+            for date, entry in days.items():
+                ttl = ttl_for(entry, today)
+                body = zlib.compress(json.dumps(entry, separators=(',', ':')).encode('utf-8'), 6)
+                conn.execute("INSERT OR REPLACE INTO schedule_days (key, body, fetched_at, expires_at) "
+                             "VALUES (?, ?, ?, ?)",
+                             (self._key(date, hydrate), body, now, None if ttl is None else now + ttl))
+        self.stats['fetchedDays'] += len(days)
+        return days
+
+    def games(self, date, hydrate=None):
+        """Games on one day's schedule"""
+        return self.days(date, date, hydrate).get(_day(date), {}).get('games', [])
+
+    def recent_games(self, days_back, hydrate=None, today=None):
+        """[(date, game)] over the last days_back days, most recent day first, each day's in schedule order"""
+        today = datetime.date.fromisoformat(_day(today or self._today()))
+        start = today - datetime.timedelta(days=days_back - 1)
+        days = self.days(start, today, hydrate)
+        return [(date, game) for date in sorted(days, reverse=True) for game in days[date].get('games', [])]
+
+    def most_recent_final_game(self, days_back=7, hydrate=None, today=None):
+        """(date, game) of the most recent game that's final, from one range query, or None"""
+        for date, game in self.recent_games(days_back, hydrate, today):
+            if game.get('status', {}).get('detailedState') == 'Final':
+                return date, game
+        return None
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM schedule_days")
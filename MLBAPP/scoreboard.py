@@ -0,0 +1,122 @@
+import threading
+import time
+import uuid
+
+# Longest a scoreboard long-poll is held open, in seconds
+SCOREBOARD_MAX_WAIT = 25
+
+
+def game_summary(game):
+    """The part of a schedule game a scoreboard card shows, in the schedule's own shape"""
+    teams = {}
+    for side in ('away', 'home'):
+        entry = game.get('teams', {}).get(side, {})
+        team = entry.get('team', {})
+        teams[side] = {
+            'team': {'id': team.get('id'), 'name': team.get('name')},
+            'isWinner': entry.get('isWinner'),
+            'leagueRecord': entry.get('leagueRecord', {'wins': 0, 'losses': 0}),
+        }
+        # Like the schedule, a game nobody has scored in yet has no score at all
+        if entry.get('score') is not None:
+            teams[side]['score'] = entry['score']
+    summary = {
+        'gamePk': game.get('gamePk'),
+        'gameDate': game.get('gameDate'),
+        'status': game.get('status', {}),
+        'teams': teams,
+        'venue': {'name': game.get('venue', {}).get('name')},
+        'seriesDescription': game.get('seriesDescription'),
+    }
+    linescore = game.get('linescore')
+    if linescore:
+        summary['linescore'] = {key: linescore.get(key) for key in ('currentInning', 'inningHalf', 'outs')}
+    return summary
+
+
+class ScoreboardState:
+    """Versioned game summaries for one slate
+
+    Every change to a game's summary bumps the version and stamps the game with it, so a client
+    holding version N only needs the games stamped after N. The epoch tells boards apart, so a
+    version from another board (another date, source or process) is never taken for this one's.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self.epoch = uuid.uuid4().hex[:12]
+        self.version = 0
+        self._games = {}
+
+    def update(self, schedule_data):
+        """Record a fresh schedule payload; returns the number of games that changed"""
+        summaries = []
+        for date in (schedule_data or {}).get('dates', []):
+            for game in date.get('games', []):
+                if game.get('gamePk') is not None:
+                    summaries.append(game_summary(game))
+        with self._changed:
+            changed = 0
+            for summary in summaries:
+                known = self._games.get(summary['gamePk'])
+                if known is not None and known[0] == summary:
+                    continue
+                self.version += 1
+                self._games[summary['gamePk']] = (summary, self.version)
+                changed += 1
+            if changed:
+                self._changed.notify_all()
+            return changed
+
+    def knows(self, version, epoch=None):
+        """Whether a client's version was handed out by this board"""
+        return 0 < version <= self.version and epoch in (None, self.epoch)
+
+    def since(self, version, epoch=None):
+        """Summaries of the games changed after a version, plus the version to ask from next
+
+        A version the board never handed out gets every game.
+        """
+        with self._changed:
+            full = not self.knows(version, epoch)
+            games = [summary for summary, stamped in self._games.values() if full or stamped > version]
+            games.sort(key=lambda summary: (summary.get('gameDate') or '', summary['gamePk']))
+            return {'version': self.version, 'epoch': self.epoch, 'full': full, 'games': games}
+
+    def wait(self, version, timeout):
+        """Block until the board moves past a version; returns whether it did"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.version != version, timeout)
+
+
+class ScoreboardStates:
+    """Scoreboard state for every slate being watched, keyed by data source and date"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards = {}
+
+    def get(self, source, date):
+        with self._lock:
+            board = self._boards.get((source, date))
+            if board is None:
+                board = self._boards[(source, date)] = ScoreboardState()
+            return board
+
+
+def long_poll(board, version, refresh, wait, interval, epoch=None):
+    """Refresh the board until it moves past a version or the wait runs out
+
+    refresh() feeds the board a schedule payload; waiters on the same board wake as soon as any
+    of them sees a change, so concurrent long-polls share each upstream refresh.
+    """
+    deadline = time.monotonic() + min(max(wait, 0), SCOREBOARD_MAX_WAIT)
+    while True:
+        refresh()
+        remaining = deadline - time.monotonic()
+        if board.version != version or not board.knows(version, epoch) or remaining <= 0:
+            break
+        board.wait(version, min(remaining, interval))
+        if board.version != version:
+            break
+    return board.since(version, epoch)
@@ -0,0 +1,394 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from file_lock import FileLock
+
+# Where the columnar season tables live, one directory per data source
+SEASON_STATS_PATH = os.environ.get(
+    'MLB_SEASON_STATS', os.path.join(os.path.expanduser('~'), '.cache', 'mlbapp', 'season_stats'))
+
+# Segments merged into one once a table has more than this many
+MAX_SEGMENTS = 32
+
+KEY_COLUMNS = (
+    ('player', np.int64),
+    ('game_pk', np.int64),
+    ('game_date', np.int32),
+    ('team', np.int32),
+    ('home', np.bool_),
+)
+
+BATTING_STATS = (
+    'gamesPlayed', 'plateAppearances', 'atBats', 'runs', 'hits', 'doubles', 'triples', 'homeRuns',
+    'rbi', 'baseOnBalls', 'intentionalWalks', 'hitByPitch', 'strikeOuts', 'stolenBases',
+    'caughtStealing', 'sacFlies', 'sacBunts', 'totalBases', 'leftOnBase', 'groundIntoDoublePlay',
+)
+
+PITCHING_STATS = (
+    'gamesPitched', 'gamesStarted', 'outs', 'battersFaced', 'hits', 'runs', 'earnedRuns',
+    'baseOnBalls', 'strikeOuts', 'homeRuns', 'hitByPitch', 'numberOfPitches', 'strikes', 'wins',
+    'losses', 'saves', 'holds', 'blownSaves',
+)
+
+
+def date_number(date):
+    """'2025-08-27' -> 20250827, the form dates are stored and filtered in"""
+    if date is None:
+        return None
+    return int(str(date)[:10].replace('-', ''))
+
+
+def date_string(number):
+    number = int(number)
+    return f"{number // 10000:04d}-{number // 100 % 100:02d}-{number % 100:02d}"
+
+
+def _ratio(numerator, denominator, scale=1.0, places=3):
+    """Element-wise numerator / denominator, None where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = np.where(denominator > 0, scale * numerator / denominator, np.nan)
+    if values.ndim == 0:
+        return None if np.isnan(values) else round(float(values), places)
+    return [None if np.isnan(value) else round(float(value), places) for value in values]
+
+
+def batting_rates(totals):
+    """AVG/OBP/SLG/OPS from counting stats (scalars or arrays)"""
+    at_bats = totals['atBats']
+    on_base = totals['hits'] + totals['baseOnBalls'] + totals['hitByPitch']
+    on_base_chances = at_bats + totals['baseOnBalls'] + totals['hitByPitch'] + totals['sacFlies']
+    rates = {
+        'avg': _ratio(totals['hits'], at_bats),
+        'obp': _ratio(on_base, on_base_chances),
+        'slg': _ratio(totals['totalBases'], at_bats),
+    }
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ops = (np.where(on_base_chances > 0, on_base / np.maximum(on_base_chances, 1), np.nan)
+               + np.where(at_bats > 0, totals['totalBases'] / np.maximum(at_bats, 1), np.nan))
+    rates['ops'] = _ratio(ops, np.ones_like(ops))
+    return rates
+
+
+def pitching_rates(totals):
+    """ERA/WHIP and per-nine rates from counting stats (scalars or arrays)"""
+    outs = totals['outs']
+    return {
+        'era': _ratio(totals['earnedRuns'], outs, scale=27, places=2),
+        'whip': _ratio(totals['baseOnBalls'] + totals['hits'], outs, scale=3, places=2),
+        'strikeoutsPer9': _ratio(totals['strikeOuts'], outs, scale=27, places=2),
+        'walksPer9': _ratio(totals['baseOnBalls'], outs, scale=27, places=2),
+    }
+
+
+def innings_pitched(outs):
+    outs = int(outs)
+    return f"{outs // 3}.{outs % 3}"
+
+
+class ColumnarTable:
+    """Append-only table stored as segments of .npy files, one file per column
+
+    Each flush writes the pending rows as a new segment directory and renames it into place,
+    so a reader never sees half a segment. Segments are memory-mapped when loaded, and loaded
+    again when the directory has changed. Flushes must be serialized across processes by the
+    caller (SeasonStatsStore holds a lock file), since the next segment number comes from the
+    directory listing.
+    """
+
+    def __init__(self, path, stat_columns):
+        self.path = path
+        self.stat_columns = stat_columns
+        self.dtypes = dict(KEY_COLUMNS, **{name: np.int32 for name in stat_columns})
+        self._pending = {name: [] for name in self.dtypes}
+        self._columns = None
+        self._loaded = None
+        self._game_pks = None
+        os.makedirs(path, exist_ok=True)
+
+    def _segments(self):
+        return sorted(name for name in os.listdir(self.path) if name.startswith('segment-'))
+
+    def append(self, row):
+        for name in self.dtypes:
+            self._pending[name].append(row.get(name, 0))
+
+    @property
+    def pending(self):
+        return len(self._pending['player'])
+
+    def drop_pending(self, game_pks):
+        """Forget the pending rows of some games"""
+        keep = [n for n, game_pk in enumerate(self._pending['game_pk']) if game_pk not in game_pks]
+        self._pending = {name: [values[n] for n in keep] for name, values in self._pending.items()}
+
+    def flush(self):
+        """Write pending rows as a new segment; returns the number of rows written"""
+        count = self.pending
+        if not count:
+            return 0
+        segments = self._segments()
+        number = int(segments[-1].split('-')[1]) + 1 if segments else 1
+        self._write_segment(number, {name: np.array(values, dtype=self.dtypes[name])
+                                     for name, values in self._pending.items()})
+        self._pending = {name: [] for name in self.dtypes}
+        self._columns = None
+        if len(segments) + 1 > MAX_SEGMENTS:
+            self.compact()
+        return count
+
+    def _write_segment(self, number, columns):
+        staging = tempfile.mkdtemp(prefix='.segment-', dir=self.path)
+        for name, values in columns.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values)
+        os.replace(staging, os.path.join(self.path, f"segment-{number:06d}"))
+
+    def compact(self):
+        """Merge every segment into one"""
+        segments = self._segments()
+        if len(segments) < 2:
+            return
+        merged = self.columns
+        number = int(segments[-1].split('-')[1]) + 1
+        self._write_segment(number, {name: np.ascontiguousarray(values) for name, values in merged.items()})
+        for segment in segments:
+            shutil.rmtree(os.path.join(self.path, segment), ignore_errors=True)
+        self._columns = None
+
+    @property
+    def columns(self):
+        """Every flushed row, one array per column, including segments other processes wrote"""
+        segments = self._segments()
+        while self._columns is None or segments != self._loaded:
+            try:
+                self._columns = self._read(segments)
+                self._loaded = segments
+            except FileNotFoundError:
+                # Another process compacted the segments away while they were being read
+                segments = self._segments()
+        return self._columns
+
+    def _read(self, segments):
+        parts = {name: [] for name in self.dtypes}
+        for segment in segments:
+            for name in self.dtypes:
+                file = os.path.join(self.path, segment, f"{name}.npy")
+                if os.path.exists(file):
+                    parts[name].append(np.load(file, mmap_mode='r'))
+                else:
+                    # A column added after this segment was written
+                    rows = len(np.load(os.path.join(self.path, segment, 'player.npy'), mmap_mode='r'))
+                    parts[name].append(np.zeros(rows, dtype=self.dtypes[name]))
+        return {
+            name: np.concatenate(arrays) if arrays else np.empty(0, dtype=self.dtypes[name])
+            for name, arrays in parts.items()
+        }
+
+    def game_pks(self):
+        """Every game with a flushed row"""
+        columns = self.columns
+        if self._game_pks is None or self._game_pks[0] is not columns:
+            self._game_pks = (columns, frozenset(np.unique(columns['game_pk']).tolist()))
+        return self._game_pks[1]
+
+    def __len__(self):
+        return len(self.columns['player']) + self.pending
+
+
+class SeasonStatsStore:
+    """Per-game batting and pitching lines flattened out of boxscores into columnar tables
+
+    Any number of processes can share a store directory: flushes take turns through a lock file,
+    and a flush drops the pending lines of games another process wrote first, so no game is
+    stored twice. refresh() takes in what the others wrote.
+    """
+
+    def __init__(self, path=SEASON_STATS_PATH):
+        self._lock = threading.Lock()
+        self.path = path
+        self.batting = ColumnarTable(os.path.join(path, 'batting'), BATTING_STATS)
+        self.pitching = ColumnarTable(os.path.join(path, 'pitching'), PITCHING_STATS)
+        self._file_lock = FileLock(os.path.join(path, '.lock'))
+        self._pending_games = set()
+        self.games = self._stored_games()
+
+    def _stored_games(self):
+        return set(self.batting.game_pks() | self.pitching.game_pks())
+
+    def refresh(self):
+        """Count games other processes have stored as ingested, so they aren't fetched again"""
+        with self._lock:
+            self.games |= self._stored_games()
+
+    def ingest_boxscore(self, game_pk, boxscore, game_date, team_ids=None):
+        """Flatten one finished game's player lines; returns (batting rows, pitching rows)
+
+        team_ids ({'away': id, 'home': id}) overrides the team ids in the boxscore.
+        """
+        with self._lock:
+            if game_pk in self.games:
+                return 0, 0
+            self.games.add(game_pk)
+            self._pending_games.add(game_pk)
+            batting = pitching = 0
+            for side in ('away', 'home'):
+                team = boxscore.get('teams', {}).get(side, {})
+                team_id = (team_ids or {}).get(side) or team.get('team', {}).get('id', 0)
+                for player in team.get('players', {}).values():
+                    stats = player.get('stats', {})
+                    key = {
+                        'player': player.get('person', {}).get('id', 0),
+                        'game_pk': game_pk,
+                        'game_date': date_number(game_date) or 0,
+                        'team': team_id,
+                        'home': side == 'home',
+                    }
+                    line = stats.get('batting') or {}
+                    if line.get('plateAppearances') or line.get('atBats') or line.get('gamesPlayed'):
+                        self.batting.append(dict(key, **{name: line.get(name) or 0 for name in BATTING_STATS}))
+                        batting += 1
+                    line = stats.get('pitching') or {}
+                    if line.get('battersFaced') or line.get('outs') or line.get('gamesPitched'):
+                        self.pitching.append(dict(key, **{name: line.get(name) or 0 for name in PITCHING_STATS}))
+                        pitching += 1
+            return batting, pitching
+
+    def flush(self):
+        """Write the pending lines out; returns how many rows were written"""
+        with self._lock, self._file_lock:
+            duplicates = self._pending_games & self._stored_games()
+            if duplicates:
+                print(f"Dropping {len(duplicates)} games another process already stored")
+                self.batting.drop_pending(duplicates)
+                self.pitching.drop_pending(duplicates)
+            self._pending_games = set()
+            return self.batting.flush() + self.pitching.flush()
+
+    def _select(self, table, fields, player=None, team=None, start_date=None, end_date=None):
+        columns = table.columns
+        mask = np.ones(len(columns['player']), dtype=bool)
+        if player is not None:
+            mask &= columns['player'] == player
+        if team is not None:
+            mask &= columns['team'] == team
+        if start_date is not None:
+            mask &= columns['game_date'] >= date_number(start_date)
+        if end_date is not None:
+            mask &= columns['game_date'] <= date_number(end_date)
+        rows = np.flatnonzero(mask)
+        return {name: np.asarray(columns[name][rows]) for name in fields}
+
+    def _last_games(self, rows, last_games):
+        """Keep only each selection's most recent games"""
+        if not last_games:
+            return rows
+        order = np.lexsort((rows['game_pk'], rows['game_date']))[-last_games:]
+        return {name: values[order] for name, values in rows.items()}
+
+    def batting_totals(self, player, last_games=None, **filters):
+        """A player's summed batting line and rate stats over the selected games"""
+        with self._lock:
+            rows = self._select(self.batting, ('game_pk', 'game_date') + BATTING_STATS, player=player, **filters)
+        rows = self._last_games(rows, last_games)
+        totals = {name: int(rows[name].sum()) for name in BATTING_STATS}
+        rates = batting_rates({name: np.int64(value) for name, value in totals.items()})
+        return dict(totals, player=player, games=len(rows['game_pk']), **rates)
+
+    def pitching_totals(self, player, last_games=None, **filters):
+        """A player's summed pitching line and ERA/WHIP over the selected games"""
+        with self._lock:
+            rows = self._select(self.pitching, ('game_pk', 'game_date') + PITCHING_STATS, player=player, **filters)
+        rows = self._last_games(rows, last_games)
+        totals = {name: int(rows[name].sum()) for name in PITCHING_STATS}
+        rates = pitching_rates({name: np.int64(value) for name, value in totals.items()})
+        return dict(totals, player=player, games=len(rows['game_pk']),
+                    inningsPitched=innings_pitched(totals['outs']), **rates)
+
+    def _rolling(self, table, stats, player, window, **filters):
+        with self._lock:
+            rows = self._select(table, ('game_pk', 'game_date') + stats, player=player, **filters)
+        order = np.lexsort((rows['game_pk'], rows['game_date']))
+        # Window sums from one cumulative sum: sum(i-window+1..i) = c[i] - c[i-window]
+        sums = {}
+        for name in stats:
+            cumulative = np.concatenate(([0], np.cumsum(rows[name][order], dtype=np.int64)))
+            start = np.maximum(np.arange(1, len(order) + 1) - window, 0)
+            sums[name] = cumulative[1:] - cumulative[start]
+        return rows['game_pk'][order], rows['game_date'][order], sums
+
+    def batting_rolling(self, player, window=7, **filters):
+        """AVG/OBP/SLG/OPS over each game's trailing window of games"""
+        game_pks, dates, sums = self._rolling(self.batting, BATTING_STATS, player, window, **filters)
+        rates = batting_rates(sums)
+        return {
+            'player': player,
+            'window': window,
+            'games': [
+                {'gamePk': int(game_pk), 'date': date_string(date),
+                 **{name: rates[name][i] for name in ('avg', 'obp', 'slg', 'ops')}}
+                for i, (game_pk, date) in enumerate(zip(game_pks, dates))
+            ],
+        }
+
+    def pitching_rolling(self, player, window=5, **filters):
+        """ERA/WHIP over each game's trailing window of appearances"""
+        game_pks, dates, sums = self._rolling(self.pitching, PITCHING_STATS, player, window, **filters)
+        rates = pitching_rates(sums)
+        return {
+            'player': player,
+            'window': window,
+            'games': [
+                {'gamePk': int(game_pk), 'date': date_string(date), 'era': rates['era'][i], 'whip': rates['whip'][i]}
+                for i, (game_pk, date) in enumerate(zip(game_pks, dates))
+            ],
+        }
+
+    def _grouped(self, table, stats, **filters):
+        """Stats summed per player with one bincount per column"""
+        with self._lock:
+            rows = self._select(table, ('player',) + stats, **filters)
+        players, groups = np.unique(rows['player'], return_inverse=True)
+        sums = {name: np.bincount(groups, weights=rows[name], minlength=len(players)).astype(np.int64)
+                for name in stats}
+        games = np.bincount(groups, minlength=len(players))
+        return players, games, sums
+
+    def batting_leaders(self, stat='ops', min_plate_appearances=0, limit=10, **filters):
+        """Players ranked by a batting stat or rate"""
+        players, games, sums = self._grouped(self.batting, BATTING_STATS, **filters)
+        values = dict(sums, **{name: np.array([np.nan if v is None else v for v in rates], dtype=np.float64)
+                               for name, rates in batting_rates(sums).items()})
+        if stat not in values:
+            raise ValueError(f"Unknown batting stat: {stat}")
+        qualified = np.flatnonzero(sums['plateAppearances'] >= min_plate_appearances)
+        return self._leaders(players, games, sums, values, stat, qualified, limit, descending=True)
+
+    def pitching_leaders(self, stat='era', min_outs=0, limit=10, **filters):
+        """Players ranked by a pitching stat or rate; ERA and WHIP rank lowest first"""
+        players, games, sums = self._grouped(self.pitching, PITCHING_STATS, **filters)
+        values = dict(sums, **{name: np.array([np.nan if v is None else v for v in rates], dtype=np.float64)
+                               for name, rates in pitching_rates(sums).items()})
+        if stat not in values:
+            raise ValueError(f"Unknown pitching stat: {stat}")
+        qualified = np.flatnonzero(sums['outs'] >= min_outs)
+        return self._leaders(players, games, sums, values, stat, qualified, limit,
+                             descending=stat not in ('era', 'whip', 'walksPer9'))
+
+    def _leaders(self, players, games, sums, values, stat, qualified, limit, descending):
+        column = values[stat][qualified].astype(np.float64)
+        column = np.where(np.isnan(column), -np.inf if descending else np.inf, column)
+        order = np.argsort(-column if descending else column, kind='stable')[:limit]
+        leaders = []
+        for index in qualified[order]:
+            value = values[stat][index]
+            leaders.append({
+                'player': int(players[index]),
+                'games': int(games[index]),
+                stat: None if np.isnan(value) else (round(float(value), 3) if stat not in sums else int(value)),
+            })
+        return {'stat': stat, 'leaders': leaders}
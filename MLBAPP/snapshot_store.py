@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Subtrees whose JSON is at least this long are stored once and referenced by hash
+DEDUPE_THRESHOLD = 256
+
+# Key of the object that stands in for a stored subtree; MLB payloads never use it
+REF = '$ref'
+
+
+def _hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SnapshotStore:
+    """Content-addressed store for JSON snapshots that keeps each large subtree once
+
+    A document is written bottom-up: every object or array whose JSON is at least the threshold
+    long is stored under the hash of that JSON and replaced in its parent by {"$ref": hash}.
+    Team, venue and person records, and the plays a game already had at its last capture, hash
+    the same every time and cost nothing after the first copy. Reading follows the references
+    back down.
+    """
+
+    def __init__(self, path, threshold=DEDUPE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS objects (hash TEXT PRIMARY KEY, body BLOB, size INTEGER)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "name TEXT PRIMARY KEY, root TEXT, logical_size INTEGER, created_at REAL)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _encode(self, value, conn, known):
+        """JSON text for value, with large subtrees stored and replaced by references"""
+        if isinstance(value, dict):
+            text = '{' + ','.join(f'{json.dumps(str(key))}:{self._encode(item, conn, known)}'
+                                  for key, item in value.items()) + '}'
+        elif isinstance(value, (list, tuple)):
+            text = '[' + ','.join(self._encode(item, conn, known) for item in value) + ']'
+        else:
+            return json.dumps(value)
+        if len(text) < self.threshold:
+            return text
+        digest = _hash(text)
+        if digest not in known:
+            known.add(digest)
+            self._store_object(conn, digest, text)
+        return f'{{"{REF}":"{digest}"}}'
+
+    def _store_object(self, conn, digest, text):
+        if conn.execute("SELECT 1 FROM objects WHERE hash = ?", (digest,)).fetchone() is None:
+            body = zlib.compress(text.encode('utf-8'), 6)
+            conn.execute("INSERT INTO objects (hash, body, size) VALUES (?, ?, ?)", (digest, body, len(body)))
+
+    def put(self, name, document):
+        """Store a document under a name, replacing what was there; returns its root hash"""
+        with self._connect() as conn:
+            text = self._encode(document, conn, set())
+            if text.startswith(f'{{"{REF}":'):
+                root = json.loads(text)[REF]
+            else:
+                # Small documents are stored whole as their own root
+                root = _hash(text)
+                self._store_object(conn, root, text)
+            logical_size = len(json.dumps(document, separators=(',', ':')))
+            conn.execute("INSERT OR REPLACE INTO snapshots (name, root, logical_size, created_at) "
+                         "VALUES (?, ?, ?, ?)", (name, root, logical_size, time.time()))
+        return root
+
+    def load(self, digest):
+        """The document or subtree stored under a hash"""
+        conn = self._connect()
+
+        def resolve(obj):
+            if len(obj) == 1 and REF in obj:
+                return load(obj[REF])
+            return obj
+
+        def load(digest):
+            row = conn.execute("SELECT body FROM objects WHERE hash = ?", (digest,)).fetchone()
+            if row is None:
+                raise KeyError(digest)
+            return json.loads(zlib.decompress(row[0]), object_hook=resolve)
+
+        return load(digest)
+
+    def get(self, name):
+        """The document stored under a name, or None"""
+        row = self._connect().execute("SELECT root FROM snapshots WHERE name = ?", (name,)).fetchone()
+        return self.load(row[0]) if row else None
+
+    def names(self, prefix=''):
+        """Stored snapshot names starting with prefix, in order"""
+        rows = self._connect().execute(
+            "SELECT name FROM snapshots WHERE substr(name, 1, ?) = ? ORDER BY name", (len(prefix), prefix))
+        return [row[0] for row in rows]
+
+    def stats(self):
+        """Snapshot and object counts, bytes as plain JSON against bytes stored, and their ratio"""
+        conn = self._connect()
+        snapshots, logical = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(logical_size), 0) FROM snapshots").fetchone()
+        objects, stored = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects").fetchone()
+        return {
+            'snapshots': snapshots,
+            'objects': objects,
+            'logicalBytes': logical,
+            'storedBytes': stored,
+            'dedupeRatio': round(logical / stored, 2) if stored else None,
+        }
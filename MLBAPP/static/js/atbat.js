@@ -6,7 +6,7 @@ class AtBat {
     constructor() {
         this.container = document.getElementById('at-bat');
         this.currentGamePk = null;
-        this.liveData = null;
+        this.view = null;
         this.updateInterval = null;
     }
     
@@ -14,6 +14,7 @@ class AtBat {
     async loadAtBatData(gamePk) {
         this.currentGamePk = gamePk;
         clearInterval(this.updateInterval);
+        this.view = null;
         
         try {
             // Show loading state
@@ -33,15 +34,20 @@ class AtBat {
     // Fetch and update at-bat data
     async fetchAndUpdateAtBatData() {
         try {
-            // Get live feed data
-            const gameData = await fetchAPI(`/api/game/${this.currentGamePk}/feed/live`);
+            // Get the server's compact at-bat view rather than the whole live feed
+            const view = await fetchAPI(`/api/game/${this.currentGamePk}/atbat`);
             
-            if (!gameData) {
+            if (!view) {
                 showError(this.container, 'Failed to load game data. Please try again later.');
                 return;
             }
             
-            this.liveData = gameData;
+            // Nothing changed since the last poll
+            if (this.view && this.view.version === view.version && view.version > 0) {
+                return;
+            }
+            
+            this.view = view;
             this.renderAtBatView();
         } catch (error) {
             console.error('Error updating at-bat data:', error);
@@ -57,13 +63,13 @@ class AtBat {
         }
         
         // Check if we have valid data first
-        if (!this.liveData || !this.liveData.gameData) {
+        if (!this.view || !this.view.status) {
             console.log('No valid game data available for live updates');
             return;
         }
         
         // Only set up polling for games that are actually live
-        const status = this.liveData.gameData.status?.abstractGameState;
+        const status = this.view.status;
         if (status === 'Live' || status === 'In Progress') {
             console.log('Setting up live updates for in-progress game');
             // Poll for updates every 10 seconds
@@ -77,28 +83,25 @@ class AtBat {
     
     // Render the at-bat view
     renderAtBatView() {
-        if (!this.liveData) {
+        if (!this.view) {
             this.container.innerHTML = '<div class="no-data">No game data available.</div>';
             return;
         }
         
-        const gameData = this.liveData.gameData;
-        const liveData = this.liveData.liveData;
-        
-        if (!gameData || !liveData) {
+        if (!this.view.status || !this.view.teams) {
             this.container.innerHTML = '<div class="no-data">Incomplete game data available. Please try another game.</div>';
             return;
         }
         
         try {
             // Render game info header
-            this.renderGameInfo(gameData, liveData);
+            this.renderGameInfo(this.view);
             
             // Render field and base runners
-            this.renderField(liveData);
+            this.renderField(this.view);
             
             // Render current at-bat information
-            this.renderCurrentAtBat(gameData, liveData);
+            this.renderCurrentAtBat(this.view);
         } catch (error) {
             console.error('Error rendering at-bat view:', error);
             this.container.innerHTML = '<div class="error">Error rendering at-bat view. The data format may not be as expected.</div>';
@@ -106,7 +109,7 @@ class AtBat {
     }
     
     // Render game info header
-    renderGameInfo(gameData, liveData) {
+    renderGameInfo(view) {
         // Create game info container if it doesn't exist
         let gameInfoContainer = this.container.querySelector('.game-info');
         if (!gameInfoContainer) {
@@ -115,29 +118,26 @@ class AtBat {
             this.container.appendChild(gameInfoContainer);
         }
         
-        // Safely get current play
-        const plays = liveData?.plays || {};
-        const currentPlay = plays.currentPlay || {};
         let gameStatus = '';
         
-        if (gameData?.status?.abstractGameState === 'Live' || gameData?.status?.abstractGameState === 'In Progress') {
+        if (view.status === 'Live' || view.status === 'In Progress') {
             // Game is in progress, show inning info
-            const inningState = currentPlay.about?.halfInning || 'top';
-            const inningNum = currentPlay.about?.inning || 1;
+            const inningState = view.inning?.half || 'top';
+            const inningNum = view.inning?.num || 1;
             gameStatus = formatInning(inningState, inningNum);
             
             // Add count information
-            const balls = currentPlay.count?.balls || 0;
-            const strikes = currentPlay.count?.strikes || 0;
-            const outs = currentPlay.count?.outs || 0;
+            const balls = view.count?.balls || 0;
+            const strikes = view.count?.strikes || 0;
+            const outs = view.count?.outs || 0;
             gameStatus += ` | ${balls}-${strikes} | ${outs} out${outs !== 1 ? 's' : ''}`;
-        } else if (gameData?.status?.abstractGameState === 'Final') {
+        } else if (view.status === 'Final') {
             // Game is over
             gameStatus = 'Final';
         } else {
             // Game hasn't started yet
             try {
-                gameStatus = `${formatTime(gameData?.datetime?.dateTime || new Date().toISOString())}`;
+                gameStatus = `${formatTime(view.dateTime || new Date().toISOString())}`;
             } catch (e) {
                 console.error('Error formatting game time:', e);
                 gameStatus = 'Scheduled';
@@ -145,19 +145,17 @@ class AtBat {
         }
         
         // Add score
-        const awayTeam = gameData?.teams?.away || { name: 'Away' };
-        const homeTeam = gameData?.teams?.home || { name: 'Home' };
-        const awayScore = liveData?.linescore?.teams?.away?.runs || 0;
-        const homeScore = liveData?.linescore?.teams?.home?.runs || 0;
+        const awayTeam = view.teams?.away || { name: 'Away' };
+        const homeTeam = view.teams?.home || { name: 'Home' };
         
         gameInfoContainer.innerHTML = `
             <h3>${gameStatus}</h3>
-            <div class="score">${awayTeam.name || 'Away'} ${awayScore}, ${homeTeam.name || 'Home'} ${homeScore}</div>
+            <div class="score">${awayTeam.name || 'Away'} ${awayTeam.runs || 0}, ${homeTeam.name || 'Home'} ${homeTeam.runs || 0}</div>
         `;
     }
     
     // Render field and base runners
-    renderField(liveData) {
+    renderField(view) {
         // Make sure the field elements exist first
         let fieldContainer = this.container.querySelector('.field');
         if (!fieldContainer) {
@@ -175,35 +173,7 @@ class AtBat {
             this.container.appendChild(fieldContainer);
         }
         
-        // Safely access play data
-        const plays = liveData?.plays || {};
-        const currentPlay = plays.currentPlay || {};
-        const offense = currentPlay.matchup?.batSide?.description || 'Right';
-        const bases = {
-            first: false,
-            second: false,
-            third: false
-        };
-        
-        // Set base occupancy if we have runner data
-        const runners = currentPlay.runners || [];
-        if (Array.isArray(runners)) {
-            runners.forEach(runner => {
-                if (runner && runner.movement && runner.movement.start) {
-                    switch (runner.movement.start) {
-                        case '1B':
-                            bases.first = true;
-                            break;
-                        case '2B':
-                            bases.second = true;
-                            break;
-                        case '3B':
-                            bases.third = true;
-                            break;
-                    }
-                }
-            });
-        }
+        const bases = view.bases || { first: false, second: false, third: false };
         
         // Update the bases on the field
         const firstBase = this.container.querySelector('.first-base');
@@ -216,13 +186,15 @@ class AtBat {
     }
     
     // Render current at-bat information
-    renderCurrentAtBat(gameData, liveData) {
+    renderCurrentAtBat(view) {
         // Make sure we have the at-bat container
         let atBatContainer = this.container.querySelector('.current-at-bat');
-        if (!atBatContainer) {
-            atBatContainer = document.createElement('div');
-            atBatContainer.className = 'current-at-bat';
-            this.container.appendChild(atBatContainer);
+        if (!atBatContainer || !atBatContainer.querySelector('.matchup')) {
+            if (!atBatContainer) {
+                atBatContainer = document.createElement('div');
+                atBatContainer.className = 'current-at-bat';
+                this.container.appendChild(atBatContainer);
+            }
             
             // Create the structure for player info
             atBatContainer.innerHTML = `
@@ -242,10 +214,7 @@ class AtBat {
             `;
         }
         
-        // Safely access play data
-        const plays = liveData?.plays || {};
-        const currentPlay = plays.currentPlay || {};
-        const matchup = currentPlay.matchup;
+        const matchup = view.matchup;
         
         if (!matchup || !matchup.batter || !matchup.pitcher) {
             atBatContainer.innerHTML = '<div class="no-at-bat">No current at-bat data available.</div>';
@@ -253,12 +222,10 @@ class AtBat {
         }
         
         // Get batter and pitcher info
-        const batter = matchup.batter || { id: 0, fullName: 'Unknown Batter' };
-        const pitcher = matchup.pitcher || { id: 0, fullName: 'Unknown Pitcher' };
-        const batterStats = liveData.boxscore?.teams?.away?.players?.[`ID${batter.id}`]?.seasonStats?.batting || 
-                            liveData.boxscore?.teams?.home?.players?.[`ID${batter.id}`]?.seasonStats?.batting || {};
-        const pitcherStats = liveData.boxscore?.teams?.away?.players?.[`ID${pitcher.id}`]?.seasonStats?.pitching || 
-                            liveData.boxscore?.teams?.home?.players?.[`ID${pitcher.id}`]?.seasonStats?.pitching || {};
+        const batter = matchup.batter;
+        const pitcher = matchup.pitcher;
+        const batterStats = batter.stats || {};
+        const pitcherStats = pitcher.stats || {};
         
         // Update batter info
         const batterContainer = this.container.querySelector('.batter');
@@ -281,9 +248,9 @@ class AtBat {
         }
         
         // Update count
-        const balls = currentPlay.count?.balls || 0;
-        const strikes = currentPlay.count?.strikes || 0;
-        const outs = currentPlay.count?.outs || 0;
+        const balls = view.count?.balls || 0;
+        const strikes = view.count?.strikes || 0;
+        const outs = view.count?.outs || 0;
         
         const ballsSpan = this.container.querySelector('.balls span');
         const strikesSpan = this.container.querySelector('.strikes span');
@@ -294,11 +261,11 @@ class AtBat {
         if (outsSpan) outsSpan.textContent = outs;
         
         // Render pitch zone
-        this.renderPitchZone(currentPlay);
+        this.renderPitchZone(view.pitches || []);
     }
     
     // Render pitch zone with pitch locations
-    renderPitchZone(currentPlay) {
+    renderPitchZone(pitches) {
         // Find or create pitch zone
         let pitchZone = this.container.querySelector('.pitch-zone');
         if (!pitchZone) {
@@ -327,47 +294,37 @@ class AtBat {
         const existingPitches = pitchZone.querySelectorAll('.pitch');
         existingPitches.forEach(pitch => pitch.remove());
         
-        // Safety check if no current play or events
-        if (!currentPlay || !currentPlay.playEvents) {
-            return;
-        }
-        
-        // Get pitches from current at-bat
-        const playEvents = currentPlay.playEvents || [];
-        const pitches = Array.isArray(playEvents) ? playEvents.filter(event => event && event.isPitch) : [];
-        
         // Plot each pitch
         pitches.forEach(pitch => {
             try {
-                if (pitch.pitchData && pitch.pitchData.coordinates) {
-                    const { x, y } = pitch.pitchData.coordinates;
-                    if (typeof x === 'number' && typeof y === 'number') {
-                        // Normalize coordinates for our visualization
-                        // Note: These calculations may need adjustment based on the actual data ranges
-                        const normalizedX = (x / 2) * 100 + 50; // Center x=0 at 50% of container width
-                        const normalizedY = (2 - y / 2) * 50; // Invert Y axis (higher y = lower on screen)
-                        
-                        // Determine pitch result class
-                        let pitchClass = '';
-                        if (pitch.details && pitch.details.description) {
-                            const desc = pitch.details.description.toLowerCase();
-                            if (desc.includes('ball')) pitchClass = 'ball';
-                            else if (desc.includes('strike')) pitchClass = 'strike';
-                            else if (desc.includes('play')) pitchClass = 'in-play';
-                        }
-                        
-                        // Create pitch element
-                        const pitchElem = document.createElement('div');
-                        pitchElem.className = `pitch ${pitchClass}`;
-                        pitchElem.style.left = `${normalizedX}%`;
-                        pitchElem.style.top = `${normalizedY}%`;
-                        pitchElem.title = pitch.details?.description || 'Pitch';
-                        
-                        // Add pitch number
-                        pitchElem.textContent = pitch.pitchNumber || '';
-                        
-                        pitchZone.appendChild(pitchElem);
+                const x = pitch.x;
+                const y = pitch.y;
+                if (typeof x === 'number' && typeof y === 'number') {
+                    // Normalize coordinates for our visualization
+                    // Note: These calculations may need adjustment based on the actual data ranges
+                    const normalizedX = (x / 2) * 100 + 50; // Center x=0 at 50% of container width
+                    const normalizedY = (2 - y / 2) * 50; // Invert Y axis (higher y = lower on screen)
+                    
+                    // Determine pitch result class
+                    let pitchClass = '';
+                    if (pitch.description) {
+                        const desc = pitch.description.toLowerCase();
+                        if (desc.includes('ball')) pitchClass = 'ball';
+                        else if (desc.includes('strike')) pitchClass = 'strike';
+                        else if (desc.includes('play')) pitchClass = 'in-play';
                     }
+                    
+                    // Create pitch element
+                    const pitchElem = document.createElement('div');
+                    pitchElem.className = `pitch ${pitchClass}`;
+                    pitchElem.style.left = `${normalizedX}%`;
+                    pitchElem.style.top = `${normalizedY}%`;
+                    pitchElem.title = pitch.description || 'Pitch';
+                    
+                    // Add pitch number
+                    pitchElem.textContent = pitch.pitchNumber || '';
+                    
+                    pitchZone.appendChild(pitchElem);
                 }
             } catch (error) {
                 console.error('Error rendering pitch:', error);
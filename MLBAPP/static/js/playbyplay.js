@@ -7,12 +7,18 @@ class PlayByPlay {
         this.container = document.getElementById('play-by-play');
         this.currentGamePk = null;
         this.updateInterval = null;
+        this.plays = [];
+        this.cursor = null;
+        this.gameData = null;
     }
     
     // Load play-by-play data for a game
     async loadPlayByPlay(gamePk) {
         this.currentGamePk = gamePk;
         clearInterval(this.updateInterval);
+        this.plays = [];
+        this.cursor = null;
+        this.gameData = null;
         
         try {
             // Show loading state
@@ -34,29 +40,63 @@ class PlayByPlay {
     // Fetch and update play-by-play data
     async fetchAndUpdatePlayByPlay() {
         try {
-            // Get play-by-play data
-            const playByPlayData = await fetchAPI(`/api/game/${this.currentGamePk}/playByPlay`);
+            // Only ask for the plays and pitches added since the last poll
+            const since = this.cursor || { since: 0, pitchSince: 0 };
+            const playByPlayData = await fetchAPI(
+                `/api/game/${this.currentGamePk}/playByPlay?since=${since.since}&pitchSince=${since.pitchSince}`
+            );
             
             if (!playByPlayData) {
-                const playsContainer = this.container.querySelector('.plays');
-                showError(playsContainer, 'Failed to load play-by-play data. Please try again later.');
+                if (this.plays.length === 0) {
+                    const playsContainer = this.container.querySelector('.plays');
+                    showError(playsContainer, 'Failed to load play-by-play data. Please try again later.');
+                }
                 return;
             }
             
-            // Get live feed data for additional context
-            const gameData = await fetchAPI(`/api/game/${this.currentGamePk}/feed/live`);
+            // Get live feed data for additional context (once; it is only used for team names and pitch fallbacks)
+            if (!this.gameData) {
+                this.gameData = await fetchAPI(`/api/game/${this.currentGamePk}/feed/live`);
+            }
+            
+            const changed = this.mergePlays(playByPlayData);
+            this.cursor = playByPlayData.cursor || this.cursor;
             
             // Render play-by-play
-            this.renderPlayByPlay(playByPlayData, gameData);
+            if (changed || this.plays.length === 0) {
+                this.renderPlayByPlay({ allPlays: this.plays }, this.gameData);
+            }
         } catch (error) {
             console.error('Error updating play-by-play data:', error);
         }
     }
     
+    // Merge an incremental response into the plays we already hold; returns whether anything changed
+    mergePlays(playByPlayData) {
+        const incoming = playByPlayData.allPlays || [];
+        let index = this.cursor ? this.cursor.since : 0;
+        incoming.forEach(play => {
+            if (play.pitchOffset && this.plays[index]) {
+                // A delta: only the pitch events after pitchOffset are included
+                const existing = this.plays[index];
+                const events = (existing.playEvents || []).slice(0, play.pitchOffset).concat(play.playEvents || []);
+                const merged = Object.assign({}, play, { playEvents: events });
+                delete merged.pitchOffset;
+                this.plays[index] = merged;
+            } else {
+                this.plays[index] = play;
+            }
+            index += 1;
+        });
+        this.plays.length = Math.max(index, Math.min(this.plays.length, playByPlayData.totalPlays || index));
+        return incoming.length > 0;
+    }
+    
     // Set up live updates for in-progress games
     setupLiveUpdates() {
-        // Get live feed data to check game status
-        fetchAPI(`/api/game/${this.currentGamePk}/feed/live`).then(gameData => {
+        // Check game status from the live feed we already loaded
+        const feed = this.gameData ? Promise.resolve(this.gameData) : fetchAPI(`/api/game/${this.currentGamePk}/feed/live`);
+        feed.then(gameData => {
             // Check if the game is in progress
             if (gameData && gameData.gameData && 
                 (gameData.gameData.status.abstractGameState === 'Live' || 
@@ -6,6 +6,10 @@ class Scoreboard {
     constructor() {
         this.container = document.getElementById('games-container');
         this.currentDate = new Date();
+        this.games = [];
+        this.version = 0;
+        this.epoch = '';
+        this.pollToken = 0;
     }
 
     // Initialize the scoreboard
@@ -62,22 +66,67 @@ class Scoreboard {
     async loadGamesForDate(date) {
         showLoading(this.container);
         
+        // Stop any long-poll still running for the previous date
+        const token = ++this.pollToken;
+        
         try {
-            const data = await fetchAPI(`/api/schedule?date=${date}`);
+            const data = await fetchAPI(`/api/scoreboard?date=${date}&sinceVersion=0`);
             
-            if (!data || !data.dates || data.dates.length === 0) {
+            if (!data || !data.games || data.games.length === 0) {
                 this.container.innerHTML = '<div class="no-games">No games scheduled for this date.</div>';
                 return;
             }
             
-            const games = data.dates[0].games;
-            this.renderGames(games);
+            this.games = data.games;
+            this.version = data.version;
+            this.epoch = data.epoch;
+            this.renderGames(this.games);
+            this.pollForChanges(date, token);
         } catch (error) {
             console.error('Error loading games:', error);
             showError(this.container, 'Failed to load games. Please try again later.');
         }
     }
     
+    // Long-poll for games that change, updating only their cards
+    async pollForChanges(date, token) {
+        while (token === this.pollToken) {
+            const data = await fetchAPI(`/api/scoreboard?date=${date}&sinceVersion=${this.version}&epoch=${this.epoch}&wait=25`);
+            if (token !== this.pollToken) return;
+            if (!data) {
+                // Back off before trying again after an error
+                await new Promise(resolve => setTimeout(resolve, 30000));
+                continue;
+            }
+            this.version = data.version;
+            this.epoch = data.epoch;
+            if (data.full) {
+                this.games = data.games;
+                this.renderGames(this.games);
+                continue;
+            }
+            data.games.forEach(game => this.updateGameCard(game));
+        }
+    }
+    
+    // Replace one game's card in place
+    updateGameCard(game) {
+        const index = this.games.findIndex(g => g.gamePk === game.gamePk);
+        if (index === -1) {
+            this.games.push(game);
+            this.renderGames(this.games);
+            return;
+        }
+        this.games[index] = game;
+        const card = this.container.querySelector(`.game-card[data-gamepk="${game.gamePk}"]`);
+        if (!card) return;
+        const wrapper = document.createElement('div');
+        wrapper.innerHTML = this.createGameCard(game).trim();
+        const newCard = wrapper.firstElementChild;
+        newCard.addEventListener('click', () => this.handleGameCardClick(newCard.dataset.gamepk));
+        card.replaceWith(newCard);
+    }
+    
     // Render the game cards
     renderGames(games) {
         if (!games || games.length === 0) {
@@ -0,0 +1,992 @@
+import copy
+import datetime
+import functools
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+
+COPYRIGHT = "Copyright 2025 MLB Advanced Media, L.P."
+
+# Synthetic players get ids well clear of real MLBAM person ids
+SYNTHETIC_PLAYER_ID_BASE = 900000
+
+# Synthetic seasons number their games from here
+SYNTHETIC_GAME_PK_BASE = 9000000
+
+# Games whose generated documents are kept, least recently used dropped first. The gamePk comes
+# from the request, so without a bound every one a client tries would stay in memory.
+MEMO_SIZE = 256
+
+# Default matchup used when a gamePk is not on any schedule we know about
+DEFAULT_AWAY_TEAM = {"id": 120, "name": "Washington Nationals", "link": "/api/v1/teams/120"}
+DEFAULT_HOME_TEAM = {"id": 147, "name": "New York Yankees", "link": "/api/v1/teams/147"}
+DEFAULT_VENUE = {"id": 3313, "name": "Yankee Stadium", "link": "/api/v1/venues/3313"}
+
+# Batting order positions: (code, abbreviation, name, type)
+LINEUP_POSITIONS = [
+    ("8", "CF", "Outfielder", "Outfielder"),
+    ("6", "SS", "Shortstop", "Infielder"),
+    ("3", "1B", "First Base", "Infielder"),
+    ("10", "DH", "Designated Hitter", "Hitter"),
+    ("5", "3B", "Third Base", "Infielder"),
+    ("9", "RF", "Outfielder", "Outfielder"),
+    ("7", "LF", "Outfielder", "Outfielder"),
+    ("2", "C", "Catcher", "Catcher"),
+    ("4", "2B", "Second Base", "Infielder"),
+]
+PITCHER_POSITION = ("1", "P", "Pitcher", "Pitcher")
+
+# Starter plus relievers; the starter goes six innings, then one reliever per inning
+PITCHING_STAFF_SIZE = 5
+STARTER_INNINGS = 6
+
+# Plate appearance outcomes: (eventType, event, weight, bases the batter takes, is out)
+OUTCOMES = (
+    ("strikeout", "Strikeout", 22, 0, True),
+    ("field_out", "Groundout", 24, 0, True),
+    ("field_out", "Flyout", 21, 0, True),
+    ("walk", "Walk", 8, 1, False),
+    ("single", "Single", 15, 1, False),
+    ("double", "Double", 5, 2, False),
+    ("triple", "Triple", 0.5, 3, False),
+    ("home_run", "Home Run", 3, 4, False),
+)
+
+# Pitch types: code -> (description, mean speed, horizontal break, induced vertical break)
+PITCH_TYPES = {
+    "FF": ("Four-Seam Fastball", 94.5, -7.0, 16.0),
+    "SI": ("Sinker", 93.5, -15.0, 8.0),
+    "FC": ("Cutter", 89.0, 3.0, 9.0),
+    "SL": ("Slider", 85.5, 6.0, 2.0),
+    "CH": ("Changeup", 86.0, -13.0, 6.0),
+    "CU": ("Curveball", 79.5, 9.0, -10.0),
+}
+
+FIELDERS = ["pitcher", "catcher", "first baseman", "second baseman", "third baseman",
+            "shortstop", "left fielder", "center fielder", "right fielder"]
+FIELDS = ["left field", "center field", "right field"]
+
+BASE_LABELS = {0: None, 1: "1B", 2: "2B", 3: "3B", 4: "score"}
+
+# Strike zone edges in feet, as reported in pitchData
+ZONE_HALF_WIDTH = 0.83
+ZONE_BOTTOM = 1.6
+ZONE_TOP = 3.4
+
+
+def stable_seed(*parts):
+    """Seed derived from parts that is identical across processes and runs"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def team_abbreviation(name):
+    """Abbreviation built from a team name's initials"""
+    return "".join(word[0] for word in name.split())[:3].upper()
+
+
+def player_id(team_id, slot):
+    """Synthetic person id for a slot on a team's roster"""
+    return SYNTHETIC_PLAYER_ID_BASE + int(team_id) * 100 + slot
+
+
+def _rate(numerator, denominator):
+    if not denominator:
+        return ".---"
+    value = f"{numerator / denominator:.3f}"
+    return value[1:] if value.startswith("0") else value
+
+
+def _innings_pitched(outs):
+    return f"{outs // 3}.{outs % 3}"
+
+
+def _era(earned_runs, outs):
+    if not outs:
+        return "-.--"
+    return f"{earned_runs * 27 / outs:.2f}"
+
+
+def _ordinal(n):
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+@functools.lru_cache(maxsize=4096)
+def season_stats(person_id, is_pitcher):
+    """Deterministic season stat lines for a synthetic player"""
+    rng = random.Random(stable_seed("season", person_id))
+    if is_pitcher:
+        innings = rng.randint(40, 180)
+        return {
+            "pitching": {
+                "gamesPlayed": rng.randint(10, 32),
+                "wins": rng.randint(1, 15),
+                "losses": rng.randint(1, 12),
+                "era": f"{rng.uniform(2.4, 5.6):.2f}",
+                "whip": f"{rng.uniform(0.95, 1.55):.2f}",
+                "inningsPitched": f"{innings}.{rng.randint(0, 2)}",
+                "strikeOuts": int(innings * rng.uniform(0.7, 1.25)),
+                "baseOnBalls": int(innings * rng.uniform(0.25, 0.45)),
+            },
+            "batting": {},
+        }
+    at_bats = rng.randint(250, 560)
+    hits = int(at_bats * rng.uniform(0.215, 0.315))
+    return {
+        "batting": {
+            "gamesPlayed": rng.randint(80, 140),
+            "atBats": at_bats,
+            "hits": hits,
+            "avg": _rate(hits, at_bats),
+            "homeRuns": rng.randint(2, 40),
+            "rbi": rng.randint(20, 110),
+            "obp": _rate(int(hits * 1.3), at_bats),
+            "slg": _rate(int(hits * 1.6), at_bats),
+        },
+        "pitching": {},
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def pitcher_profile(person_id):
+    """Arsenal for a synthetic pitcher: [(pitch code, usage weight, speed offset)]"""
+    rng = random.Random(stable_seed("arsenal", person_id))
+    codes = ["FF"] + rng.sample(["SI", "FC", "SL", "CH", "CU"], rng.randint(2, 3))
+    speed_offset = rng.uniform(-2.5, 2.5)
+    return tuple((code, rng.uniform(0.5, 1.5) * (2.0 if code == "FF" else 1.0), speed_offset) for code in codes)
+
+
+def default_schedule_game(game_pk):
+    """Schedule entry for a gamePk we have no schedule data for"""
+    rng = random.Random(stable_seed("default", game_pk))
+    away_score, home_score = _final_score(rng)
+    return {
+        "gamePk": int(game_pk),
+        "gameType": "R",
+        "season": "2025",
+        "gameDate": "2025-08-27T17:05:00Z",
+        "officialDate": "2025-08-27",
+        "status": {"abstractGameState": "Final", "codedGameState": "F",
+                   "detailedState": "Final", "statusCode": "F"},
+        "teams": {
+            "away": {"score": away_score, "team": dict(DEFAULT_AWAY_TEAM), "isWinner": away_score > home_score},
+            "home": {"score": home_score, "team": dict(DEFAULT_HOME_TEAM), "isWinner": home_score > away_score},
+        },
+        "venue": dict(DEFAULT_VENUE),
+    }
+
+
+def _final_score(rng):
+    """Realistic final score with no tie"""
+    weights = [0.72, 0.15, 0.07, 0.04, 0.02]
+    away = sum(rng.choices(range(5), weights)[0] for _ in range(9))
+    home = sum(rng.choices(range(5), weights)[0] for _ in range(9))
+    if away == home:
+        home += 1
+    return away, home
+
+
+def _spread_runs(rng, total, halves):
+    """Distribute total runs over a number of half innings"""
+    runs = [0] * halves
+    for _ in range(total if halves else 0):
+        runs[rng.randrange(halves)] += 1
+    return runs
+
+
+class _Team:
+    """Roster and running stat lines for one side of a synthetic game"""
+
+    def __init__(self, side, team):
+        self.side = side
+        self.team = team
+        self.team_id = int(team.get("id") or 0)
+        name = team.get("name") or side.title()
+        self.name = name
+        self.lineup = [
+            {"id": player_id(self.team_id, slot + 1), "fullName": f"{name} {position[1]}", "position": position}
+            for slot, position in enumerate(LINEUP_POSITIONS)
+        ]
+        self.staff = [
+            {"id": player_id(self.team_id, 20 + slot),
+             "fullName": f"{name} {'Starter' if slot == 0 else f'Reliever {slot}'}",
+             "position": PITCHER_POSITION}
+            for slot in range(PITCHING_STAFF_SIZE)
+        ]
+        self.next_batter = 0
+        self.batting = {p["id"]: dict.fromkeys(
+            ("plateAppearances", "atBats", "runs", "hits", "doubles", "triples", "homeRuns", "rbi",
+             "baseOnBalls", "strikeOuts", "totalBases", "leftOnBase", "flyOuts", "groundOuts"), 0)
+            for p in self.lineup}
+        self.pitching = {}
+        self.hits_by_inning = {}
+        self.lob_by_inning = {}
+        self.errors = 0
+
+    def pitcher_for(self, inning):
+        index = 0 if inning <= STARTER_INNINGS else min(inning - STARTER_INNINGS, PITCHING_STAFF_SIZE - 1)
+        pitcher = self.staff[index]
+        if pitcher["id"] not in self.pitching:
+            self.pitching[pitcher["id"]] = dict.fromkeys(
+                ("battersFaced", "outs", "hits", "runs", "earnedRuns", "baseOnBalls", "strikeOuts",
+                 "homeRuns", "numberOfPitches", "strikes", "balls"), 0)
+        return pitcher
+
+    def take_batter(self):
+        batter = self.lineup[self.next_batter % len(self.lineup)]
+        self.next_batter += 1
+        return batter
+
+
+class SyntheticGameEngine:
+    """Builds consistent, deterministic game documents from a schedule entry, memoized per gamePk
+
+    The memo holds the max_games most recently used games; others are built again when asked for.
+    """
+
+    def __init__(self, max_games=MEMO_SIZE):
+        self.max_games = max_games
+        self._lock = threading.Lock()
+        self._memo = OrderedDict()
+
+    def documents(self, game_pk, schedule_game=None):
+        """boxscore/linescore/playByPlay/feed documents for a game; treat them as read-only"""
+        if schedule_game is None:
+            schedule_game = default_schedule_game(game_pk)
+        fingerprint = self._fingerprint(schedule_game)
+        with self._lock:
+            entry = self._memo.get(int(game_pk))
+            if entry is not None:
+                self._memo.move_to_end(int(game_pk))
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        documents = build_game(schedule_game, game_pk=game_pk)
+        with self._lock:
+            self._memo[int(game_pk)] = (fingerprint, documents)
+            self._memo.move_to_end(int(game_pk))
+            while len(self._memo) > self.max_games:
+                self._memo.popitem(last=False)
+        return documents
+
+    def boxscore(self, game_pk, schedule_game=None):
+        return self.documents(game_pk, schedule_game)["boxscore"]
+
+    def linescore(self, game_pk, schedule_game=None):
+        return self.documents(game_pk, schedule_game)["linescore"]
+
+    def play_by_play(self, game_pk, schedule_game=None):
+        return self.documents(game_pk, schedule_game)["playByPlay"]
+
+    def feed_live(self, game_pk, schedule_game=None):
+        return self.documents(game_pk, schedule_game)["feed"]
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memo)
+
+    @staticmethod
+    def _fingerprint(schedule_game):
+        teams = schedule_game.get("teams", {})
+        return (
+            schedule_game.get("status", {}).get("abstractGameState"),
+            teams.get("away", {}).get("score"),
+            teams.get("home", {}).get("score"),
+            teams.get("away", {}).get("team", {}).get("id"),
+            teams.get("home", {}).get("team", {}).get("id"),
+            (schedule_game.get("linescore") or {}).get("currentInning"),
+        )
+
+
+def build_game(schedule_game, game_pk=None):
+    """Simulate a game that matches a schedule entry and return all of its documents"""
+    game_pk = int(game_pk if game_pk is not None else schedule_game["gamePk"])
+    rng = random.Random(stable_seed("game", game_pk))
+    state = schedule_game.get("status", {}).get("abstractGameState", "Final")
+    teams = {side: _Team(side, schedule_game.get("teams", {}).get(side, {}).get("team", {}))
+             for side in ("away", "home")}
+    away_score = schedule_game.get("teams", {}).get("away", {}).get("score") or 0
+    home_score = schedule_game.get("teams", {}).get("home", {}).get("score") or 0
+
+    # Work out which half innings were played and how many outs each recorded
+    halves = []
+    if state == "Final":
+        for inning in range(1, 10):
+            halves.append((inning, "top", 3))
+            if inning < 9 or home_score <= away_score:
+                halves.append((inning, "bottom", 3))
+    elif state == "Live":
+        current = (schedule_game.get("linescore") or {}).get("currentInning") or rng.randint(2, 8)
+        if home_score:
+            # The home side needs at least one completed bottom half to have scored
+            current = max(current, 2)
+        for inning in range(1, current):
+            halves.append((inning, "top", 3))
+            halves.append((inning, "bottom", 3))
+        halves.append((current, "top", rng.randint(0, 2)))
+
+    # Home runs never land in a bottom of the ninth the home side didn't need to bat in
+    away_halves = [h for h in halves if h[1] == "top"]
+    home_halves = [h for h in halves if h[1] == "bottom"]
+    runs_for = {}
+    for side_halves, total in ((away_halves, away_score), (home_halves, home_score)):
+        for half, runs in zip(side_halves, _spread_runs(rng, total, len(side_halves))):
+            runs_for[half] = runs
+
+    start = _game_start(schedule_game)
+    clock = [start]
+    plays = []
+    score = {"away": 0, "home": 0}
+    for half in halves:
+        inning, half_inning, outs_to_record = half
+        batting = teams["away" if half_inning == "top" else "home"]
+        fielding = teams["home" if half_inning == "top" else "away"]
+        _play_half_inning(rng, plays, clock, score, inning, half_inning, batting, fielding,
+                          runs_for.get(half, 0), outs_to_record)
+
+    current_play = None
+    if state == "Live" and halves:
+        inning, half_inning, _ = halves[-1]
+        current_play = _in_progress_play(rng, plays, clock, score, inning, half_inning,
+                                         teams["away"], teams["home"])
+
+    for team in teams.values():
+        team.errors = rng.choices([0, 1, 2], weights=[0.7, 0.25, 0.05])[0]
+
+    linescore = _linescore(halves, plays, teams, state, current_play)
+    boxscore = _boxscore(teams)
+    play_by_play = _play_by_play(plays, current_play)
+    feed = _feed(schedule_game, game_pk, state, teams, linescore, boxscore, play_by_play, clock[0])
+    return {"boxscore": boxscore, "linescore": linescore, "playByPlay": play_by_play, "feed": feed}
+
+
+def _game_start(schedule_game):
+    try:
+        return datetime.datetime.strptime(schedule_game.get("gameDate", ""), "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return datetime.datetime(2025, 8, 27, 17, 5)
+
+
+def _runs_scored(outcome, bases):
+    event_type, _, _, advance, is_out = outcome
+    if is_out:
+        return 0
+    if event_type == "walk":
+        return 1 if all(bases) else 0
+    return sum(1 for base, runner in enumerate(bases, start=1) if runner and base + advance >= 4) + (advance == 4)
+
+
+def _choose_outcome(rng, bases, outs, runs_needed, outs_to_record):
+    options = []
+    weights = []
+    for outcome in OUTCOMES:
+        if outcome[4]:
+            # Never record the last out while this half inning still owes runs
+            if outs + 1 >= outs_to_record and runs_needed > 0:
+                continue
+        elif _runs_scored(outcome, bases) > runs_needed:
+            continue
+        options.append(outcome)
+        weights.append(outcome[2])
+    return rng.choices(options, weights)[0]
+
+
+def _pitch_sequence(rng, event_type):
+    """Pitch results ending in the plate appearance's outcome"""
+    if event_type == "strikeout":
+        balls, strikes, final = rng.randint(0, 3), 2, "strike"
+    elif event_type == "walk":
+        balls, strikes, final = 3, rng.randint(0, 2), "ball"
+    else:
+        balls, strikes, final = rng.randint(0, 3), rng.randint(0, 2), "in_play"
+    sequence = ["ball"] * balls + ["strike"] * strikes
+    rng.shuffle(sequence)
+    if strikes == 2:
+        sequence += ["foul"] * rng.choice([0, 0, 1, 2])
+    return sequence + [final]
+
+
+def _pitch_event(rng, pitcher_id, result, index, pitch_number, count, moment, in_play_description=None):
+    arsenal = pitcher_profile(pitcher_id)
+    code, _, speed_offset = rng.choices(arsenal, weights=[entry[1] for entry in arsenal])[0]
+    description, speed, horizontal, vertical = PITCH_TYPES[code]
+
+    if result == "ball":
+        # Somewhere just outside the zone
+        side = rng.choice(["in", "out", "high", "low"])
+        px = rng.uniform(-1.6, 1.6)
+        pz = rng.uniform(1.2, 3.8)
+        if side == "in":
+            px = rng.uniform(-1.8, -ZONE_HALF_WIDTH - 0.05)
+        elif side == "out":
+            px = rng.uniform(ZONE_HALF_WIDTH + 0.05, 1.8)
+        elif side == "high":
+            pz = rng.uniform(ZONE_TOP + 0.05, 4.4)
+        else:
+            pz = rng.uniform(0.5, ZONE_BOTTOM - 0.05)
+    else:
+        px = rng.uniform(-ZONE_HALF_WIDTH, ZONE_HALF_WIDTH)
+        pz = rng.uniform(ZONE_BOTTOM, ZONE_TOP)
+
+    if abs(px) <= ZONE_HALF_WIDTH and ZONE_BOTTOM <= pz <= ZONE_TOP:
+        column = min(int((px + ZONE_HALF_WIDTH) / (2 * ZONE_HALF_WIDTH / 3)), 2)
+        row = min(int((ZONE_TOP - pz) / ((ZONE_TOP - ZONE_BOTTOM) / 3)), 2)
+        zone = row * 3 + column + 1
+    else:
+        zone = (11 if px < 0 else 12) if pz >= (ZONE_TOP + ZONE_BOTTOM) / 2 else (13 if px < 0 else 14)
+
+    if result == "ball":
+        call = ("B", "Ball")
+    elif result == "strike":
+        call = rng.choice([("C", "Called Strike"), ("S", "Swinging Strike")])
+    elif result == "foul":
+        call = ("F", "Foul")
+    else:
+        call = ("X", in_play_description or "In play, out(s)")
+
+    start_speed = round(speed + speed_offset + rng.gauss(0, 0.8), 1)
+    return {
+        "details": {
+            "call": {"code": call[0], "description": call[1]},
+            "description": call[1],
+            "code": call[0],
+            "isInPlay": result == "in_play",
+            "isStrike": result in ("strike", "foul"),
+            "isBall": result == "ball",
+            "type": {"code": code, "description": description},
+            "isOut": False,
+            "hasReview": False,
+        },
+        "count": dict(count),
+        "pitchData": {
+            "startSpeed": start_speed,
+            "endSpeed": round(start_speed * 0.915, 1),
+            "strikeZoneTop": ZONE_TOP,
+            "strikeZoneBottom": ZONE_BOTTOM,
+            "coordinates": {
+                "pX": round(px, 3),
+                "pZ": round(pz, 3),
+                "x": round(117.44 - px * 37.6, 2),
+                "y": round(230.0 - pz * 25.15, 2),
+            },
+            "breaks": {
+                "breakHorizontal": round(horizontal + rng.gauss(0, 1.5), 1),
+                "breakVerticalInduced": round(vertical + rng.gauss(0, 1.5), 1),
+                "spinRate": int(rng.gauss(2300 if code != "CH" else 1750, 120)),
+            },
+            "zone": zone,
+        },
+        "index": index,
+        "pitchNumber": pitch_number,
+        "startTime": _iso(moment),
+        "endTime": _iso(moment + datetime.timedelta(seconds=8)),
+        "isPitch": True,
+        "type": "pitch",
+    }
+
+
+def _person(player):
+    return {"id": player["id"], "fullName": player["fullName"], "link": f"/api/v1/people/{player['id']}"}
+
+
+def _describe(rng, outcome, batter, scorers):
+    event_type, event, _, _, _ = outcome
+    name = batter["fullName"]
+    if event_type == "strikeout":
+        text = f"{name} strikes out swinging."
+    elif event == "Groundout":
+        text = f"{name} grounds out to {rng.choice(FIELDERS[2:6])}."
+    elif event == "Flyout":
+        text = f"{name} flies out to {rng.choice(FIELDERS[6:])}."
+    elif event_type == "walk":
+        text = f"{name} walks."
+    elif event_type == "home_run":
+        text = f"{name} homers on a fly ball to {rng.choice(FIELDS)}."
+    else:
+        verb = {"single": "singles", "double": "doubles", "triple": "triples"}[event_type]
+        text = f"{name} {verb} on a line drive to {rng.choice(FIELDS)}."
+    for runner in scorers:
+        if runner["id"] != batter["id"]:
+            text += f" {runner['fullName']} scores."
+    return text
+
+
+def _play_half_inning(rng, plays, clock, score, inning, half_inning, batting, fielding, target_runs, outs_to_record):
+    bases = [None, None, None]
+    outs = 0
+    runs = 0
+    pitcher = fielding.pitcher_for(inning)
+    pitching = fielding.pitching[pitcher["id"]]
+    hits = 0
+    while outs < outs_to_record or runs < target_runs:
+        outcome = _choose_outcome(rng, bases, outs, target_runs - runs, outs_to_record)
+        event_type, event, _, advance, is_out = outcome
+        batter = batting.take_batter()
+        line = batting.batting[batter["id"]]
+
+        # Move runners
+        runners = []
+        scorers = []
+        new_bases = [None, None, None]
+        if is_out:
+            new_bases = list(bases)
+            runners.append(((batter, 0, None), True))
+        elif event_type == "walk":
+            carry = (batter, 0)
+            new_bases = list(bases)
+            for i in range(3):
+                if new_bases[i] is None:
+                    new_bases[i] = carry[0]
+                    runners.append(((carry[0], carry[1], i + 1), False))
+                    carry = None
+                    break
+                displaced = (new_bases[i], i + 1)
+                new_bases[i] = carry[0]
+                runners.append(((carry[0], carry[1], i + 1), False))
+                carry = displaced
+            if carry is not None:
+                runners.append(((carry[0], carry[1], 4), False))
+                scorers.append(carry[0])
+        else:
+            for base in (3, 2, 1):
+                runner = bases[base - 1]
+                if runner:
+                    end = min(base + advance, 4)
+                    runners.append(((runner, base, end), False))
+                    if end == 4:
+                        scorers.append(runner)
+                    else:
+                        new_bases[end - 1] = runner
+            runners.append(((batter, 0, advance), False))
+            if advance == 4:
+                scorers.append(batter)
+            else:
+                new_bases[advance - 1] = batter
+        bases = new_bases
+
+        # Pitches
+        start_time = clock[0]
+        pitch_events = []
+        balls = strikes = 0
+        in_play_description = "In play, run(s)" if scorers else ("In play, out(s)" if is_out else "In play, no out")
+        for number, result in enumerate(_pitch_sequence(rng, event_type), start=1):
+            if result == "ball":
+                balls += 1
+            elif result == "strike" or (result == "foul" and strikes < 2):
+                strikes += 1
+            count = {"balls": min(balls, 3), "strikes": min(strikes, 2), "outs": outs}
+            pitch_events.append(_pitch_event(rng, pitcher["id"], result, number - 1, number, count,
+                                             clock[0], in_play_description))
+            pitching["numberOfPitches"] += 1
+            pitching["balls" if result == "ball" else "strikes"] += 1
+            clock[0] += datetime.timedelta(seconds=rng.randint(18, 30))
+
+        if is_out:
+            outs += 1
+        runs += len(scorers)
+        score[batting.side] += len(scorers)
+
+        # Stat lines
+        is_hit = event_type in ("single", "double", "triple", "home_run")
+        line["plateAppearances"] += 1
+        line["atBats"] += event_type != "walk"
+        line["hits"] += is_hit
+        line["totalBases"] += advance if is_hit else 0
+        line["doubles"] += event_type == "double"
+        line["triples"] += event_type == "triple"
+        line["homeRuns"] += event_type == "home_run"
+        line["rbi"] += len(scorers)
+        line["baseOnBalls"] += event_type == "walk"
+        line["strikeOuts"] += event_type == "strikeout"
+        line["groundOuts"] += event == "Groundout"
+        line["flyOuts"] += event == "Flyout"
+        if is_out:
+            line["leftOnBase"] += sum(1 for runner in bases if runner)
+        for runner in scorers:
+            batting.batting[runner["id"]]["runs"] += 1
+        pitching["battersFaced"] += 1
+        pitching["outs"] += is_out
+        pitching["hits"] += is_hit
+        pitching["runs"] += len(scorers)
+        pitching["earnedRuns"] += len(scorers)
+        pitching["baseOnBalls"] += event_type == "walk"
+        pitching["strikeOuts"] += event_type == "strikeout"
+        pitching["homeRuns"] += event_type == "home_run"
+        hits += is_hit
+
+        description = _describe(rng, outcome, batter, scorers)
+        at_bat_index = len(plays)
+        end_time = clock[0]
+        clock[0] += datetime.timedelta(seconds=rng.randint(20, 60))
+        matchup = {
+            "batter": _person(batter),
+            "batSide": {"code": "R", "description": "Right"},
+            "pitcher": _person(pitcher),
+            "pitchHand": {"code": "R", "description": "Right"},
+        }
+        for base, runner in zip(("postOnFirst", "postOnSecond", "postOnThird"), bases):
+            if runner:
+                matchup[base] = _person(runner)
+        plays.append({
+            "result": {
+                "type": "atBat",
+                "event": event,
+                "eventType": event_type,
+                "description": description,
+                "rbi": len(scorers),
+                "awayScore": score["away"],
+                "homeScore": score["home"],
+                "isOut": is_out,
+            },
+            "about": {
+                "atBatIndex": at_bat_index,
+                "halfInning": half_inning,
+                "isTopInning": half_inning == "top",
+                "inning": inning,
+                "startTime": _iso(start_time),
+                "endTime": _iso(end_time),
+                "isComplete": True,
+                "isScoringPlay": bool(scorers),
+                "hasOut": is_out,
+            },
+            "count": {"balls": min(balls, 3), "strikes": min(strikes, 2), "outs": outs},
+            "matchup": matchup,
+            "pitchIndex": list(range(len(pitch_events))),
+            "actionIndex": [],
+            "runnerIndex": list(range(len(runners))),
+            "runners": [
+                {
+                    "movement": {
+                        "originBase": BASE_LABELS[start],
+                        "start": BASE_LABELS[start],
+                        "end": None if out else BASE_LABELS[end],
+                        "outBase": BASE_LABELS[1] if out else None,
+                        "isOut": out,
+                        "outNumber": outs if out else None,
+                    },
+                    "details": {
+                        "event": event,
+                        "eventType": event_type,
+                        "runner": _person(runner),
+                        "isScoringEvent": end == 4,
+                        "rbi": end == 4,
+                        "earned": end == 4,
+                    },
+                }
+                for (runner, start, end), out in runners
+            ],
+            "playEvents": pitch_events,
+            "playEndTime": _iso(end_time),
+            "atBatIndex": at_bat_index,
+        })
+
+    batting.hits_by_inning[inning] = hits
+    batting.lob_by_inning[inning] = sum(1 for runner in bases if runner)
+
+
+def _in_progress_play(rng, plays, clock, score, inning, half_inning, away, home):
+    """Plate appearance currently under way in a live game"""
+    batting, fielding = (away, home) if half_inning == "top" else (home, away)
+    batter = batting.lineup[batting.next_batter % len(batting.lineup)]
+    pitcher = fielding.pitcher_for(inning)
+    outs = sum(1 for play in plays
+               if play["about"]["inning"] == inning and play["about"]["halfInning"] == half_inning
+               and play["result"]["isOut"])
+    sequence = rng.choice([["ball"], ["strike"], ["ball", "strike"], ["strike", "foul", "ball"]])
+    pitch_events = []
+    balls = strikes = 0
+    for number, result in enumerate(sequence, start=1):
+        balls += result == "ball"
+        strikes += result == "strike" or (result == "foul" and strikes < 2)
+        count = {"balls": balls, "strikes": strikes, "outs": outs}
+        pitch_events.append(_pitch_event(rng, pitcher["id"], result, number - 1, number, count, clock[0]))
+        clock[0] += datetime.timedelta(seconds=rng.randint(18, 30))
+    return {
+        "result": {"type": "atBat", "awayScore": score["away"], "homeScore": score["home"], "isOut": False},
+        "about": {
+            "atBatIndex": len(plays),
+            "halfInning": half_inning,
+            "isTopInning": half_inning == "top",
+            "inning": inning,
+            "startTime": pitch_events[0]["startTime"],
+            "isComplete": False,
+            "isScoringPlay": False,
+            "hasOut": False,
+        },
+        "count": {"balls": balls, "strikes": strikes, "outs": outs},
+        "matchup": {
+            "batter": _person(batter),
+            "batSide": {"code": "R", "description": "Right"},
+            "pitcher": _person(pitcher),
+            "pitchHand": {"code": "R", "description": "Right"},
+        },
+        "pitchIndex": list(range(len(pitch_events))),
+        "actionIndex": [],
+        "runnerIndex": [],
+        "runners": [],
+        "playEvents": pitch_events,
+        "atBatIndex": len(plays),
+    }
+
+
+def _linescore(halves, plays, teams, state, current_play):
+    runs = {}
+    for play in plays:
+        key = (play["about"]["inning"], play["about"]["halfInning"])
+        runs[key] = runs.get(key, 0) + play["result"]["rbi"]
+    innings = []
+    for inning in sorted({half[0] for half in halves}):
+        entry = {"num": inning, "ordinalNum": _ordinal(inning)}
+        for side, half_inning in (("away", "top"), ("home", "bottom")):
+            team = teams[side]
+            line = {"hits": team.hits_by_inning.get(inning, 0), "errors": 0,
+                    "leftOnBase": team.lob_by_inning.get(inning, 0)}
+            if any(half[0] == inning and half[1] == half_inning for half in halves):
+                line["runs"] = runs.get((inning, half_inning), 0)
+            entry[side] = line
+        innings.append(entry)
+
+    totals = {}
+    for side, team in teams.items():
+        totals[side] = {
+            "runs": sum(inning[side].get("runs", 0) for inning in innings),
+            "hits": sum(team.hits_by_inning.values()),
+            "errors": team.errors,
+            "leftOnBase": sum(team.lob_by_inning.values()),
+        }
+
+    last = current_play or (plays[-1] if plays else None)
+    linescore = {
+        "copyright": COPYRIGHT,
+        "scheduledInnings": 9,
+        "innings": innings,
+        "teams": totals,
+        "defense": {},
+        "offense": {},
+    }
+    if last:
+        inning = last["about"]["inning"]
+        linescore.update({
+            "currentInning": inning,
+            "currentInningOrdinal": _ordinal(inning),
+            "inningState": ("Top" if last["about"]["isTopInning"] else "Bottom") if state == "Live" else "End",
+            "inningHalf": "Top" if last["about"]["isTopInning"] else "Bottom",
+            "isTopInning": last["about"]["isTopInning"],
+            "balls": last["count"]["balls"] if current_play else 0,
+            "strikes": last["count"]["strikes"] if current_play else 0,
+            "outs": last["count"]["outs"] if current_play else 3,
+        })
+    return linescore
+
+
+def _player_entry(team, player, order, batting=None, pitching=None):
+    code, abbreviation, name, position_type = player["position"]
+    is_pitcher = abbreviation == "P"
+    stats = {"batting": {}, "pitching": {}, "fielding": {}}
+    season = season_stats(player["id"], is_pitcher)
+    if batting is not None:
+        stats["batting"] = dict(batting, gamesPlayed=1, summary=f"{batting['hits']}-{batting['atBats']}",
+                                avg=season["batting"].get("avg", ".000"))
+    if pitching is not None:
+        stats["pitching"] = {
+            "gamesPlayed": 1,
+            "inningsPitched": _innings_pitched(pitching["outs"]),
+            "hits": pitching["hits"],
+            "runs": pitching["runs"],
+            "earnedRuns": pitching["earnedRuns"],
+            "baseOnBalls": pitching["baseOnBalls"],
+            "strikeOuts": pitching["strikeOuts"],
+            "homeRuns": pitching["homeRuns"],
+            "battersFaced": pitching["battersFaced"],
+            "outs": pitching["outs"],
+            "numberOfPitches": pitching["numberOfPitches"],
+            "pitchesThrown": pitching["numberOfPitches"],
+            "balls": pitching["balls"],
+            "strikes": pitching["strikes"],
+            "era": season["pitching"].get("era", _era(pitching["earnedRuns"], pitching["outs"])),
+        }
+    entry = {
+        "person": dict(_person(player), boxscoreName=player["fullName"].split()[-1]),
+        "jerseyNumber": str(player["id"] % 100),
+        "position": {"code": code, "name": name, "type": position_type, "abbreviation": abbreviation},
+        "status": {"code": "A", "description": "Active"},
+        "parentTeamId": team.team_id,
+        "stats": stats,
+        "seasonStats": season,
+        "gameStatus": {"isCurrentBatter": False, "isCurrentPitcher": False, "isOnBench": False,
+                       "isSubstitute": False},
+        "allPositions": [{"code": code, "name": name, "type": position_type, "abbreviation": abbreviation}],
+    }
+    if order is not None:
+        entry["battingOrder"] = str((order + 1) * 100)
+    return entry
+
+
+def _team_stats(team):
+    batting = {key: sum(line[key] for line in team.batting.values())
+               for key in next(iter(team.batting.values()))}
+    batting["avg"] = _rate(batting["hits"], batting["atBats"])
+    batting["obp"] = _rate(batting["hits"] + batting["baseOnBalls"], batting["plateAppearances"])
+    batting["slg"] = _rate(batting["totalBases"], batting["atBats"])
+    batting["leftOnBase"] = sum(team.lob_by_inning.values())
+    pitching = {key: sum(line[key] for line in team.pitching.values())
+                for key in ("battersFaced", "outs", "hits", "runs", "earnedRuns", "baseOnBalls",
+                            "strikeOuts", "homeRuns", "numberOfPitches", "strikes", "balls")}
+    pitching["inningsPitched"] = _innings_pitched(pitching["outs"])
+    pitching["era"] = _era(pitching["earnedRuns"], pitching["outs"])
+    return {"batting": batting, "pitching": pitching, "fielding": {"errors": team.errors}}
+
+
+def _boxscore(teams):
+    boxscore_teams = {}
+    for side, team in teams.items():
+        players = {}
+        for order, player in enumerate(team.lineup):
+            players[f"ID{player['id']}"] = _player_entry(team, player, order, batting=team.batting[player["id"]])
+        for player in team.staff:
+            pitching = team.pitching.get(player["id"])
+            players[f"ID{player['id']}"] = _player_entry(team, player, None, pitching=pitching)
+        team_info = dict(team.team)
+        team_info.setdefault("abbreviation", team_abbreviation(team.name))
+        boxscore_teams[side] = {
+            "team": team_info,
+            "teamStats": _team_stats(team),
+            "players": players,
+            "batters": [p["id"] for p in team.lineup] + [p["id"] for p in team.staff if p["id"] in team.pitching],
+            "pitchers": [p["id"] for p in team.staff if p["id"] in team.pitching],
+            "bench": [],
+            "bullpen": [p["id"] for p in team.staff if p["id"] not in team.pitching],
+            "battingOrder": [p["id"] for p in team.lineup],
+            "info": [],
+            "note": [],
+        }
+    return {
+        "copyright": COPYRIGHT,
+        "teams": boxscore_teams,
+        "officials": [],
+        "info": [],
+        "pitchingNotes": [],
+        "topPerformers": [],
+    }
+
+
+def _play_by_play(plays, current_play):
+    plays_by_inning = []
+    for index, play in enumerate(plays):
+        inning = play["about"]["inning"]
+        if not plays_by_inning or plays_by_inning[-1]["_inning"] != inning:
+            plays_by_inning.append({"_inning": inning, "startIndex": index, "endIndex": index,
+                                    "top": [], "bottom": [], "hits": {"away": [], "home": []}})
+        entry = plays_by_inning[-1]
+        entry["endIndex"] = index
+        entry[play["about"]["halfInning"]].append(index)
+    for entry in plays_by_inning:
+        del entry["_inning"]
+    all_plays = plays + ([current_play] if current_play else [])
+    return {
+        "copyright": COPYRIGHT,
+        "allPlays": all_plays,
+        "currentPlay": all_plays[-1] if all_plays else {},
+        "scoringPlays": [play["atBatIndex"] for play in plays if play["about"]["isScoringPlay"]],
+        "playsByInning": plays_by_inning,
+    }
+
+
+def _feed(schedule_game, game_pk, state, teams, linescore, boxscore, play_by_play, end_time):
+    players = {}
+    for side in ("away", "home"):
+        for key, entry in boxscore["teams"][side]["players"].items():
+            players[key] = dict(entry["person"], primaryPosition=entry["position"])
+    return {
+        "copyright": COPYRIGHT,
+        "gamePk": game_pk,
+        "link": f"/api/v1.1/game/{game_pk}/feed/live",
+        "metaData": {"wait": 10, "timeStamp": end_time.strftime("%Y%m%d_%H%M%S"), "gameEvents": [],
+                     "logicalEvents": []},
+        "gameData": {
+            "game": {
+                "pk": game_pk,
+                "type": schedule_game.get("gameType", "R"),
+                "season": schedule_game.get("season", "2025"),
+            },
+            "datetime": {
+                "dateTime": schedule_game.get("gameDate"),
+                "officialDate": schedule_game.get("officialDate"),
+            },
+            "status": copy.deepcopy(schedule_game.get("status", {})),
+            "teams": {side: dict(boxscore["teams"][side]["team"]) for side in ("away", "home")},
+            "players": players,
+            "venue": copy.deepcopy(schedule_game.get("venue", {})),
+        },
+        "liveData": {
+            "plays": {
+                "allPlays": play_by_play["allPlays"],
+                "currentPlay": play_by_play["currentPlay"],
+                "scoringPlays": play_by_play["scoringPlays"],
+                "playsByInning": play_by_play["playsByInning"],
+            },
+            "linescore": linescore,
+            "boxscore": boxscore,
+        },
+    }
+
+
+def synthetic_teams(count=30):
+    """Generic teams for synthetic seasons when no teams payload is at hand"""
+    return [{"id": 1000 + i, "name": f"Synthetic Team {i + 1}", "link": f"/api/v1/teams/{1000 + i}"}
+            for i in range(count)]
+
+
+def generate_season(teams=None, season=2025, start_date=None, days=162):
+    """Schedule payload for a synthetic season where every team plays once a day"""
+    teams = [{"id": team["id"], "name": team["name"], "link": team.get("link", f"/api/v1/teams/{team['id']}")}
+             for team in (teams or synthetic_teams())]
+    start_date = start_date or datetime.date(int(season), 3, 27)
+    rng = random.Random(stable_seed("season", season, len(teams)))
+    game_pk = SYNTHETIC_GAME_PK_BASE + (int(season) % 100) * 10000
+    dates = []
+    for day in range(days):
+        date = start_date + datetime.timedelta(days=day)
+        order = list(teams)
+        rng.shuffle(order)
+        games = []
+        for away, home in zip(order[0::2], order[1::2]):
+            game_pk += 1
+            away_score, home_score = _final_score(rng)
+            games.append({
+                "gamePk": game_pk,
+                "gameType": "R",
+                "season": str(season),
+                "gameDate": f"{date.isoformat()}T23:05:00Z",
+                "officialDate": date.isoformat(),
+                "status": {"abstractGameState": "Final", "codedGameState": "F",
+                           "detailedState": "Final", "statusCode": "F"},
+                "teams": {
+                    "away": {"score": away_score, "team": dict(away), "isWinner": away_score > home_score},
+                    "home": {"score": home_score, "team": dict(home), "isWinner": home_score > away_score},
+                },
+                "venue": {"id": home["id"], "name": f"{home['name']} Park"},
+            })
+        dates.append({"date": date.isoformat(), "totalGames": len(games), "games": games})
+    return {
+        "copyright": COPYRIGHT,
+        "totalItems": sum(len(date["games"]) for date in dates),
+        "totalGames": sum(len(date["games"]) for date in dates),
+        "dates": dates,
+    }
+
+
+def iter_season_documents(schedule):
+    """Yield (schedule game, documents) for every game in a schedule without memoizing them"""
+    for date in schedule.get("dates", []):
+        for game in date.get("games", []):
+            yield game, build_game(game)
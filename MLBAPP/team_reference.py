@@ -0,0 +1,104 @@
+import json
+import threading
+
+# Sport whose team wins when an abbreviation is shared across levels (college, minors, ...)
+MLB_SPORT_ID = 1
+
+
+def serialize(data):
+    """Response body bytes, encoded the way jsonify encodes them outside debug mode"""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+class ReferenceSnapshot:
+    """One load of the reference data, indexed and serialized; never changed after it's built"""
+
+    def __init__(self, teams_payload, venues=(), rosters=None, loaded_on=None):
+        self.loaded_on = loaded_on
+        self.teams_body = serialize(teams_payload)
+        self.teams = {}
+        self.team_bodies = {}
+        self.abbreviations = {}
+        self.venues = {}
+        self.venue_bodies = {}
+        self.rosters = dict(rosters or {})
+        self.roster_bodies = {team_id: serialize(roster) for team_id, roster in self.rosters.items()}
+
+        for team in teams_payload.get('teams', []):
+            team_id = team.get('id')
+            if team_id is None:
+                continue
+            self.teams[team_id] = team
+            self.team_bodies[team_id] = serialize(team)
+            abbreviation = (team.get('abbreviation') or '').upper()
+            known = self.teams.get(self.abbreviations.get(abbreviation))
+            if abbreviation and (known is None or (team.get('sport', {}).get('id') == MLB_SPORT_ID
+                                                   and known.get('sport', {}).get('id') != MLB_SPORT_ID)):
+                self.abbreviations[abbreviation] = team_id
+            venue = team.get('venue')
+            if venue and venue.get('id') is not None:
+                self.venues.setdefault(venue['id'], venue)
+
+        # Full venue records replace the id/name stubs teams carry
+        for venue in venues:
+            if venue.get('id') is not None:
+                self.venues[venue['id']] = venue
+        self.venue_bodies = {venue_id: serialize(venue) for venue_id, venue in self.venues.items()}
+
+
+class TeamReference:
+    """Teams, venues and rosters, loaded once and served as pre-serialized bytes
+
+    Each refresh builds a whole new snapshot and swaps it in, so readers never take a lock and
+    never see a half-built index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshot = None
+
+    @property
+    def loaded_on(self):
+        snapshot = self.snapshot
+        return snapshot.loaded_on if snapshot else None
+
+    def refresh(self, load, loaded_on=None):
+        """Rebuild from load() -> (teams payload, venues, rosters) unless a refresh for loaded_on already happened"""
+        with self._lock:
+            if self.snapshot is not None and self.snapshot.loaded_on == loaded_on:
+                return self.snapshot
+            teams_payload, venues, rosters = load()
+            if not teams_payload or not teams_payload.get('teams'):
+                # Keep serving what we had rather than replacing it with nothing
+                return self.snapshot
+            self.snapshot = ReferenceSnapshot(teams_payload, venues, rosters, loaded_on)
+            return self.snapshot
+
+    def teams_body(self):
+        snapshot = self.snapshot
+        return snapshot.teams_body if snapshot else None
+
+    def team_body(self, team_id):
+        snapshot = self.snapshot
+        return snapshot.team_bodies.get(team_id) if snapshot else None
+
+    def team(self, team_id):
+        snapshot = self.snapshot
+        return snapshot.teams.get(team_id) if snapshot else None
+
+    def team_id(self, abbreviation):
+        """Team id for an abbreviation, preferring the MLB club when levels share one"""
+        snapshot = self.snapshot
+        return snapshot.abbreviations.get((abbreviation or '').upper()) if snapshot else None
+
+    def venue_body(self, venue_id):
+        snapshot = self.snapshot
+        return snapshot.venue_bodies.get(venue_id) if snapshot else None
+
+    def roster_body(self, team_id):
+        snapshot = self.snapshot
+        return snapshot.roster_bodies.get(team_id) if snapshot else None
+
+    def rosters(self):
+        snapshot = self.snapshot
+        return snapshot.rosters if snapshot else {}
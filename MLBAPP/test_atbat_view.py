@@ -0,0 +1,43 @@
+import copy
+
+import app as mlb_app
+from atbat_view import AtBatView
+from synthetic import build_game, default_schedule_game
+
+
+def live_feed():
+    game = default_schedule_game(9000001)
+    game['status'] = {'abstractGameState': 'Live', 'detailedState': 'In Progress'}
+    game['linescore'] = {'currentInning': 5}
+    return build_game(game)['feed']
+
+
+def test_view_only_grows_with_the_current_at_bat():
+    feed = live_feed()
+    view = AtBatView(9000001)
+    assert view.update(feed)
+    assert not view.update(feed)
+
+    first = view.payload()
+    current = feed['liveData']['plays']['currentPlay']
+    assert first['matchup']['batter']['id'] == current['matchup']['batter']['id']
+    assert len(first['pitches']) == sum(1 for e in current['playEvents'] if e.get('isPitch'))
+
+    # One more pitch in the same at-bat only appends that pitch
+    later = copy.deepcopy(feed)
+    later_play = later['liveData']['plays']['currentPlay']
+    later_play['playEvents'].append(dict(later_play['playEvents'][-1], pitchNumber=99))
+    assert view.update(later)
+    second = view.payload()
+    assert second['version'] == first['version'] + 1
+    assert second['pitches'][:-1] == first['pitches']
+    assert second['pitches'][-1]['pitchNumber'] == 99
+    assert second['matchup'] is first['matchup']
+
+
+def test_atbat_route_is_small():
+    client = mlb_app.app.test_client()
+    response = client.get('/api/game/776570/atbat')
+    feed = client.get('/api/game/776570/feed/live')
+    assert response.get_json()['teams']['home']['name'] == 'New York Yankees'
+    assert len(response.data) < 8192 < len(feed.data)
@@ -0,0 +1,118 @@
+import copy
+
+import requests
+
+import app as mlb_app
+from bench_snapshot_store import recorded_sections
+from boxscore_engine import BoxscoreEngine, BATTING_COUNTERS, PITCHING_COUNTERS
+from fake_upstream import FakeResponse
+
+RECORDED = dict(recorded_sections())
+BOXSCORE = RECORDED['/api/v1/game/776570/boxscore']
+PLAYS = RECORDED['/api/v1/game/776570/playByPlay']['allPlays']
+
+
+def team_lob(team):
+    """The 'Team LOB' note of a recorded boxscore team"""
+    for section in team['info']:
+        for field in section['fieldList']:
+            if field['label'] == 'Team LOB':
+                return int(field['value'].rstrip('.'))
+
+
+def test_counts_match_the_recorded_boxscore():
+    engine = BoxscoreEngine()
+    # Fed the way a live game arrives: a few plays at a time, with one still in progress
+    for count in range(1, len(PLAYS) + 1, 4):
+        plays = copy.deepcopy(PLAYS[:count])
+        plays[-1]['about']['isComplete'] = False
+        engine.ingest(plays)
+    assert engine.ingest(PLAYS) > 0 and len(engine) == len(PLAYS)
+    derived = engine.boxscore()
+
+    for side in ('away', 'home'):
+        recorded, ours = BOXSCORE['teams'][side], derived['teams'][side]
+        for kind, counters in (('batting', BATTING_COUNTERS), ('pitching', PITCHING_COUNTERS)):
+            for counter in counters:
+                assert ours['teamStats'][kind][counter] == recorded['teamStats'][kind][counter], (side, kind, counter)
+        for counter in ('putOuts', 'assists', 'errors'):
+            assert ours['teamStats']['fielding'][counter] == recorded['teamStats']['fielding'][counter]
+        for key in ('batters', 'pitchers', 'battingOrder'):
+            assert ours[key] == recorded[key], (side, key)
+
+        for key, player in recorded['players'].items():
+            stats = player['stats']
+            if player.get('battingOrder'):
+                assert ours['players'][key]['battingOrder'] == player['battingOrder']
+            if stats['batting'].get('plateAppearances'):
+                for counter in BATTING_COUNTERS:
+                    assert ours['players'][key]['stats']['batting'][counter] == stats['batting'][counter], (key, counter)
+            if stats['pitching']:
+                for counter in PITCHING_COUNTERS + ('inningsPitched',):
+                    assert ours['players'][key]['stats']['pitching'][counter] == stats['pitching'][counter], (key, counter)
+
+        line = derived['linescore']['teams'][side]
+        assert line['runs'] == recorded['teamStats']['batting']['runs']
+        assert line['hits'] == recorded['teamStats']['batting']['hits']
+        assert line['errors'] == recorded['teamStats']['fielding']['errors']
+        assert line['leftOnBase'] == team_lob(recorded)
+
+    innings = derived['linescore']['innings']
+    assert len(innings) == 9 and 'runs' not in innings[-1]['home']
+    assert sum(inning['away']['runs'] for inning in innings) == 2
+
+
+def test_taken_back_plays_are_recounted():
+    engine = BoxscoreEngine()
+    engine.ingest(PLAYS)
+    engine.ingest(PLAYS[:10])
+    fresh = BoxscoreEngine()
+    fresh.ingest(PLAYS[:10])
+    assert engine.boxscore() == fresh.boxscore()
+
+
+def test_live_boxscore_route_needs_only_play_by_play(monkeypatch):
+    upstream = []
+
+    def fake_get(url, **kwargs):
+        upstream.append(url)
+        if '/playByPlay' in url:
+            return FakeResponse(RECORDED['/api/v1/game/776570/playByPlay'])
+        return FakeResponse({})
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    mlb_app.schedule_service.clear()
+    mlb_app.boxscore_engines.discard('live', 776570)
+
+    data = mlb_app.app.test_client().get('/api/game/776570/boxscore?source=live').get_json()
+    assert data['teams']['home']['teamStats']['batting']['runs'] == 11
+    assert data['linescore']['teams']['away']['hits'] == 6
+    assert not [url for url in upstream if '/boxscore' in url or '/linescore' in url]
+
+
+def test_stand_in_plays_never_reach_a_game_engine(monkeypatch):
+    def fake_get(url, **kwargs):
+        if '/playByPlay' in url:
+            raise requests.ConnectionError('upstream down')
+        return FakeResponse({})
+
+    parse = mlb_app.parse_mlb_data_section
+
+    def local_data(section_name):
+        # The recorded game's plays stand in for any game's
+        if section_name.endswith('/playByPlay'):
+            return RECORDED['/api/v1/game/776570/playByPlay']
+        return parse(section_name)
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    monkeypatch.setattr(mlb_app, 'parse_mlb_data_section', local_data)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    mlb_app.schedule_service.clear()
+    mlb_app.boxscore_engines.discard('live', 777001)
+
+    assert mlb_app.app.test_client().get('/api/game/777001/boxscore?source=live').status_code == 200
+    assert len(mlb_app.boxscore_engines.get('live', 777001)) == 0
+    mlb_app.boxscore_engines.discard('live', 777001)
@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+import pytest
+
+from bench_capture import SlateStub
+from capture_daemon import METRICS_FILE, CaptureDaemon, GameCapture, make_fetch
+from schedule_service import ScheduleService
+from time_travel import TimeTravelStore
+
+
+def test_game_capture_records_every_moment(tmp_path):
+    store = TimeTravelStore(str(tmp_path))
+    with SlateStub(games=1, moments=3, step=1) as stub:
+        game_pk = next(iter(stub.games))
+        capture = GameCapture(game_pk, store, make_fetch(stub.base_url, 1000))
+        delay = capture.poll()
+        while delay is not None:
+            time.sleep(delay)
+            delay = capture.poll()
+        expected = [stub.timecode(moment) for moment in range(3)]
+        final = stub.feed(game_pk, 2)
+    assert store.timecodes(game_pk) == expected
+    assert json.loads(store.body(game_pk, expected[-1])[1]) == json.loads(json.dumps(final))
+    # The first poll fetches the feed; later ones the timestamps, plus a diffPatch when there's news
+    assert capture.metrics['requests'] <= 1 + 2 * (capture.metrics['polls'] - 1)
+    assert capture.metrics['state'] == 'Final' and capture.metrics['lagSecondsMax'] is not None
+
+
+def test_daemon_splits_the_slate_across_workers(tmp_path):
+    with SlateStub(games=4, moments=3, step=1) as stub:
+        schedule = ScheduleService(str(tmp_path / 'schedule.sqlite3'), base_url=stub.base_url)
+        daemon = CaptureDaemon(str(tmp_path / 'archive'), stub.date, workers=2, base_url=stub.base_url, rate=200,
+                               schedule=schedule)
+        metrics = daemon.run(duration=30)
+        expected = [stub.timecode(moment) for moment in range(3)]
+    assert sorted(metrics) == sorted(stub.games)
+    assert {game['worker'] for game in metrics.values()} == {0, 1}
+    assert all(game['state'] == 'Final' for game in metrics.values())
+    store = TimeTravelStore(str(tmp_path / 'archive'))
+    assert all(store.timecodes(game_pk) == expected for game_pk in stub.games)
+    # The slate was found with one range query through the schedule cache
+    assert schedule.stats['requests'] == 1
+    with open(os.path.join(str(tmp_path / 'archive'), METRICS_FILE)) as f:
+        assert len(json.load(f)['games']) == 4
+
+
+def test_a_patch_that_fails_starts_over_from_the_whole_feed(tmp_path):
+    store = TimeTravelStore(str(tmp_path))
+    feeds = [{'metaData': {'timeStamp': '20250827_170000', 'wait': 10}, 'gameData': {'status': {'abstractGameState': 'Live'}},
+              'liveData': {'plays': {'allPlays': []}}}]
+    calls = []
+
+    def fetch(path, params=None):
+        calls.append(path.rsplit('/feed/live', 1)[1])
+        if path.endswith('/timestamps'):
+            return ['20250827_170000', '20250827_170100']
+        if path.endswith('/diffPatch'):
+            # The first op applies, the second doesn't
+            return [{'diff': [{'op': 'replace', 'path': '/metaData/timeStamp', 'value': '20250827_170100'},
+                              {'op': 'remove', 'path': '/liveData/nothing/here'}]}]
+        return json.loads(json.dumps(feeds[-1]))
+
+    clock = iter([100.0, 104.0, 110.0])
+    capture = GameCapture(1, store, fetch, clock=lambda: next(clock))
+    assert capture.poll() == 10
+    with pytest.raises(Exception):
+        capture.poll()
+    assert capture.document is None and store.timecodes(1) == ['20250827_170000']
+    feeds.append(dict(feeds[0], metaData={'timeStamp': '20250827_170100', 'wait': 10}))
+    capture.poll()
+    assert calls == ['', '/timestamps', '/diffPatch', '']
+    assert store.timecodes(1) == ['20250827_170000', '20250827_170100']
+    # Lag runs from the last poll that succeeded, not the one that failed
+    assert capture.metrics['lagSeconds'] == 4.0
@@ -0,0 +1,60 @@
+import threading
+
+import app as mlb_app
+from fake_upstream import FakeResponse
+
+
+def test_toggle_is_per_session_and_keeps_caches_warm(monkeypatch):
+    upstream_calls = []
+
+    def fake_get(url, **kwargs):
+        upstream_calls.append(url)
+        return FakeResponse({'dates': [], 'url': url})
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    mlb_app.schedule_service.clear()
+
+    # Warm both namespaces: one client on local data, one on live data
+    local_client = mlb_app.app.test_client()
+    live_client = mlb_app.app.test_client()
+    assert live_client.get('/api/toggle_data_source').get_json()['data_source'] == 'live'
+    assert local_client.get('/api/schedule?date=2025-08-27').status_code == 200
+    assert live_client.get('/api/schedule?date=2025-08-27').status_code == 200
+
+    warm = mlb_app.data_cache.stats()
+    warm_upstream = len(upstream_calls)
+    assert warm['local']['entries'] > 0 and warm['live']['entries'] > 0
+
+    errors = []
+
+    def viewer(toggles):
+        client = mlb_app.app.test_client()
+        try:
+            for i in range(20):
+                if toggles and i % 2 == 0:
+                    client.get('/api/toggle_data_source')
+                response = client.get('/api/schedule?date=2025-08-27')
+                assert response.status_code == 200
+        except AssertionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=viewer, args=(i % 2 == 0,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    after = mlb_app.data_cache.stats()
+
+    # Toggling never evicted anything, so no request had to re-parse or re-fetch
+    assert after['local']['misses'] == warm['local']['misses']
+    assert after['live']['misses'] == warm['live']['misses']
+    assert after['local']['entries'] == warm['local']['entries']
+    assert after['live']['entries'] == warm['live']['entries']
+    assert len(upstream_calls) == warm_upstream
+
+    # The first client's preference was not changed by anyone else's toggle
+    assert local_client.get('/api/data_source').get_json()['data_source'] == 'local'
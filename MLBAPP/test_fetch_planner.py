@@ -0,0 +1,67 @@
+import datetime
+
+import app as mlb_app
+from fake_upstream import FakeResponse
+from fetch_planner import plan_schedule_fetch, fan_out, game_linescore_endpoint
+
+
+def hydrated_slate(count):
+    games = []
+    for n in range(count):
+        games.append({
+            'gamePk': 880000 + n,
+            'status': {'abstractGameState': 'Live'},
+            'teams': {
+                'away': {'score': 1, 'team': {'id': 100 + n, 'name': f'Away {n}', 'link': '', 'abbreviation': 'AWY'}},
+                'home': {'score': 2, 'team': {'id': 200 + n, 'name': f'Home {n}', 'link': '', 'abbreviation': 'HOM'}},
+            },
+            'venue': {'id': 300 + n, 'name': f'Park {n}'},
+            'linescore': {'currentInning': 5, 'innings': [{'num': 1, 'away': {'runs': 1}, 'home': {'runs': 2}}]},
+        })
+    return {'dates': [{'date': '2025-08-27', 'games': games}]}
+
+
+def test_plan_merges_route_needs():
+    plan = plan_schedule_fetch(['scoreboard', 'boxscore'])
+    assert plan.hydrations == ('decisions', 'linescore', 'probablePitcher', 'team')
+    assert plan.endpoint('2025-08-27') == \
+        '/api/v1/schedule?sportId=1&date=2025-08-27&hydrate=decisions,linescore,probablePitcher,team'
+
+
+def test_fan_out_stores_per_game_linescores():
+    stored = {}
+    plan = plan_schedule_fetch(['boxscore'])
+    assert fan_out(hydrated_slate(3), plan, stored.__setitem__) == 3
+    assert stored[game_linescore_endpoint(880001)]['currentInning'] == 5
+    # Only linescores have a reader; nothing else from the slate is stored
+    assert sorted(stored) == [game_linescore_endpoint(880000 + n) for n in range(3)]
+    assert fan_out(hydrated_slate(3), plan_schedule_fetch(['team']), stored.__setitem__) == 0
+
+
+def test_slate_refresh_is_one_upstream_request(monkeypatch):
+    slate = hydrated_slate(15)
+    slate['dates'][0]['date'] = datetime.datetime.now().strftime('%Y-%m-%d')
+    upstream = []
+
+    def fake_get(url, **kwargs):
+        upstream.append(url)
+        if '/schedule' in url:
+            return FakeResponse(slate)
+        return FakeResponse({'teams': {'away': {'team': {'name': 'A'}}, 'home': {'team': {'name': 'H'}}}})
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    mlb_app.schedule_service.clear()
+
+    client = mlb_app.app.test_client()
+    assert client.get('/api/schedule?source=live').status_code == 200
+    for game in slate['dates'][0]['games']:
+        data = client.get(f"/api/game/{game['gamePk']}/boxscore?source=live").get_json()
+        assert data['linescore']['currentInning'] == 5
+
+    schedule_requests = [url for url in upstream if '/schedule' in url]
+    linescore_requests = [url for url in upstream if '/linescore' in url]
+    assert len(schedule_requests) == 1
+    assert 'hydrate=' in schedule_requests[0]
+    assert linescore_requests == []
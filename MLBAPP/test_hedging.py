@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+import app as mlb_app
+import deadline
+from bench_hedging import percentile, run
+from upstream_scheduler import QueueTimeout, UpstreamScheduler, endpoint_key
+
+
+def test_hedging_cuts_the_tail_of_a_spiky_upstream():
+    unhedged, _ = run(False, 60, spike_every=25, spike_ms=300)
+    hedged, hedges = run(True, 60, spike_every=25, spike_ms=300)
+    assert percentile(unhedged, 0.99) >= 0.25
+    assert percentile(hedged, 0.99) < 0.15
+    assert hedges['won'] >= 1
+
+
+def test_budgets_only_shrink():
+    assert deadline.remaining(5) == 5
+    with deadline.budget(1):
+        with deadline.budget(60):
+            assert deadline.remaining() <= 1
+        assert 0 < deadline.remaining(10) <= 1
+    assert deadline.remaining() is None
+
+
+def test_queue_wait_stops_at_the_deadline():
+    scheduler = UpstreamScheduler(rate=1, burst=1, fetch=lambda url, **kwargs: None)
+    scheduler.get('https://example.test/api/v1/people/1')
+    started = time.monotonic()
+    with deadline.budget(0.1), pytest.raises(QueueTimeout):
+        scheduler.get('https://example.test/api/v1/people/2')
+    assert time.monotonic() - started < 0.5
+
+
+def test_spent_budget_skips_the_upstream_fetch(monkeypatch):
+    upstream = []
+    monkeypatch.setattr(mlb_app.requests, 'get', lambda url, **kwargs: upstream.append(url))
+    with deadline.budget(0):
+        assert mlb_app.fetch_live_data('/api/v1/game/776570/playByPlay') is None
+    assert upstream == []
+
+
+def test_the_losing_attempt_is_closed_unread():
+    class Response:
+        def __init__(self, name):
+            self.name = name
+            self.closed = False
+            self.read = False
+
+        @property
+        def content(self):
+            self.read = True
+            return b'{}'
+
+        def close(self):
+            self.closed = True
+
+    responses = []
+
+    def fetch(url, **kwargs):
+        response = Response('slow' if not responses else 'fast')
+        responses.append(response)
+        if response.name == 'slow':
+            time.sleep(0.3)
+        return response
+
+    scheduler = UpstreamScheduler(rate=100, burst=10, fetch=fetch)
+    for _ in range(20):
+        scheduler._record(endpoint_key('https://example.test/api/v1/people/1'), 0.01)
+    assert scheduler.get('https://example.test/api/v1/people/1').name == 'fast'
+    slow = responses[0]
+    # Sent before the hedge won, so it runs until its headers arrive; then it's closed, body unread
+    time.sleep(0.5)
+    assert slow.closed and not slow.read
+    assert scheduler.stats()['hedges'] == {'sent': 1, 'won': 1}
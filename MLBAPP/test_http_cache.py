@@ -0,0 +1,81 @@
+import json
+import time
+
+from http_cache import HttpCache, freshness_for, normalize_url
+
+
+class FakeUpstream:
+    """Serves one JSON body with an ETag and answers conditional requests with 304"""
+
+    def __init__(self, body, etag='"v1"'):
+        self.body = json.dumps(body).encode('utf-8')
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        if headers and headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304, b'', {'ETag': self.etag})
+        return FakeResponse(200, self.body, {'ETag': self.etag, 'Content-Type': 'application/json'})
+
+
+class FakeResponse:
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+
+def test_urls_are_normalized():
+    assert normalize_url('HTTPS://StatsAPI.mlb.com/api/v1/schedule?date=2025-08-27&sportId=1') == \
+        normalize_url('https://statsapi.mlb.com/api/v1/schedule', {'sportId': 1, 'date': '2025-08-27'})
+
+
+def test_restart_serves_reference_data_from_disk(tmp_path):
+    path = str(tmp_path / 'http.sqlite3')
+    upstream = FakeUpstream({'teams': [{'id': 147}]})
+    HttpCache(path, fetch=upstream).get('https://statsapi.mlb.com/api/v1/teams')
+
+    # A new process with the same cache file doesn't go upstream for fresh reference data
+    restarted = HttpCache(path, fetch=upstream)
+    response = restarted.get('https://statsapi.mlb.com/api/v1/teams')
+    assert response.from_cache
+    assert response.json() == {'teams': [{'id': 147}]}
+    assert len(upstream.requests) == 1
+
+
+def test_stale_entries_are_revalidated(tmp_path):
+    upstream = FakeUpstream({'gameData': {}})
+    cache = HttpCache(str(tmp_path / 'http.sqlite3'), fetch=upstream)
+    url = 'https://statsapi.mlb.com/api/v1.1/game/776570/feed/live'
+
+    cache.get(url)
+    response = cache.get(url)
+    assert upstream.requests[-1][1]['If-None-Match'] == '"v1"'
+    assert response.status_code == 200 and response.json() == {'gameData': {}}
+    assert cache.stats['revalidated'] == 1
+
+
+def test_disk_size_is_capped(tmp_path):
+    upstream = FakeUpstream({'payload': 'x' * 50000, 'n': list(range(2000))})
+    cache = HttpCache(str(tmp_path / 'http.sqlite3'), max_bytes=20000, fetch=upstream)
+    for venue in range(10):
+        cache.get(f'https://statsapi.mlb.com/api/v1/venues/{venue}')
+    assert cache.size() <= 20000
+    assert cache.stats['evicted'] > 0
+
+
+def test_game_state_is_always_revalidated(tmp_path):
+    base = 'https://statsapi.mlb.com/api/v1'
+    today = time.strftime('%Y-%m-%d')
+    assert freshness_for(f'{base}/schedule?sportId=1&date={today}') == 0
+    assert freshness_for(f'{base}/schedule?sportId=1') == 0
+    assert freshness_for(f'{base}/schedule?sportId=1&date=2025-04-01') > 0
+    assert freshness_for(f'{base}/game/776570/linescore') == 0
+    assert freshness_for(f'{base}/teams/147') > 0
+
+    # A game-state body with nothing to revalidate it by would never be served, so it isn't stored
+    upstream = FakeUpstream({'innings': []}, etag=None)
+    cache = HttpCache(str(tmp_path / 'http.sqlite3'), fetch=upstream)
+    cache.get(f'{base}/game/776570/linescore')
+    assert cache.size() == 0
@@ -0,0 +1,62 @@
+import copy
+
+import pytest
+
+import app as mlb_app
+from cache import TieredCache
+from interning import FrozenDict, ReferenceInterner
+
+
+def payload(name='New York Yankees'):
+    team = {'id': 147, 'name': name, 'link': '/api/v1/teams/147'}
+    batter = {'id': 592450, 'fullName': 'Aaron Judge', 'link': '/api/v1/people/592450'}
+    return {'teams': {'home': {'team': dict(team), 'score': 3}},
+            'allPlays': [{'matchup': {'batter': dict(batter)}}, {'matchup': {'batter': dict(batter)}}]}
+
+
+def test_reference_objects_are_shared_and_frozen():
+    interner = ReferenceInterner()
+    first, second = interner.intern(payload()), interner.intern(payload())
+    assert first == payload()
+    assert first['teams']['home']['team'] is second['teams']['home']['team']
+    assert first['allPlays'][0]['matchup']['batter'] is second['allPlays'][1]['matchup']['batter']
+    # Containers that aren't reference entities stay separate and editable
+    assert first['teams'] is not second['teams']
+    first['teams']['home']['score'] = 4
+
+    # A differently hydrated copy of the same team is its own variant
+    renamed = interner.intern(payload('Yankees'))
+    assert renamed['teams']['home']['team']['name'] == 'Yankees'
+    assert renamed['allPlays'][0]['matchup']['batter'] is first['allPlays'][0]['matchup']['batter']
+
+    team = first['teams']['home']['team']
+    assert isinstance(team, FrozenDict)
+    with pytest.raises(TypeError):
+        team['name'] = 'Changed'
+    with pytest.raises(TypeError):
+        team.update(name='Changed')
+    # Copies are ordinary dicts
+    for changed in (dict(team), team.copy(), copy.deepcopy(first)['teams']['home']['team']):
+        assert type(changed) is dict
+        changed['name'] = 'Changed'
+    assert team['name'] == 'New York Yankees'
+
+
+def test_cache_hands_back_interned_payloads():
+    interner = ReferenceInterner()
+    cache = TieredCache(intern=interner.intern)
+    stored = cache.set('local', 'a', payload())
+    assert cache.get('local', 'a') is stored
+    cache.set('local', 'b', payload())
+    assert cache.get('local', 'b')['teams']['home']['team'] is stored['teams']['home']['team']
+    assert interner.stats['payloads'] == 2
+
+
+def test_adapted_games_leave_cached_payloads_alone():
+    client = mlb_app.app.test_client()
+    recorded = client.get('/api/game/776570/playByPlay').get_json()
+    schedule = client.get('/api/schedule').get_json()
+    other = next(game for date in schedule['dates'] for game in date['games'] if game['gamePk'] != 776570)
+    adapted = client.get(f"/api/game/{other['gamePk']}/playByPlay").get_json()
+    assert 'Player' in adapted['allPlays'][0]['matchup']['batter']['fullName']
+    assert client.get('/api/game/776570/playByPlay').get_json() == recorded
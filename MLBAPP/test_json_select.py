@@ -0,0 +1,33 @@
+import datetime
+import json
+
+from json_select import select_paths, prune
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+PATHS = ('gameData.status', 'gameData.teams', 'liveData.linescore', 'liveData.plays.currentPlay',
+         'liveData.boxscore', 'liveData.missing', 'nowhere.at.all')
+
+
+def test_matches_full_decoding_on_a_feed():
+    schedule = generate_season(synthetic_teams(2), start_date=datetime.date(2025, 5, 1), days=1)
+    _, documents = next(iter_season_documents(schedule))
+    feed = documents['feed']
+    for indent in (None, 2):
+        body = json.dumps(feed, indent=indent).encode('utf-8')
+        selected = select_paths(body, PATHS)
+        assert selected == prune(feed, PATHS)
+        assert 'allPlays' not in selected['liveData']['plays']
+        assert 'missing' not in selected['liveData'] and 'nowhere' not in selected
+
+
+def test_strings_that_look_like_structure():
+    document = {
+        'decoy': {'text': 'a "target": [{ not this } \\', 'target': 'nested, so not this either'},
+        'notes': ['}}]]', '\\"target\\":', {'target': 0}],
+        'target': {'value': 'café \\" [x]', 'n': -1.5e3, 'flag': None},
+        'last': True,
+    }
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+    assert select_paths(body, ['target.value', 'target.n', 'target.flag', 'last']) == {
+        'target': {'value': 'café \\" [x]', 'n': -1.5e3, 'flag': None}, 'last': True}
+    assert select_paths(body, ['decoy.target']) == {'decoy': {'target': 'nested, so not this either'}}
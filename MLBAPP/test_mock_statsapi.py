@@ -0,0 +1,81 @@
+import gzip
+import json
+import socket
+import time
+
+import pytest
+import requests
+
+import app as mlb_app
+from mock_statsapi import MockStatsApi
+from time_travel import TimeTravelStore
+
+
+@pytest.fixture(scope='module')
+def mock():
+    return MockStatsApi()
+
+
+def raw_get(base_url, target, accept_gzip=True):
+    """(status, headers, body) of a GET sent by hand, so the body arrives exactly as served"""
+    host, port = base_url.split('//')[1].split(':')
+    with socket.create_connection((host, int(port))) as sock:
+        sock.sendall(f"GET {target} HTTP/1.1\r\nHost: mock\r\nConnection: close\r\n"
+                     f"{'Accept-Encoding: gzip' if accept_gzip else 'X-None: 1'}\r\n\r\n".encode('latin-1'))
+        data = b''
+        while chunk := sock.recv(65536):
+            data += chunk
+    head, body = data.split(b'\r\n\r\n', 1)
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def test_routes_follow_the_spec(mock):
+    assert mock.match('/api/v1/game/lastPitch')[0] == '/api/v1/game/lastPitch'
+    template, params, _ = mock.match('/api/v1.1/game/776570/feed/live/diffPatch')
+    assert template == '/api/v1.1/game/{game_pk}/feed/live/diffPatch' and params == {'game_pk': '776570'}
+    assert mock.match('/api/v1/nothing/here') is None
+
+    status, body, _ = mock.respond('/api/v1/game/776570/boxscore')
+    assert status == 200 and json.loads(body)['teams']['home']['teamStats']['batting']['runs'] == 11
+    status, body, _ = mock.respond('/api/v1/teams/147/roster')
+    assert status == 200 and set(json.loads(body)) >= {'roster'}
+    assert mock.respond('/api/v1/nothing/here')[0] == 404
+    assert {'recorded', 'schema', 'missing'} <= set(mock.stats)
+
+
+def test_gzip_errors_and_latency():
+    mock = MockStatsApi(latency_ms=50)
+    with mock.running() as server:
+        status, headers, body = raw_get(server.base_url, '/api/v1/game/776570/playByPlay')
+        assert status == 200 and headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(body))['allPlays']
+        started = time.perf_counter()
+        status, headers, body = raw_get(server.base_url, '/api/v1/gameStatus', accept_gzip=False)
+        assert time.perf_counter() - started >= 0.05
+        assert 'Content-Encoding' not in headers and json.loads(body)
+
+    with MockStatsApi(error_rate=1.0).running() as server:
+        assert requests.get(f'{server.base_url}/api/v1/teams', timeout=5).status_code == 503
+
+
+def test_feed_from_a_capture_archive(tmp_path):
+    store = TimeTravelStore(str(tmp_path))
+    store.record(1234, {'metaData': {'timeStamp': '20250827_170500'}, 'gameData': {'game': {'pk': 1234}}})
+    store.record(1234, {'metaData': {'timeStamp': '20250827_171000'}, 'gameData': {'game': {'pk': 1234}, 'x': 1}})
+    mock = MockStatsApi(archive=str(tmp_path))
+    assert json.loads(mock.respond('/api/v1.1/game/1234/feed/live/timestamps')[1]) == ['20250827_170500', '20250827_171000']
+    assert json.loads(mock.respond('/api/v1.1/game/1234/feed/live')[1])['gameData']['x'] == 1
+    earlier = json.loads(mock.respond('/api/v1.1/game/1234/feed/live?timecode=20250827_170700')[1])
+    assert 'x' not in earlier['gameData']
+
+
+def test_app_runs_against_the_mock(monkeypatch):
+    with MockStatsApi().running() as server:
+        monkeypatch.setattr(mlb_app, 'MLB_API_BASE_URL', server.base_url)
+        mlb_app.data_cache.clear()
+        mlb_app.http_cache.clear()
+        mlb_app.boxscore_engines.discard('live', 776570)
+        data = mlb_app.app.test_client().get('/api/game/776570/boxscore?source=live').get_json()
+    assert data['teams']['home']['teamStats']['batting']['runs'] == 11
@@ -0,0 +1,58 @@
+import app as mlb_app
+from bench_pitch_analytics import naive_pitch_mix
+from pitch_analytics import PitchAnalytics
+from synthetic import build_game, default_schedule_game
+
+
+def recorded_plays():
+    return mlb_app.parse_mlb_data_section('/api/v1/game/776570/playByPlay')['allPlays']
+
+
+def test_pitch_mix_matches_a_loop_over_the_plays():
+    plays = recorded_plays()
+    engine = PitchAnalytics()
+    engine.ingest(776570, plays, '2025-08-27')
+    assert engine.ingest(776570, plays, '2025-08-27') == 0
+
+    mix = engine.pitch_mix(608331)
+    expected = naive_pitch_mix([plays], 608331)
+    assert {entry['type']: entry['count'] for entry in mix['mix']} == {code: n for code, (n, _) in expected.items()}
+    for entry in mix['mix']:
+        assert abs(entry['avgSpeed'] - expected[entry['type']][1]) < 0.06
+    assert abs(sum(entry['percent'] for entry in mix['mix']) - 100) < 0.5
+
+
+def test_filters_and_heatmap_totals():
+    engine = PitchAnalytics()
+    engine.ingest(776570, recorded_plays(), '2025-08-27')
+    synthetic = build_game(default_schedule_game(9000001))
+    engine.ingest(9000001, synthetic['playByPlay']['allPlays'], '2025-08-28')
+
+    everything = engine.zone_heatmap()
+    first_day = engine.zone_heatmap(end_date='2025-08-27')
+    second_day = engine.zone_heatmap(start_date='2025-08-28')
+    assert first_day['pitches'] + second_day['pitches'] == everything['pitches']
+    assert sum(map(sum, everything['counts'])) == everything['plotted'] <= everything['pitches']
+
+    velocity = engine.velocity_distribution(608331)
+    assert sum(entry['count'] for entry in velocity['types']) == engine.pitch_mix(608331)['pitches']
+    assert all(len(entry['counts']) == len(velocity['edges']) - 1 for entry in velocity['types'])
+
+
+def test_analytics_routes():
+    client = mlb_app.app.test_client()
+    mix = client.get('/api/analytics/pitchers/608331/mix').get_json()
+    assert mix['pitches'] > 0
+    splits = client.get('/api/analytics/batters/695578/pitch-types').get_json()
+    assert splits['pitches'] > 0
+    assert client.get('/api/analytics/heatmap?startDate=08-27').status_code == 400
+
+
+def test_games_that_fail_to_load_are_not_ingested(monkeypatch):
+    engine = PitchAnalytics()
+    monkeypatch.setitem(mlb_app.pitch_analytics, 'live', engine)
+    monkeypatch.setattr(mlb_app, 'fetch_live_data', lambda *args, **kwargs: None)
+    monkeypatch.setattr(mlb_app, 'finished_games', lambda dates, source=None: [(123456, '2025-08-27', {})])
+    mlb_app.load_pitch_analytics(['2025-08-27'], 'live')
+    # Neither the recorded game nor a synthetic one stands in for it
+    assert 123456 not in engine.games and engine.pitch_mix(608331)['pitches'] == 0
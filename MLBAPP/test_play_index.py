@@ -0,0 +1,101 @@
+import datetime
+
+import app as mlb_app
+from play_index import PlayIndex, men_on_base
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+
+def season_plays(days=3):
+    schedule = generate_season(synthetic_teams(6), start_date=datetime.date(2025, 5, 1), days=days)
+    return [(game['gamePk'], game['gameDate'], documents['playByPlay']['allPlays'])
+            for game, documents in iter_season_documents(schedule)]
+
+
+def brute_force(games, predicate):
+    return sorted((game_pk, play['about']['atBatIndex'])
+                  for game_pk, _, plays in games for play in plays if predicate(game_pk, play))
+
+
+def found(result):
+    return sorted((play['gamePk'], play['atBatIndex']) for play in result['plays'])
+
+
+def test_search_matches_a_scan_and_survives_a_restart(tmp_path):
+    games = season_plays()
+    index = PlayIndex(str(tmp_path))
+    for game_pk, date, plays in games[:-2]:
+        index.add_plays(game_pk, plays, date)
+    index.flush()
+    # The last games stay pending, and are searchable before any flush
+    for game_pk, date, plays in games[-2:]:
+        index.add_plays(game_pk, plays, date)
+
+    batter = games[0][2][0]['matchup']['batter']['id']
+    expected = brute_force(games, lambda pk, play: play['matchup']['batter']['id'] == batter
+                           and play['result']['eventType'] == 'strikeout')
+    result = index.search(batter=batter, event_type='strikeout', limit=500)
+    assert result['total'] == len(expected) and found(result) == expected
+
+    expected = brute_force(games, lambda pk, play: 'homers' in play['result']['description']
+                           and play['about']['inning'] >= 1 and men_on_base(play) == 'Empty')
+    result = index.search(text='homers', men_on_base='Empty', limit=500)
+    assert found(result) == expected
+
+    index.flush()
+    restarted = PlayIndex(str(tmp_path))
+    assert len(restarted) == len(index)
+    assert restarted.search(text='homers', men_on_base='Empty', limit=500) == result
+
+    # Re-adding the same plays doesn't duplicate them
+    game_pk, date, plays = games[0]
+    assert restarted.add_plays(game_pk, plays, date) == 0
+
+
+def test_dates_and_paging(tmp_path):
+    games = season_plays()
+    index = PlayIndex(str(tmp_path))
+    for game_pk, date, plays in games:
+        index.add_plays(game_pk, plays, date)
+    first_day = index.search(event_type='single', end_date='2025-05-01', limit=1000)
+    assert {play['date'] for play in first_day['plays']} == {'2025-05-01'}
+    everything = index.search(event_type='single', limit=1000)
+    assert everything['plays'][0]['date'] == '2025-05-03'
+    page = index.search(event_type='single', limit=5, offset=5)
+    assert page['plays'] == everything['plays'][5:10]
+
+
+def test_workers_sharing_an_index_keep_each_play_once(tmp_path):
+    games = season_plays(days=1)
+    first = PlayIndex(str(tmp_path))
+    second = PlayIndex(str(tmp_path))
+    game_pk, date, plays = games[0]
+    first.add_plays(game_pk, plays, date)
+    first.flush()
+    # The second worker indexed the same game before seeing the first's segment
+    for game_pk, date, plays in games[:2]:
+        second.add_plays(game_pk, plays, date)
+    second.flush()
+    expected = len(games[0][2]) + len(games[1][2])
+    assert len(PlayIndex(str(tmp_path))) == len(second) == expected
+    first.refresh()
+    assert len(first) == expected
+
+
+def test_stand_in_plays_are_not_indexed(tmp_path, monkeypatch):
+    index = PlayIndex(str(tmp_path))
+    monkeypatch.setitem(mlb_app.play_indexes, 'live', index)
+    monkeypatch.setattr(mlb_app, 'fetch_live_data', lambda *args, **kwargs: None)
+    game = {'gamePk': 123456, 'officialDate': '2025-08-27'}
+    monkeypatch.setattr(mlb_app, 'finished_games', lambda dates, source=None: [(123456, '2025-08-27', game)])
+    mlb_app.load_play_index(['2025-08-27'], 'live')
+    # The recorded game stands in for the one that failed to load, but isn't filed under its gamePk
+    response = mlb_app.app.test_client().get('/api/game/123456/playByPlay?since=0&source=live').get_json()
+    assert response['allPlays']
+    assert len(index) == 0 and 123456 not in index.finished
+
+
+def test_search_route():
+    client = mlb_app.app.test_client()
+    result = client.get('/api/plays/search?eventType=home_run').get_json()
+    assert result['total'] > 0
+    assert all(play['eventType'] == 'home_run' for play in result['plays'])
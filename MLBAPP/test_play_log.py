@@ -0,0 +1,97 @@
+import requests
+
+import app as mlb_app
+from fake_upstream import FakeResponse
+from play_log import PlayLog
+
+
+def play(index, pitches, complete=True):
+    return {
+        'about': {'atBatIndex': index, 'isComplete': complete},
+        'playEvents': [{'index': n, 'isPitch': True} for n in range(pitches)],
+    }
+
+
+def test_cursor_returns_only_new_pitches_and_plays():
+    log = PlayLog()
+    log.ingest([play(0, 4), play(1, 2, complete=False)])
+    assert log.cursor() == {'since': 1, 'pitchSince': 2}
+
+    # Nothing new since the cursor
+    assert log.since(1, 2)['allPlays'] == []
+
+    # Two more pitches end the at-bat and a new one starts
+    assert log.ingest([play(0, 4), play(1, 4), play(2, 1, complete=False)]) == 2
+    update = log.since(1, 2)
+    assert [p['about']['atBatIndex'] for p in update['allPlays']] == [1, 2]
+    assert update['allPlays'][0]['pitchOffset'] == 2
+    assert len(update['allPlays'][0]['playEvents']) == 2
+    assert update['cursor'] == {'since': 2, 'pitchSince': 1}
+
+
+def test_play_by_play_route_polls_incrementally():
+    mlb_app.play_logs.discard('local', 776570)
+    client = mlb_app.app.test_client()
+    full = client.get('/api/game/776570/playByPlay').get_json()
+    first = client.get('/api/game/776570/playByPlay?since=0&pitchSince=0').get_json()
+    assert len(first['allPlays']) == len(full['allPlays'])
+
+    cursor = first['cursor']
+    again = client.get(f"/api/game/776570/playByPlay?since={cursor['since']}&pitchSince={cursor['pitchSince']}").get_json()
+    assert again['allPlays'] == []
+    assert again['totalPlays'] == len(full['allPlays'])
+
+
+def test_polls_pass_on_only_the_plays_that_changed(monkeypatch):
+    plays = [play(n, 3) for n in range(40)] + [play(40, 1, complete=False)]
+    payload = {'allPlays': plays}
+    monkeypatch.setattr(mlb_app, 'play_by_play_data', lambda game_pk, source=None: (payload, True))
+    monkeypatch.setattr(mlb_app.play_indexes['local'], 'add_plays', lambda *args: 0)
+    directory_calls = []
+    directory = mlb_app.player_directories['local']
+    monkeypatch.setattr(directory, 'add_plays', lambda all_plays: directory_calls.append(len(all_plays)))
+    mlb_app.play_logs.discard('local', 776570)
+    mlb_app.win_probabilities.discard('local', 776570)
+    engine = mlb_app.win_probabilities.get('local', 776570)
+    engine_calls = []
+    ingest = engine.ingest
+    monkeypatch.setattr(engine, 'ingest', lambda all_plays, start=0: engine_calls.append(len(all_plays)) or ingest(all_plays, start))
+
+    client = mlb_app.app.test_client()
+    client.get('/api/game/776570/playByPlay?since=0&pitchSince=0')
+    # The at-bat in progress ends and another starts; only those two are walked again
+    payload = {'allPlays': plays[:40] + [play(40, 4), play(41, 1, complete=False)]}
+    update = client.get('/api/game/776570/playByPlay?since=40&pitchSince=1').get_json()
+    assert directory_calls == [41, 2]
+    assert engine_calls == [41, 2]
+    assert [p['about']['atBatIndex'] for p in update['allPlays']] == [40, 41]
+    assert len(engine) == 41
+    mlb_app.play_logs.discard('local', 776570)
+    mlb_app.win_probabilities.discard('local', 776570)
+
+
+def test_real_plays_replace_a_stand_in_once_upstream_recovers(monkeypatch):
+    real = [play(0, 3), play(1, 2, complete=False)]
+    failing = [True]
+
+    def fake_get(url, **kwargs):
+        if '/playByPlay' in url:
+            if failing[0]:
+                failing[0] = False
+                raise requests.ConnectionError('upstream down')
+            return FakeResponse({'allPlays': real})
+        return FakeResponse({})
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    mlb_app.schedule_service.clear()
+    client = mlb_app.app.test_client()
+    # Upstream is down: the recorded game stands in, and isn't kept for this one
+    stand_in = client.get('/api/game/777001/playByPlay?source=live&since=0&pitchSince=0').get_json()
+    assert stand_in['totalPlays'] > len(real)
+    recovered = client.get('/api/game/777001/playByPlay?source=live&since=0&pitchSince=0').get_json()
+    assert recovered['totalPlays'] == len(real)
+    assert [p['about']['atBatIndex'] for p in recovered['allPlays']] == [0, 1]
+    mlb_app.play_logs.discard('live', 777001)
+    mlb_app.win_probabilities.discard('live', 777001)
@@ -0,0 +1,48 @@
+import app as mlb_app
+from player_directory import PlayerDirectory, normalize_name
+
+
+def test_prefix_search_and_incremental_updates():
+    directory = PlayerDirectory()
+    roster = {'roster': [
+        {'person': {'id': 1, 'fullName': 'José Ramírez'}, 'jerseyNumber': '11',
+         'position': {'code': '5', 'abbreviation': '3B'}},
+        {'person': {'id': 2, 'fullName': 'Ramón Laureano'}, 'jerseyNumber': '22',
+         'position': {'code': '9', 'abbreviation': 'RF'}},
+        {'person': {'id': 3, 'fullName': 'Jose Altuve'}, 'jerseyNumber': '27',
+         'position': {'code': '4', 'abbreviation': '2B'}},
+    ]}
+    assert directory.add_roster({'id': 114, 'name': 'Cleveland Guardians'}, roster) == 3
+    assert directory.add_roster({'id': 114, 'name': 'Cleveland Guardians'}, roster) == 0
+
+    # Accents and case don't matter, and last names match too
+    assert [person['id'] for person in directory.search('jos')] == [3, 1]
+    assert [person['id'] for person in directory.search('RAM')] == [1, 2]
+    assert directory.get(1)['primaryPosition']['abbreviation'] == '3B'
+    assert directory.get(1)['currentTeam']['name'] == 'Cleveland Guardians'
+
+    # A play adds the handedness without losing the roster details
+    directory.add_plays([{'matchup': {'batter': {'id': 1, 'fullName': 'José Ramírez'},
+                                      'batSide': {'code': 'S'},
+                                      'pitcher': {'id': 4, 'fullName': 'Tarik Skubal'},
+                                      'pitchHand': {'code': 'L'}}}])
+    assert directory.get(1)['batSide']['code'] == 'S' and directory.get(1)['primaryNumber'] == '11'
+    assert [person['id'] for person in directory.search('skub')] == [4]
+
+    # A changed name moves the person in the name index
+    directory.add({'id': 4, 'fullName': 'Tarik Skubal Jr.'})
+    directory.add({'id': 2, 'fullName': 'Ramon Laureano Jr.', 'lastName': 'Laureano Jr.'})
+    assert [person['id'] for person in directory.search('ramon laur')] == [2]
+    assert directory.search('laureano jr') == [directory.get(2)]
+    assert normalize_name('  Ronald Acuña-Jr. ') == 'ronald acuna jr'
+
+
+def test_player_routes():
+    client = mlb_app.app.test_client()
+    boxscore = mlb_app.get_data('/api/v1/game/776570/boxscore', 'local')
+    person = next(iter(boxscore['teams']['home']['players'].values()))['person']
+
+    result = client.get(f"/api/players/search?prefix={person['fullName'][:4]}").get_json()
+    assert person['id'] in [found['id'] for found in result['people']]
+    assert client.get(f"/api/players/{person['id']}").get_json()['fullName'] == person['fullName']
+    assert client.get('/api/players/1').status_code == 404
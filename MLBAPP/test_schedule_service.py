@@ -0,0 +1,76 @@
+import datetime
+
+import app as mlb_app
+from fake_upstream import FakeResponse
+from schedule_service import ScheduleService, TODAY_TTL, day_range
+
+TODAY = datetime.datetime(2025, 8, 27, 15, 0)
+
+
+def game(game_pk, state, detailed=None):
+    return {'gamePk': game_pk, 'status': {'abstractGameState': state, 'detailedState': detailed or state}}
+
+
+def make_service(tmp_path, clock):
+    requests = []
+
+    def fetch(url, params=None, **kwargs):
+        requests.append(params)
+        dates = []
+        for date in day_range(params['startDate'], params['endDate']):
+            if date == '2025-08-25':
+                continue  # an off day: missing from the answer
+            number = int(date[-2:])
+            games = [game(number * 10, 'Final', 'Postponed'), game(number * 10 + 1, 'Final')]
+            if date == '2025-08-27':
+                games = [game(number * 10, 'Live', 'In Progress'), game(number * 10 + 1, 'Preview')]
+            dates.append({'date': date, 'games': games})
+        return FakeResponse({'dates': dates})
+
+    service = ScheduleService(str(tmp_path / 'schedule.sqlite3'), fetch=fetch, clock=clock)
+    return service, requests
+
+
+def test_range_is_one_request_and_past_days_stay(tmp_path):
+    now = [TODAY.timestamp()]
+    service, requests = make_service(tmp_path, lambda: now[0])
+    recent = service.recent_games(14)
+    assert len(requests) == 1
+    assert (requests[0]['startDate'], requests[0]['endDate']) == ('2025-08-14', '2025-08-27')
+    assert recent[0] == ('2025-08-27', game(270, 'Live', 'In Progress'))
+    assert service.games('2025-08-25') == []
+
+    # Once today has gone stale, only today (the one day that isn't settled) is asked for again
+    now[0] += TODAY_TTL + 1
+    service.recent_games(14)
+    assert len(requests) == 2
+    assert (requests[1]['startDate'], requests[1]['endDate']) == ('2025-08-27', '2025-08-27')
+    service.games('2025-08-20')
+    assert len(requests) == 2
+
+
+def test_most_recent_final_game(tmp_path):
+    service, requests = make_service(tmp_path, lambda: TODAY.timestamp())
+    date, found = service.most_recent_final_game(days_back=7)
+    # Today's games aren't final, and a postponed game isn't a played one
+    assert (date, found['gamePk']) == ('2025-08-26', 261)
+    assert len(requests) == 1
+
+
+def test_app_finds_a_month_of_finished_games_with_one_request(monkeypatch):
+    requests = []
+
+    def fake_get(url, **kwargs):
+        requests.append(url)
+        return FakeResponse({'dates': [{'date': '2025-08-26', 'games': [game(261, 'Final'), game(262, 'Live')]}]})
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.schedule_service.clear()
+    dates = day_range('2025-07-28', '2025-08-27')
+    found = list(mlb_app.finished_games(dates, 'live'))
+    assert [(game_pk, date) for game_pk, date, _ in found] == [(261, '2025-08-26')]
+    assert len(requests) == 1 and 'startDate=2025-07-28' in requests[0] and 'endDate=2025-08-27' in requests[0]
+    # The days are cached now, so asking again costs nothing
+    list(mlb_app.finished_games(dates[:-1], 'live'))
+    assert len(requests) == 1
+    mlb_app.schedule_service.clear()
@@ -0,0 +1,80 @@
+import copy
+import datetime
+import threading
+import time
+
+import app as mlb_app
+import deadline
+from scoreboard import ScoreboardState, game_summary, long_poll
+from synthetic import generate_season, synthetic_teams
+
+
+def slate():
+    return generate_season(synthetic_teams(8), start_date=datetime.date(2025, 8, 27), days=1)
+
+
+def test_only_changed_games_are_returned():
+    schedule = slate()
+    board = ScoreboardState()
+    assert board.update(schedule) == 4
+    version = board.version
+    assert board.update(schedule) == 0
+
+    changed = copy.deepcopy(schedule)
+    game = changed['dates'][0]['games'][2]
+    game['teams']['home']['score'] = (game['teams']['home'].get('score') or 0) + 1
+    assert board.update(changed) == 1
+
+    delta = board.since(version, board.epoch)
+    assert not delta['full']
+    assert [g['gamePk'] for g in delta['games']] == [game['gamePk']]
+    assert board.since(version, 'other-board')['full']
+
+    # Unscored games have no score, as in the schedule, rather than a null one
+    assert 'score' not in game_summary({'gamePk': 1, 'teams': {'away': {'team': {'id': 2}}}})['teams']['away']
+
+
+def test_long_poll_wakes_on_the_next_change():
+    schedule = slate()
+    board = ScoreboardState()
+    board.update(schedule)
+    version = board.version
+
+    changed = copy.deepcopy(schedule)
+    changed['dates'][0]['games'][0]['status'] = {'abstractGameState': 'Final', 'detailedState': 'Final'}
+    timer = threading.Timer(0.2, board.update, args=(changed,))
+    timer.start()
+    started = time.monotonic()
+    result = long_poll(board, version, lambda: None, wait=5, interval=5, epoch=board.epoch)
+    assert time.monotonic() - started < 2
+    assert len(result['games']) == 1
+
+
+def test_scoreboard_route_returns_nothing_when_unchanged():
+    client = mlb_app.app.test_client()
+    first = client.get('/api/scoreboard?date=2025-08-27').get_json()
+    assert first['full'] and len(first['games']) == 15
+    again = client.get(f"/api/scoreboard?date=2025-08-27&sinceVersion={first['version']}&epoch={first['epoch']}").get_json()
+    assert again['games'] == [] and not again['full']
+
+
+def test_long_poll_refreshes_outlast_the_route_budget(monkeypatch):
+    schedule = slate()
+    changed = copy.deepcopy(schedule)
+    changed['dates'][0]['games'][0]['teams']['home']['score'] = 9
+    budgets = []
+
+    def load_schedule(source, date):
+        budgets.append(deadline.remaining())
+        return changed if len(budgets) >= 4 else schedule
+
+    monkeypatch.setattr(mlb_app, 'load_schedule', load_schedule)
+    monkeypatch.setattr(mlb_app, 'LIVE_CACHE_TTL', 0.1)
+    monkeypatch.setitem(mlb_app.ROUTE_BUDGETS, 'scoreboard', 0.1)
+    client = mlb_app.app.test_client()
+    first = client.get('/api/scoreboard?date=2031-04-01').get_json()
+    result = client.get(f"/api/scoreboard?date=2031-04-01&sinceVersion={first['version']}"
+                        f"&epoch={first['epoch']}&wait=5").get_json()
+    # The change came after the route's budget had run out, and every refresh still had time to fetch
+    assert [game['teams']['home']['score'] for game in result['games']] == [9]
+    assert all(left > 0 for left in budgets)
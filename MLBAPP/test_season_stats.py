@@ -0,0 +1,92 @@
+import datetime
+
+import app as mlb_app
+from season_stats import SeasonStatsStore
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+
+
+def ingest_season(store, days=6):
+    schedule = generate_season(synthetic_teams(4), start_date=datetime.date(2025, 4, 1), days=days)
+    boxscores = []
+    for game, documents in iter_season_documents(schedule):
+        store.ingest_boxscore(game['gamePk'], documents['boxscore'], game['gameDate'])
+        boxscores.append(documents['boxscore'])
+    store.flush()
+    return boxscores
+
+
+def player_lines(boxscores, player, group):
+    lines = []
+    for boxscore in boxscores:
+        for side in ('away', 'home'):
+            entry = boxscore['teams'][side]['players'].get(f'ID{player}')
+            if entry and entry['stats'].get(group):
+                lines.append(entry['stats'][group])
+    return lines
+
+
+def test_totals_match_the_boxscores_and_survive_a_restart(tmp_path):
+    store = SeasonStatsStore(str(tmp_path))
+    boxscores = ingest_season(store)
+    batter = boxscores[0]['teams']['away']['battingOrder'][0]
+    lines = player_lines(boxscores, batter, 'batting')
+
+    totals = store.batting_totals(batter)
+    assert totals['games'] == len(lines)
+    assert totals['hits'] == sum(line['hits'] for line in lines)
+    assert totals['avg'] == round(totals['hits'] / totals['atBats'], 3)
+
+    # A new process reads the same tables back and doesn't ingest a game twice
+    restarted = SeasonStatsStore(str(tmp_path))
+    assert restarted.batting_totals(batter) == totals
+    ingest_season(restarted)
+    assert restarted.batting_totals(batter) == totals
+
+
+def test_workers_sharing_a_store_keep_each_game_once(tmp_path):
+    first = SeasonStatsStore(str(tmp_path))
+    second = SeasonStatsStore(str(tmp_path))
+    boxscores = ingest_season(first)
+    batter = boxscores[0]['teams']['away']['battingOrder'][0]
+    totals = first.batting_totals(batter)
+    # The second worker ingested the same games before seeing the first's segment
+    ingest_season(second)
+    assert second.batting_totals(batter) == totals
+    assert len(second.batting) == len(first.batting)
+
+
+def test_games_that_fail_to_load_are_not_stored(tmp_path, monkeypatch):
+    store = SeasonStatsStore(str(tmp_path))
+    monkeypatch.setitem(mlb_app.season_stats, 'live', store)
+    monkeypatch.setattr(mlb_app, 'fetch_live_data', lambda *args, **kwargs: None)
+    game = {'gamePk': 123456, 'teams': {'away': {'team': {'id': 1}}, 'home': {'team': {'id': 2}}}}
+    monkeypatch.setattr(mlb_app, 'finished_games', lambda dates, source=None: [(123456, '2025-08-27', game)])
+    mlb_app.load_season_stats(['2025-08-27'], 'live')
+    assert 123456 not in store.games and len(store.batting) == 0
+
+
+def test_rolling_windows_and_pitching_rates(tmp_path):
+    store = SeasonStatsStore(str(tmp_path))
+    boxscores = ingest_season(store)
+    pitcher = boxscores[0]['teams']['home']['pitchers'][0]
+    lines = player_lines(boxscores, pitcher, 'pitching')
+
+    totals = store.pitching_totals(pitcher)
+    outs = sum(line['outs'] for line in lines)
+    assert totals['era'] == round(27 * sum(line['earnedRuns'] for line in lines) / outs, 2)
+    assert totals['whip'] == round(3 * sum(line['hits'] + line['baseOnBalls'] for line in lines) / outs, 2)
+
+    rolling = store.pitching_rolling(pitcher, window=2)['games']
+    assert len(rolling) == len(lines)
+    last_two = lines[-2:]
+    assert rolling[-1]['era'] == round(27 * sum(l['earnedRuns'] for l in last_two) / sum(l['outs'] for l in last_two), 2)
+    assert store.pitching_totals(pitcher, last_games=2)['era'] == rolling[-1]['era']
+
+
+def test_stats_routes():
+    client = mlb_app.app.test_client()
+    batting = client.get('/api/stats/players/695578/batting').get_json()
+    assert batting['games'] > 0 and batting['avg'] is not None
+    leaders = client.get('/api/stats/leaders/pitching?stat=era&minOuts=9').get_json()
+    assert leaders['leaders']
+    assert client.get('/api/stats/leaders/batting?stat=nope').status_code == 400
@@ -0,0 +1,73 @@
+import multiprocessing
+import time
+
+from cache import SharedStore, TieredCache
+
+
+def publish(path, value):
+    TieredCache(SharedStore(path)).set('live', '/api/v1/schedule', value)
+
+
+def test_refresh_in_one_worker_is_visible_to_the_others(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    reader = TieredCache(SharedStore(path))
+    assert reader.get('live', '/api/v1/schedule') is None
+
+    # A separate worker process fetches and publishes the payload
+    worker = multiprocessing.get_context('spawn').Process(target=publish, args=(path, {'dates': [1]}))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    assert reader.get('live', '/api/v1/schedule') == {'dates': [1]}
+    assert reader.stats()['live']['shared_loads'] == 1
+
+    # Served from L1 until someone publishes a newer copy
+    assert reader.get('live', '/api/v1/schedule') == {'dates': [1]}
+    assert reader.stats()['live']['shared_loads'] == 1
+
+    publish(path, {'dates': [1, 2]})
+    assert reader.get('live', '/api/v1/schedule') == {'dates': [1, 2]}
+    assert reader.stats()['live']['shared_loads'] == 2
+
+
+def test_only_one_worker_refreshes_at_a_time(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    first = TieredCache(SharedStore(path))
+    second = TieredCache(SharedStore(path))
+
+    assert first.acquire_refresh('live', '/api/v1/schedule')
+    assert not second.acquire_refresh('live', '/api/v1/schedule')
+
+    first.set('live', '/api/v1/schedule', {'dates': []})
+    first.release_refresh('live', '/api/v1/schedule')
+    assert second.wait_for('live', '/api/v1/schedule', timeout=1) == {'dates': []}
+    assert second.acquire_refresh('live', '/api/v1/schedule')
+
+
+def test_local_data_stays_per_process(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    first = TieredCache(SharedStore(path))
+    second = TieredCache(SharedStore(path))
+    first.set('local', '/api/v1/teams', {'teams': []})
+    assert second.get('local', '/api/v1/teams') is None
+
+
+def test_old_and_surplus_entries_are_purged(tmp_path):
+    store = SharedStore(str(tmp_path / 'shared.sqlite3'), max_age=60, max_entries=3)
+    now = time.time()
+    # As if it had just purged, so the saves below don't
+    store._purged_at = now
+    store.save('live', '/api/v1.1/game/1/feed/live?timecode=20250827_170000', {'n': 0}, now - 120)
+    for n in range(1, 5):
+        store.save('live', f'/api/v1.1/game/1/feed/live?timecode=20250827_17{n:02d}00', {'n': n}, now - n)
+    # One entry is past max_age, and of the four left the oldest is one too many
+    assert store.purge(now) == 2
+    assert store.load('live', '/api/v1.1/game/1/feed/live?timecode=20250827_170000') is None
+    assert store.load('live', '/api/v1.1/game/1/feed/live?timecode=20250827_170400') is None
+    assert store.load('live', '/api/v1.1/game/1/feed/live?timecode=20250827_170100')[0] == {'n': 1}
+
+    # Saves purge on their own, at most once per interval
+    store._purged_at = 0.0
+    store.save('live', '/api/v1/schedule', {'dates': []}, now)
+    assert store.load('live', '/api/v1.1/game/1/feed/live?timecode=20250827_170300') is None
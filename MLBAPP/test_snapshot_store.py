@@ -0,0 +1,33 @@
+import app as mlb_app
+from snapshot_store import SnapshotStore
+
+
+def test_shared_subtrees_are_stored_once(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshots.sqlite3'), threshold=64)
+    team = {'id': 147, 'name': 'New York Yankees', 'venue': {'id': 3313, 'name': 'Yankee Stadium'}}
+    plays = [{'atBatIndex': n, 'description': f'Play number {n} of the game, described at length'}
+             for n in range(20)]
+    first = {'teams': {'home': team}, 'allPlays': plays[:10], 'tiny': [1, 2]}
+    second = {'teams': {'home': team}, 'allPlays': plays, 'tiny': [1, 2], 'note': {'$x': None}}
+
+    store.put('game/1', first)
+    objects = store.stats()['objects']
+    store.put('game/2', second)
+    # Only the ten new plays and the new containers above them were added
+    assert store.stats()['objects'] - objects < 15
+    assert store.get('game/1') == first and store.get('game/2') == second
+    assert store.get('game/3') is None
+    assert store.names('game/') == ['game/1', 'game/2']
+
+    # Small documents are stored whole, and the same document twice costs nothing
+    store.put('small', {'a': 1})
+    before = store.stats()
+    store.put('game/2 again', second)
+    after = store.stats()
+    assert store.get('small') == {'a': 1}
+    assert after['storedBytes'] == before['storedBytes'] and after['dedupeRatio'] > before['dedupeRatio']
+
+
+def test_capture_stats_route():
+    stats = mlb_app.app.test_client().get('/api/captures/stats').get_json()
+    assert {'snapshots', 'objects', 'logicalBytes', 'storedBytes', 'dedupeRatio', 'diskBytes'} <= set(stats)
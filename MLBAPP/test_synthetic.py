@@ -0,0 +1,70 @@
+import json
+
+import app as mlb_app
+from synthetic import SyntheticGameEngine, build_game, generate_season, iter_season_documents
+
+
+def local_schedule_games():
+    schedule = mlb_app.parse_mlb_data_section('/api/v1/schedule')
+    return [game for date in schedule['dates'] for game in date['games']]
+
+
+def test_documents_match_the_schedule_entry():
+    for game in local_schedule_games():
+        documents = build_game(game)
+        away = game['teams']['away']['score']
+        home = game['teams']['home']['score']
+
+        linescore = documents['linescore']['teams']
+        assert (linescore['away']['runs'], linescore['home']['runs']) == (away, home)
+
+        batting = {side: documents['boxscore']['teams'][side]['teamStats']['batting'] for side in ('away', 'home')}
+        assert (batting['away']['runs'], batting['home']['runs']) == (away, home)
+
+        last_play = documents['playByPlay']['allPlays'][-1]['result']
+        assert (last_play['awayScore'], last_play['homeScore']) == (away, home)
+        assert documents['feed']['gameData']['teams']['home']['id'] == game['teams']['home']['team']['id']
+
+
+def test_documents_are_deterministic_and_memoized():
+    game = local_schedule_games()[0]
+    assert json.dumps(build_game(game)) == json.dumps(build_game(game))
+
+    engine = SyntheticGameEngine()
+    first = engine.documents(game['gamePk'], game)
+    assert engine.documents(game['gamePk'], game) is first
+    assert len(engine) == 1
+
+    # A score change on the schedule produces a new, consistent game
+    changed = json.loads(json.dumps(game))
+    changed['teams']['home']['score'] += 1
+    assert engine.documents(game['gamePk'], changed)['linescore']['teams']['home']['runs'] == \
+        changed['teams']['home']['score']
+
+
+def test_memo_keeps_only_the_most_recently_used_games():
+    engine = SyntheticGameEngine(max_games=3)
+    first = engine.documents(777001)
+    for game_pk in (777002, 777003):
+        engine.documents(game_pk)
+    # Using the first game again keeps it; the least recently used one makes room instead
+    assert engine.documents(777001) is first
+    engine.documents(777004)
+    assert len(engine) == 3
+    assert engine.documents(777001) is first
+    assert set(engine._memo) == {777001, 777003, 777004}
+
+
+def test_boxscore_route_is_stable_across_polls():
+    client = mlb_app.app.test_client()
+    first = client.get('/api/game/999001/boxscore').data
+    assert client.get('/api/game/999001/boxscore').data == first
+
+
+def test_generate_season_in_bulk():
+    schedule = generate_season(days=3)
+    assert schedule['totalGames'] == 45
+    games = list(iter_season_documents(schedule))
+    assert len(games) == 45
+    for game, documents in games:
+        assert documents['linescore']['teams']['away']['runs'] == game['teams']['away']['score']
@@ -0,0 +1,48 @@
+import json
+
+import app as mlb_app
+from team_reference import TeamReference
+
+
+def test_refresh_indexes_and_swaps_snapshots():
+    loads = []
+
+    def load():
+        loads.append(1)
+        teams = [
+            {'id': 4104, 'abbreviation': 'NYY', 'name': 'Not The Yankees', 'sport': {'id': 22},
+             'venue': {'id': 401, 'name': 'TBD'}},
+            {'id': 147, 'abbreviation': 'NYY', 'name': 'New York Yankees', 'sport': {'id': 1},
+             'venue': {'id': 3313, 'name': 'Yankee Stadium'}},
+        ]
+        return ({'teams': teams}, [{'id': 3313, 'name': 'Yankee Stadium', 'active': True}],
+                {147: {'roster': [{'person': {'id': 1, 'fullName': 'Aaron Judge'}}]}})
+
+    reference = TeamReference()
+    reference.refresh(load, '2025-05-01')
+    reference.refresh(load, '2025-05-01')
+    assert len(loads) == 1
+
+    # Shared abbreviations go to the MLB club
+    assert reference.team_id('nyy') == 147
+    assert json.loads(reference.team_body(147))['name'] == 'New York Yankees'
+    assert json.loads(reference.venue_body(3313))['active'] is True
+    assert json.loads(reference.venue_body(401))['name'] == 'TBD'
+    assert json.loads(reference.roster_body(147))['roster'][0]['person']['id'] == 1
+
+    # A failed reload keeps the old data, a new day reloads it
+    assert reference.refresh(lambda: (None, [], {}), '2025-05-02').loaded_on == '2025-05-01'
+    reference.refresh(load, '2025-05-02')
+    assert len(loads) == 2 and reference.loaded_on == '2025-05-02'
+
+
+def test_team_routes_match_the_recorded_payload():
+    client = mlb_app.app.test_client()
+    teams_data = mlb_app.get_data('/api/v1/teams', 'local')
+    assert client.get('/api/teams').get_json() == teams_data
+
+    yankees = next(team for team in teams_data['teams'] if team['id'] == 147)
+    assert client.get('/api/team/147').get_json() == yankees
+    assert client.get('/api/team/NYY').get_json() == yankees
+    assert client.get(f"/api/venue/{yankees['venue']['id']}").get_json() == yankees['venue']
+    assert client.get('/api/team/1').status_code == 404
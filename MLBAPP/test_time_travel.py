@@ -0,0 +1,129 @@
+import copy
+import datetime
+import json
+
+import requests
+
+import app as mlb_app
+from synthetic import generate_season, iter_season_documents, synthetic_teams
+from time_travel import TimeTravelStore, json_diff, apply_patch
+
+
+def game_history():
+    """(gamePk, [(timecode, feed)]) replaying a synthetic game one play at a time"""
+    schedule = generate_season(synthetic_teams(2), start_date=datetime.date(2025, 5, 1), days=1)
+    game, documents = next(iter_season_documents(schedule))
+    feed = documents['feed']
+    plays = feed['liveData']['plays']['allPlays']
+    snapshots = []
+    for count in range(1, len(plays) + 1):
+        snapshot = copy.deepcopy(feed)
+        snapshot['liveData']['plays']['allPlays'] = snapshot['liveData']['plays']['allPlays'][:count]
+        snapshot['liveData']['plays']['currentPlay'] = snapshot['liveData']['plays']['allPlays'][-1]
+        timecode = f"20250501_{19 + count // 60:02d}{count % 60:02d}00"
+        snapshot['metaData']['timeStamp'] = timecode
+        snapshots.append((timecode, snapshot))
+    return game['gamePk'], snapshots
+
+
+def test_diff_and_patch_round_trip():
+    old = {'a': [1, 2, {'b': 'x/y~'}], 'gone': True, 'n': 1}
+    new = {'a': [1, {'c': None}], 'added': {'d': [3]}, 'n': True}
+    assert apply_patch(copy.deepcopy(old), json_diff(old, new)) == new
+    assert json_diff(new, new) == []
+
+
+def test_any_moment_is_rebuilt_exactly(tmp_path):
+    game_pk, snapshots = game_history()
+    store = TimeTravelStore(str(tmp_path))
+    for timecode, snapshot in snapshots:
+        store.record(game_pk, snapshot)
+    # Older and repeated timecodes are ignored
+    assert store.record(game_pk, snapshots[3][1]) is None
+
+    def at(store, timecode):
+        found, body = store.body(game_pk, timecode)
+        return found, json.loads(body)
+
+    # Scrubbing forward, backward, and between recorded timecodes
+    for index in (0, 1, 24, 25, 26, 60, 3, len(snapshots) - 1):
+        timecode, snapshot = snapshots[index]
+        assert at(store, timecode) == (timecode, snapshot)
+    assert at(store, snapshots[10][0][:-2] + '30')[0] == snapshots[10][0]
+    assert store.body(game_pk, '20250501_000000') is None
+
+    # Much smaller on disk than the snapshots themselves, and the same after a restart
+    full = sum(len(json.dumps(snapshot, separators=(',', ':'))) for _, snapshot in snapshots)
+    assert store.stats()['diskBytes'] * 5 < full
+    restarted = TimeTravelStore(str(tmp_path))
+    assert restarted.timecodes(game_pk) == [timecode for timecode, _ in snapshots]
+    assert at(restarted, snapshots[40][0]) == (snapshots[40][0], snapshots[40][1])
+
+
+def test_readers_follow_a_writer_in_another_process(tmp_path):
+    game_pk, snapshots = game_history()
+    writer = TimeTravelStore(str(tmp_path))
+    reader = TimeTravelStore(str(tmp_path))
+    for _, snapshot in snapshots[:3]:
+        writer.record(game_pk, snapshot)
+    assert reader.timecodes(game_pk) == [timecode for timecode, _ in snapshots[:3]]
+    # Past the next checkpoint too
+    for _, snapshot in snapshots[3:30]:
+        writer.record(game_pk, snapshot)
+    assert reader.timecodes(game_pk) == [timecode for timecode, _ in snapshots[:30]]
+    assert json.loads(reader.body(game_pk, snapshots[29][0])[1]) == snapshots[29][1]
+
+
+def test_timecode_route():
+    game_pk, snapshots = game_history()
+    for _, snapshot in snapshots[:5]:
+        mlb_app.time_travel['local'].record(game_pk, snapshot)
+    client = mlb_app.app.test_client()
+    response = client.get(f'/api/game/{game_pk}/feed/live?timecode={snapshots[2][0]}')
+    assert response.headers['X-Snapshot-Timecode'] == snapshots[2][0]
+    assert response.get_json() == snapshots[2][1]
+    assert client.get(f'/api/game/{game_pk}/feed/live/timestamps').get_json() == [t for t, _ in snapshots[:5]]
+    assert client.get(f'/api/game/{game_pk}/feed/live?timecode=soon').status_code == 400
+    assert client.get(f'/api/game/{game_pk}/feed/live?timecode=20200101_000000').status_code == 404
+
+
+def test_uncaptured_timecode_with_upstream_down_is_not_found(monkeypatch):
+    def fake_get(url, **kwargs):
+        raise requests.ConnectionError('upstream down')
+
+    monkeypatch.setattr(mlb_app.requests, 'get', fake_get)
+    mlb_app.data_cache.clear()
+    mlb_app.http_cache.clear()
+    response = mlb_app.app.test_client().get('/api/game/777001/feed/live?source=live&timecode=20250827_170000')
+    # Not a stand-in feed that ignores the timecode
+    assert response.status_code == 404
+
+
+def test_readers_take_in_only_what_was_appended(tmp_path):
+    game_pk, snapshots = game_history()
+    writer = TimeTravelStore(str(tmp_path))
+    reader = TimeTravelStore(str(tmp_path))
+    for _, snapshot in snapshots[:30]:
+        writer.record(game_pk, snapshot)
+    assert len(reader.timecodes(game_pk)) == 30
+    history = reader._history(game_pk)
+
+    reads = []
+    read = history._read
+    history._read = lambda checkpoint: reads.append(read(checkpoint)) or reads[-1]
+    writer.record(game_pk, snapshots[30][1])
+    assert reader.timecodes(game_pk)[-1] == snapshots[30][0]
+    # Only the new patch line is decoded, and the reader is the same one
+    assert [len(added) for added in reads] == [1]
+    assert reader._history(game_pk) is history
+    assert json.loads(reader.body(game_pk, snapshots[30][0])[1]) == snapshots[30][1]
+
+    # A line still being written waits until it's whole
+    path = history._patches_path(history.checkpoints[-1])
+    line = json.dumps({'timecode': '20990101_000000', 'patch': []}) + '\n'
+    with open(path, 'a') as f:
+        f.write(line[:10])
+    assert reader.timecodes(game_pk)[-1] == snapshots[30][0]
+    with open(path, 'a') as f:
+        f.write(line[10:])
+    assert reader.timecodes(game_pk)[-1] == '20990101_000000'
@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+import app as mlb_app
+import upstream_scheduler
+from upstream_scheduler import QueueTimeout, UpstreamScheduler, priority_for
+
+
+def test_priority_classes():
+    assert priority_for('https://statsapi.mlb.com/api/v1.1/game/1/feed/live') == 'live'
+    assert priority_for('https://statsapi.mlb.com/api/v1/game/1/boxscore') == 'live'
+    assert priority_for('https://statsapi.mlb.com/api/v1/schedule?sportId=1') == 'schedule'
+    assert priority_for('https://statsapi.mlb.com/api/v1/teams/147/roster') == 'reference'
+    assert priority_for('https://statsapi.mlb.com/api/v1/game/1/content') == 'backfill'
+    with upstream_scheduler.priority('backfill'):
+        assert priority_for('https://statsapi.mlb.com/api/v1/game/1/boxscore') == 'backfill'
+
+
+def test_rate_limit_and_live_requests_jump_the_queue():
+    sent = []
+    scheduler = UpstreamScheduler(rate=50, burst=1, fetch=lambda url, **kwargs: sent.append(url))
+    started = time.monotonic()
+    burst = [threading.Thread(target=scheduler.get, args=(f'https://x/api/v1/teams/{n}',)) for n in range(20)]
+    for thread in burst:
+        thread.start()
+    time.sleep(0.05)
+    scheduler.get('https://x/api/v1.1/game/1/feed/live')
+    live_done = time.monotonic() - started
+    for thread in burst:
+        thread.join()
+
+    # 21 requests at 50/s with one token to start: no faster than 0.4 s in all
+    assert time.monotonic() - started >= 0.38
+    # The live refresh went ahead of the queued reference burst
+    assert sent.index('https://x/api/v1.1/game/1/feed/live') < 8
+    assert live_done < 0.2
+    stats = scheduler.stats()['classes']
+    assert stats['reference']['granted'] == 20 and stats['live']['granted'] == 1
+    assert stats['live']['waitMsMax'] < stats['reference']['waitMsMax']
+
+
+def test_queue_timeout_is_a_requests_timeout():
+    scheduler = UpstreamScheduler(rate=1, burst=1, max_wait=0.05, fetch=lambda url, **kwargs: url)
+    scheduler.get('https://x/api/v1/teams')
+    with pytest.raises(QueueTimeout):
+        scheduler.get('https://x/api/v1/teams')
+    assert scheduler.stats()['classes']['reference']['timedOut'] == 1
+    assert scheduler.stats()['classes']['reference']['queued'] == 0
+
+
+def test_stats_route():
+    data = mlb_app.app.test_client().get('/api/upstream/stats').get_json()
+    assert set(data['classes']) == {'live', 'schedule', 'reference', 'backfill'}
@@ -0,0 +1,44 @@
+import app as mlb_app
+from bench_snapshot_store import recorded_sections
+from win_probability import RUN_EXPECTANCY, WinProbabilityEngine, state_win_probability
+
+PLAYS = dict(recorded_sections())['/api/v1/game/776570/playByPlay']['allPlays']
+
+
+def test_tables_behave_like_baseball():
+    expectancy = RUN_EXPECTANCY[:24].reshape(3, 8)
+    # More outs always mean fewer runs to come; a loaded base with no one out is the best state
+    assert (expectancy[0] > expectancy[1]).all() and (expectancy[1] > expectancy[2]).all()
+    assert 0.4 < expectancy[0, 0] < 0.6 and expectancy.argmax() == 7
+    assert state_win_probability(1, True, 0, [], 0, 0)['home'] == 50.0
+    assert state_win_probability(9, False, 2, [], 4, 3)['home'] < 10
+    assert state_win_probability(9, False, 2, ['1B', '2B', '3B'], 4, 3)['home'] > \
+        state_win_probability(9, False, 2, [], 4, 3)['home']
+    # A bottom-of-the-ninth lead is a win
+    assert state_win_probability(9, False, 1, ['2B'], 3, 4)['home'] == 100.0
+
+
+def test_incremental_matches_backfill():
+    backfilled = WinProbabilityEngine()
+    assert backfilled.ingest(PLAYS) == len(PLAYS)
+    live = WinProbabilityEngine()
+    for count in range(1, len(PLAYS) + 1):
+        live.ingest(PLAYS[:count])
+    assert live.values == backfilled.values
+    assert [value['atBatIndex'] for value in live.values] == list(range(len(PLAYS)))
+
+    # The Yankees won 11-2, so the home side ends at 100%, and every run shows up in RE24
+    assert backfilled.values[-1]['homeTeamWinProbability'] == 100.0
+    home_run = next(value for play, value in zip(PLAYS, backfilled.values) if play['result']['eventType'] == 'home_run'
+                    and not play['runners'][1:])
+    assert home_run['re24'] == 1.0
+    assert live.since(75) == backfilled.values[75:]
+
+
+def test_play_by_play_carries_values():
+    client = mlb_app.app.test_client()
+    data = client.get('/api/game/776570/playByPlay').get_json()
+    assert len(data['winProbability']) == len(data['allPlays'])
+    polled = client.get('/api/game/776570/playByPlay?since=70').get_json()
+    assert polled['winProbability'] == data['winProbability'][70:]
+    assert set(client.get('/api/game/776570/atbat').get_json()['winProbability']) == {'home', 'away'}
@@ -0,0 +1,340 @@
+import bisect
+import copy
+import json
+import os
+import threading
+
+from snapshot_store import SnapshotStore
+
+# Where captured game histories live, one directory per data source
+TIME_TRAVEL_PATH = os.environ.get(
+    'MLB_TIME_TRAVEL', os.path.join(os.path.expanduser('~'), '.cache', 'mlbapp', 'time_travel'))
+
+# A full snapshot is written every this many recorded timecodes; the rest are patches
+CHECKPOINT_EVERY = 25
+
+
+def _pointer(path, key):
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def json_diff(old, new, path=''):
+    """JSON patch (RFC 6902 add/remove/replace operations) that turns old into new"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{'op': 'remove', 'path': _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({'op': 'add', 'path': _pointer(path, key), 'value': value})
+            else:
+                ops.extend(json_diff(old[key], value, _pointer(path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        ops = []
+        for index in range(common):
+            ops.extend(json_diff(old[index], new[index], _pointer(path, index)))
+        ops.extend({'op': 'add', 'path': _pointer(path, index), 'value': new[index]}
+                   for index in range(common, len(new)))
+        ops.extend({'op': 'remove', 'path': _pointer(path, index)}
+                   for index in reversed(range(common, len(old))))
+        return ops
+    if type(old) is not type(new) or old != new:
+        return [{'op': 'replace', 'path': path, 'value': new}]
+    return []
+
+
+def apply_patch(document, ops):
+    """Apply a JSON patch in place; returns the document, which is new if the root was replaced
+
+    Values are copied in, so later patches never reach back into the recorded operations.
+    """
+    for op in ops:
+        if op['path'] == '':
+            document = copy.deepcopy(op['value'])
+            continue
+        parts = [part.replace('~1', '/').replace('~0', '~') for part in op['path'].split('/')[1:]]
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        key = parts[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == '-' else int(key)
+            if op['op'] == 'add':
+                parent.insert(index, copy.deepcopy(op['value']))
+            elif op['op'] == 'remove':
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op['value'])
+        elif op['op'] == 'remove':
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(op['value'])
+    return document
+
+
+class GameHistory:
+    """Recorded timecodes of one game, with its checkpoints and the patches that follow each
+
+    A history is opened either to record (writer) or to read. A reader stays open and refresh()
+    takes in what the writer has appended since it last looked, reading only the new lines.
+    """
+
+    def __init__(self, path, snapshots, game_pk, writer=False):
+        self.path = path
+        self.snapshots = snapshots
+        self.game_pk = game_pk
+        self.writer = writer
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        # Taken before anything is read, so a write that lands during the load shows up as a change
+        self._signature = self._files()
+        self._patches = {}
+        # Bytes of each patch file read so far, up to the last whole line
+        self._offsets = {}
+        # Open patch file of the latest checkpoint, and whether it has writes not fsynced yet
+        self._file = None
+        self._unsynced = False
+        self.checkpoints = [name.split('/', 1)[1] for name in snapshots.names(f'{game_pk}/')]
+        # The files are the only record of what was captured, so nothing can disagree with them
+        self.timecodes = sorted(self.checkpoints + [timecode for checkpoint in self.checkpoints
+                                                    for timecode, _ in self.patches(checkpoint)])
+        # The last materialized snapshot, so scrubbing forward only applies the new patches
+        self._cursor = None
+        self._last = None
+
+    def _patches_path(self, checkpoint):
+        return os.path.join(self.path, f'patches-{checkpoint}.jsonl')
+
+    def _files(self):
+        return sorted((entry.name, entry.stat().st_size) for entry in os.scandir(self.path))
+
+    def refresh(self):
+        """Take in the checkpoints and patches written since this history last looked; a reader's
+        work here follows what was added, not the length of the game"""
+        signature = self._files()
+        if signature == self._signature:
+            return
+        grown = set(signature) - set(self._signature)
+        self._signature = signature
+        known = set(self.checkpoints)
+        for name, _ in sorted(grown):
+            if not (name.startswith('patches-') and name.endswith('.jsonl')):
+                continue
+            checkpoint = name[len('patches-'):-len('.jsonl')]
+            if checkpoint not in known:
+                # A new checkpoint's snapshot is stored before its patch file is created
+                self.checkpoints.append(checkpoint)
+                self.timecodes.append(checkpoint)
+            self.timecodes.extend(timecode for timecode, _ in self._read(checkpoint))
+
+    def _read(self, checkpoint):
+        """Decode the patch lines added to a checkpoint's file since the last read; returns them"""
+        patches = self._patches.setdefault(checkpoint, [])
+        added = []
+        path = self._patches_path(checkpoint)
+        if not os.path.exists(path):
+            return added
+        offset = self._offsets.get(checkpoint, 0)
+        with open(path, 'rb+' if self.writer else 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('unterminated line')
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line: an interrupted write, or one still under way if this is a
+                    # reader, which picks it up once it's whole. The writer cuts it so its appends
+                    # stay readable.
+                    if self.writer:
+                        f.truncate(offset)
+                    break
+                added.append((entry['timecode'], entry['patch']))
+                offset += len(line)
+        self._offsets[checkpoint] = offset
+        patches.extend(added)
+        return added
+
+    def patches(self, checkpoint):
+        """[(timecode, ops)] recorded after a checkpoint, in order"""
+        if checkpoint not in self._patches:
+            self._read(checkpoint)
+        return self._patches[checkpoint]
+
+    def _load_checkpoint(self, checkpoint):
+        return self.snapshots.get(f'{self.game_pk}/{checkpoint}')
+
+    def snapshot(self, timecode):
+        """(timecode, document) for the latest recorded timecode at or before timecode, or None
+
+        The document belongs to the history; callers serialize it and must not change it.
+        """
+        position = bisect.bisect_right(self.timecodes, timecode)
+        if position == 0:
+            return None
+        target = self.timecodes[position - 1]
+        checkpoint = self.checkpoints[bisect.bisect_right(self.checkpoints, target) - 1]
+
+        cursor = self._cursor
+        if cursor and cursor[0] == checkpoint and cursor[1] <= target:
+            _, at, document = cursor
+        else:
+            at, document = checkpoint, self._load_checkpoint(checkpoint)
+        for patch_timecode, ops in self.patches(checkpoint):
+            if patch_timecode <= at:
+                continue
+            if patch_timecode > target:
+                break
+            document = apply_patch(document, ops)
+        self._cursor = (checkpoint, target, document)
+        return target, document
+
+    def _append(self, line):
+        """Append a line to the latest checkpoint's patches; it reaches the OS now, the disk at sync()"""
+        if self._file is None:
+            self._file = open(self._patches_path(self.checkpoints[-1]), 'a', encoding='utf-8')
+        self._file.write(line + '\n')
+        self._file.flush()
+        self._unsynced = True
+
+    def sync(self, close=False):
+        """fsync the patches written since the last sync"""
+        if self._file is None:
+            return
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+        if close:
+            self._file.close()
+            self._file = None
+
+    def record(self, timecode, document):
+        """Add a snapshot after the last one; returns what was written: 'checkpoint', 'patch' or None"""
+        if self.timecodes and timecode <= self.timecodes[-1]:
+            return None
+        if self._last is None and self.timecodes:
+            self._last = json.loads(json.dumps(self.snapshot(self.timecodes[-1])[1]))
+        since_checkpoint = 0
+        if self.checkpoints:
+            since_checkpoint = len(self.timecodes) - bisect.bisect_left(self.timecodes, self.checkpoints[-1])
+        if not self.checkpoints or since_checkpoint >= CHECKPOINT_EVERY:
+            self.snapshots.put(f'{self.game_pk}/{timecode}', document)
+            self.checkpoints.append(timecode)
+            self.sync(close=True)
+            # The checkpoint's (empty) patch file tells readers there's a new checkpoint
+            self._file = open(self._patches_path(timecode), 'a', encoding='utf-8')
+            written = 'checkpoint'
+        else:
+            ops = json_diff(self._last, document)
+            if not ops:
+                return None
+            patches = self.patches(self.checkpoints[-1])
+            line = json.dumps({'timecode': timecode, 'patch': ops}, separators=(',', ':'))
+            self._append(line)
+            # Kept as decoded from the line, so nothing is shared with the caller's document
+            patches.append((timecode, json.loads(line)['patch']))
+            written = 'patch'
+        self.timecodes.append(timecode)
+        # Keep a private copy to diff the next snapshot against
+        self._last = json.loads(json.dumps(document))
+        return written
+
+
+class TimeTravelStore:
+    """Captured feed/live snapshots of games, for serving any past moment of a game
+
+    Every CHECKPOINT_EVERY recorded timecodes a game gets a full checkpoint, kept in a
+    SnapshotStore so the subtrees checkpoints share (across games too) are stored once; snapshots in
+    between are stored as JSON patches against the one before. Reading a moment loads the nearest
+    checkpoint at or before it and applies the patches up to it, and reading forward from the last
+    moment read only applies the patches in between.
+
+    Patches are written through to the OS as they're recorded; sync() makes them durable, so a
+    writer recording many games fsyncs once per batch rather than once per patch.
+
+    Each game has one writer: the process recording it keeps what it last recorded in memory to
+    diff the next moment against, so two processes recording the same game would write patches
+    against different bases. The capture daemon is that writer for the app's live archive, and
+    the app only reads it. A game read here stays open and reads just the lines appended since
+    its last read, so readers follow a writer in another process at the cost of what's new.
+    Games are locked one at a time, so recording or reading one game never waits on another.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.snapshots = SnapshotStore(os.path.join(path, 'checkpoints.sqlite3'))
+        self._lock = threading.Lock()
+        self._games = {}
+
+    def _history(self, game_pk, create=False):
+        """The game's history, opened to record if create is set, or None if nothing was recorded"""
+        with self._lock:
+            history = self._games.get(game_pk)
+            if history is not None and not history.writer and create:
+                history = None
+            if history is None:
+                path = os.path.join(self.path, str(game_pk))
+                if not create and not os.path.isdir(path):
+                    return None
+                history = self._games[game_pk] = GameHistory(path, self.snapshots, game_pk, writer=create)
+                return history
+        if not history.writer:
+            with history.lock:
+                history.refresh()
+        return history
+
+    def record(self, game_pk, document, timecode=None):
+        """Record a feed/live document at its metaData.timeStamp, if it's newer than the last one"""
+        timecode = timecode or document.get('metaData', {}).get('timeStamp')
+        if not timecode:
+            return None
+        history = self._history(game_pk, create=True)
+        with history.lock:
+            return history.record(timecode, document)
+
+    def _histories(self):
+        with self._lock:
+            return list(self._games.values())
+
+    def sync(self):
+        """fsync every game's unsynced patches at once, so a capture pays one flush per batch"""
+        for history in self._histories():
+            with history.lock:
+                history.sync()
+
+    def close(self):
+        for history in self._histories():
+            with history.lock:
+                history.sync(close=True)
+
+    def timecodes(self, game_pk):
+        history = self._history(game_pk)
+        if history is None:
+            return []
+        with history.lock:
+            return list(history.timecodes)
+
+    def body(self, game_pk, timecode):
+        """(timecode, serialized document) for a game at a moment, or None if nothing was recorded by then"""
+        history = self._history(game_pk)
+        if history is None:
+            return None
+        with history.lock:
+            found = history.snapshot(timecode)
+            if found is None:
+                return None
+            return found[0], json.dumps(found[1], separators=(',', ':')).encode('utf-8')
+
+    def stats(self):
+        """Checkpoint dedupe stats, with the bytes of patches and of everything on disk"""
+        stats = self.snapshots.stats()
+        stats['patchBytes'] = 0
+        stats['diskBytes'] = 0
+        for entry in os.scandir(self.path):
+            if entry.is_dir():
+                stats['patchBytes'] += sum(item.stat().st_size for item in os.scandir(entry.path))
+            elif entry.name.startswith('checkpoints.sqlite3'):
+                stats['diskBytes'] += entry.stat().st_size
+        stats['diskBytes'] += stats['patchBytes']
+        return stats
@@ -0,0 +1,281 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+import deadline
+
+# Requests per second sent upstream on average, and how many may go back to back after a lull
+UPSTREAM_RATE = float(os.environ.get('MLB_UPSTREAM_RATE', 10))
+UPSTREAM_BURST = int(os.environ.get('MLB_UPSTREAM_BURST', 20))
+
+# Seconds a request waits for its turn before giving up with a timeout
+MAX_QUEUE_WAIT = 30
+
+# Priority classes, most urgent first
+PRIORITIES = ('live', 'schedule', 'reference', 'backfill')
+
+# Class of a request by path when the caller doesn't set one. First match wins.
+PRIORITY_RULES = [
+    (re.compile(r'/game/\d+/\w+/contextMetricsAverages'), 'backfill'),
+    (re.compile(r'/game/\d+/content'), 'backfill'),
+    (re.compile(r'/feed/live'), 'live'),
+    (re.compile(r'/api/v1/game/\d+/'), 'live'),
+    (re.compile(r'/api/v1/schedule'), 'schedule'),
+]
+DEFAULT_PRIORITY = 'reference'
+
+# Recent waits kept per class for the percentiles in stats()
+WAIT_SAMPLES = 512
+
+# A GET that hasn't answered by this quantile of its endpoint's recent latencies is sent again,
+# once there are enough samples, and never sooner than the minimum delay
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.05
+LATENCY_SAMPLES = 200
+
+# Threads running upstream attempts for hedged requests
+HEDGE_WORKERS = 32
+
+_priority = contextvars.ContextVar('upstream_priority', default=None)
+
+
+class QueueTimeout(requests.Timeout):
+    """Raised when a request waited longer than max_wait for its turn"""
+
+
+def endpoint_key(url):
+    """The path of a URL with its ids taken out, so latencies are kept per kind of request"""
+    return re.sub(r'\d+', '{n}', urlsplit(url).path)
+
+
+def _close(response):
+    close = getattr(response, 'close', None)
+    if close is not None:
+        close()
+
+
+def priority_for(url):
+    """Priority class of a request: the caller's, if set with priority(), or by path"""
+    chosen = _priority.get()
+    if chosen is not None:
+        return chosen
+    path = urlsplit(url).path
+    for pattern, name in PRIORITY_RULES:
+        if pattern.search(path):
+            return name
+    return DEFAULT_PRIORITY
+
+
+@contextlib.contextmanager
+def priority(name):
+    """Send upstream requests made inside the block with the given priority class"""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class UpstreamScheduler:
+    """Every upstream request takes a token from one shared bucket, most urgent request first
+
+    Tokens refill at rate per second up to burst. Waiting requests are served by priority class,
+    then in arrival order, so a burst of reference or backfill fetches queues behind live game
+    state instead of in front of it. Requests run on their caller's thread once they're let through.
+
+    With hedge on, a GET still unanswered at its endpoint's p95 latency is sent a second time if
+    a token is free right away, and the first answer wins. A losing attempt that's already sent
+    can't be called back: it runs on in the background until its headers arrive (its timeout at
+    the most), and then its connection is closed without reading the body. Waits and timeouts are
+    cut to what's left of the caller's deadline budget (see deadline.py).
+    """
+
+    def __init__(self, rate=UPSTREAM_RATE, burst=UPSTREAM_BURST, max_wait=MAX_QUEUE_WAIT, fetch=None, hedge=True):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.hedge = hedge
+        self._fetch = fetch
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._waits = {name: deque(maxlen=WAIT_SAMPLES) for name in PRIORITIES}
+        self._counts = {name: {'granted': 0, 'timedOut': 0, 'waitSeconds': 0.0, 'maxWaitSeconds': 0.0}
+                        for name in PRIORITIES}
+        self._latencies = {}
+        self._hedges = {'sent': 0, 'won': 0}
+        self._pool = None
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, name):
+        """Wait for this request's turn and a token; returns the seconds waited"""
+        ticket = (PRIORITIES.index(name), next(self._sequence))
+        started = time.monotonic()
+        max_wait = deadline.remaining(self.max_wait)
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._queue[0] == ticket and self._tokens >= 1:
+                    heapq.heappop(self._queue)
+                    self._tokens -= 1
+                    break
+                remaining = max_wait - (now - started)
+                if remaining <= 0:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._counts[name]['timedOut'] += 1
+                    self._cond.notify_all()
+                    raise QueueTimeout(f"No upstream slot for a {name} request within {max_wait:.2f} s")
+                # The head of the queue sleeps until its token is due; the rest until it's served
+                if self._queue[0] == ticket:
+                    self._cond.wait(min(remaining, (1 - self._tokens) / self.rate))
+                else:
+                    self._cond.wait(remaining)
+            # Whoever is next may be able to go right away
+            self._cond.notify_all()
+            waited = time.monotonic() - started
+            counts = self._counts[name]
+            counts['granted'] += 1
+            counts['waitSeconds'] += waited
+            counts['maxWaitSeconds'] = max(counts['maxWaitSeconds'], waited)
+            self._waits[name].append(waited)
+        return waited
+
+    def try_acquire(self, name):
+        """Take a token only if one is free and nobody is waiting for it; returns whether it did"""
+        with self._cond:
+            self._refill(time.monotonic())
+            if self._queue or self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._counts[name]['granted'] += 1
+            return True
+
+    def get(self, url, **kwargs):
+        """requests.get, once the request's priority class gets a turn"""
+        name = priority_for(url)
+        self.acquire(name)
+        if 'timeout' in kwargs:
+            kwargs['timeout'] = deadline.remaining(kwargs['timeout'])
+        key = endpoint_key(url)
+        delay = self.hedge_delay(key) if self.hedge else None
+        started = time.monotonic()
+        if delay is None:
+            response = (self._fetch or requests.get)(url, **kwargs)
+        else:
+            response = self._hedged(url, name, delay, kwargs)
+        self._record(key, time.monotonic() - started)
+        return response
+
+    def hedge_delay(self, key):
+        """Seconds to wait before hedging a request for an endpoint, or None if it's too early to tell"""
+        with self._cond:
+            samples = self._latencies.get(key)
+            if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        return max(ordered[int(HEDGE_QUANTILE * (len(ordered) - 1))], HEDGE_MIN_DELAY)
+
+    def _record(self, key, seconds):
+        with self._cond:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=LATENCY_SAMPLES)
+            samples.append(seconds)
+
+    def _hedged(self, url, name, delay, kwargs):
+        """The first good answer of the request and, if it's slow, a second copy of it"""
+        if self._pool is None:
+            with self._cond:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix='upstream-hedge')
+        dropped = threading.Event()
+
+        def attempt():
+            if dropped.is_set():
+                return None
+            # Headers first, so a loser's connection is closed once they arrive, body unread
+            response = (self._fetch or requests.get)(url, stream=True, **kwargs)
+            if dropped.is_set():
+                _close(response)
+                return None
+            response.content
+            return response
+
+        attempts = [self._pool.submit(attempt)]
+        pending = set(attempts)
+        done, pending = wait(pending, timeout=delay)
+        if not done and self.try_acquire(name):
+            attempts.append(self._pool.submit(attempt))
+            pending.add(attempts[1])
+            with self._cond:
+                self._hedges['sent'] += 1
+        winner, error = None, None
+        while winner is None:
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = future.exception()
+            if winner is not None or not pending:
+                break
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+        dropped.set()
+        # Only an attempt still waiting for a pool thread is cancelled here; one that's running
+        # sees dropped when its headers turn up
+        for future in pending:
+            future.cancel()
+        if winner is None:
+            raise error or requests.Timeout(f"No answer from {url} within the deadline")
+        if winner is not attempts[0]:
+            with self._cond:
+                self._hedges['won'] += 1
+        return winner.result()
+
+    def stats(self):
+        """Queue depth now and wait times so far, per priority class"""
+        with self._cond:
+            self._refill(time.monotonic())
+            queued = {name: 0 for name in PRIORITIES}
+            for rank, _ in self._queue:
+                queued[PRIORITIES[rank]] += 1
+            classes = {}
+            for name in PRIORITIES:
+                counts = self._counts[name]
+                waits = sorted(self._waits[name])
+                classes[name] = {
+                    'queued': queued[name],
+                    'granted': counts['granted'],
+                    'timedOut': counts['timedOut'],
+                    'waitMsAvg': round(1000 * counts['waitSeconds'] / counts['granted'], 2) if counts['granted'] else None,
+                    'waitMsP95': round(1000 * waits[int(0.95 * (len(waits) - 1))], 2) if waits else None,
+                    'waitMsMax': round(1000 * counts['maxWaitSeconds'], 2),
+                }
+            return {'rate': self.rate, 'burst': self.burst, 'tokens': round(self._tokens, 2), 'classes': classes,
+                    'hedges': dict(self._hedges)}
+
+
+# One scheduler per process, shared by the app and the scripts' HTTP caches
+upstream = UpstreamScheduler()
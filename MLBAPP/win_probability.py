@@ -0,0 +1,303 @@
+import threading
+
+import numpy as np
+
+# Plate appearance outcomes of an average hitter, used to build the run and win tables
+OUTCOMES = {
+    'out': 0.682,
+    'walk': 0.094,
+    'single': 0.142,
+    'double': 0.045,
+    'triple': 0.004,
+    'home_run': 0.033,
+}
+
+# Share of outs with fewer than two out that move every runner up a base (groundouts to the
+# right side, sacrifice flies), and of outs with a runner on first that are double plays
+PRODUCTIVE_OUTS = 0.18
+DOUBLE_PLAYS = 0.11
+
+# Runs tracked for the rest of a half inning, and the score difference tracked either way
+MAX_RUNS = 20
+MAX_LEAD = 30
+
+# Innings tabulated; later extra innings use the last one
+MAX_INNING = 20
+
+# From the 10th inning on, each half starts with a runner on second
+EXTRA_INNING_RUNNER = 10
+
+BASE_BITS = {'1B': 1, '2B': 2, '3B': 4}
+
+
+def _advance(bases, outs, outcome, productive, double_play):
+    """(bases, outs, runs) after an outcome from a base-out state; bases are bits 1B=1, 2B=2, 3B=4"""
+    first, second, third = bases & 1, bases >> 1 & 1, bases >> 2 & 1
+    if outcome == 'out':
+        if double_play and first and outs < 2:
+            # The runner on first and the batter; the others hold
+            outs += 2
+            if outs >= 3:
+                return 0, 3, 0
+            return bases & 6, outs, 0
+        outs += 1
+        if outs >= 3:
+            return 0, 3, 0
+        if productive:
+            return (second << 2) | (first << 1), outs, third
+        return bases, outs, 0
+    if outcome == 'walk':
+        runs = first & second & third
+        if first and second:
+            bases = 7
+        elif first:
+            bases = bases | 3
+        else:
+            bases = bases | 1
+        return bases, outs, runs
+    if outcome == 'single':
+        return 1 | (first << 1), outs, second + third
+    if outcome == 'double':
+        return 2 | (first << 2), outs, second + third
+    if outcome == 'triple':
+        return 4, outs, first + second + third
+    return 0, outs, first + second + third + 1
+
+
+def _transitions():
+    """(probability, state, next state, runs) for every move between the 24 base-out states"""
+    moves = []
+    for outs in range(3):
+        for bases in range(8):
+            state = outs * 8 + bases
+            for outcome, probability in OUTCOMES.items():
+                if outcome != 'out':
+                    moves.append((probability, state, _advance(bases, outs, outcome, False, False)))
+                    continue
+                double_play = DOUBLE_PLAYS if bases & 1 and outs < 2 else 0.0
+                productive = PRODUCTIVE_OUTS if outs < 2 and bases else 0.0
+                moves.append((probability * double_play, state, _advance(bases, outs, outcome, False, True)))
+                moves.append((probability * productive, state, _advance(bases, outs, outcome, True, False)))
+                moves.append((probability * (1 - double_play - productive), state,
+                              _advance(bases, outs, outcome, False, False)))
+    return [(p, state, (n_outs * 8 + n_bases) if n_outs < 3 else 24, runs)
+            for p, state, (n_bases, n_outs, runs) in moves if p > 0]
+
+
+def _runs_distribution():
+    """runs[state, k]: chance the batting team scores exactly k more runs in the half inning"""
+    total = sum(OUTCOMES.values())
+    runs = np.zeros((25, MAX_RUNS + 1))
+    runs[24, 0] = 1.0
+    moves = _transitions()
+    for _ in range(200):
+        updated = np.zeros_like(runs)
+        updated[24, 0] = 1.0
+        for probability, state, following, scored in moves:
+            shifted = np.roll(runs[following], scored)
+            shifted[:scored] = 0.0
+            shifted[-1] += runs[following][MAX_RUNS + 1 - scored:].sum() if scored else 0.0
+            updated[state] += probability / total * shifted
+        if np.abs(updated - runs).max() < 1e-12:
+            break
+        runs = updated
+    return runs[:24]
+
+
+def _win_table(runs):
+    """wins[inning, half, state, lead]: the home team's chance to win from a base-out state
+
+    half is 0 for the top, 1 for the bottom; state 24 is the end of the half inning; lead is the
+    home score minus the away score, offset by MAX_LEAD.
+    """
+    leads = np.arange(-MAX_LEAD, MAX_LEAD + 1)
+    scored = np.arange(MAX_RUNS + 1)
+    wins = np.zeros((MAX_INNING + 2, 2, 25, leads.size))
+    start = np.full(leads.size, 0.5)
+    for inning in range(MAX_INNING, 0, -1):
+        first_state = 2 if inning >= EXTRA_INNING_RUNNER else 0
+        # End of the bottom half: a lead from the 9th on ends the game, anything else plays on
+        end = start.copy()
+        if inning >= 9:
+            end = np.where(leads > 0, 1.0, np.where(leads < 0, 0.0, start))
+        wins[inning, 1, 24] = end
+        # Every run in the bottom half raises the lead; a walk-off ends it at once through end
+        index = np.clip(leads[:, None] + scored[None, :], -MAX_LEAD, MAX_LEAD) + MAX_LEAD
+        wins[inning, 1, :24] = runs @ end[index].T
+        bottom_start = wins[inning, 1, first_state]
+        # End of the top half: from the 9th on a home lead means the bottom isn't played
+        end = bottom_start.copy()
+        if inning >= 9:
+            end = np.where(leads > 0, 1.0, bottom_start)
+        wins[inning, 0, 24] = end
+        index = np.clip(leads[:, None] - scored[None, :], -MAX_LEAD, MAX_LEAD) + MAX_LEAD
+        wins[inning, 0, :24] = runs @ end[index].T
+        start = wins[inning, 0, first_state]
+    return wins
+
+
+RUNS = _runs_distribution()
+# Run expectancy of the 24 base-out states (outs * 8 + bases), 0 once the half inning is over
+RUN_EXPECTANCY = np.append(RUNS @ np.arange(MAX_RUNS + 1), 0.0)
+WIN_TABLE = _win_table(RUNS)
+
+
+# Plays that arrive together in at least this number are looked up as arrays
+BATCH_SIZE = 8
+
+# The same tables as nested lists, for single lookups without numpy's per-call overhead
+WIN_ROWS = WIN_TABLE.tolist()
+RUN_ROWS = RUN_EXPECTANCY.tolist()
+
+
+def lookup(inning, top, outs, bases, lead):
+    """Home win probability and run expectancy for arrays describing game states"""
+    inning = np.clip(inning, 1, MAX_INNING)
+    half = np.where(top, 0, 1)
+    state = np.where(np.asarray(outs) >= 3, 24, np.asarray(outs) * 8 + np.asarray(bases))
+    lead = np.clip(lead, -MAX_LEAD, MAX_LEAD) + MAX_LEAD
+    return WIN_TABLE[inning, half, state, lead], RUN_EXPECTANCY[state]
+
+
+def lookup_one(inning, top, outs, bases, lead):
+    """lookup for a single game state"""
+    state = 24 if outs >= 3 else outs * 8 + bases
+    lead = min(max(lead, -MAX_LEAD), MAX_LEAD) + MAX_LEAD
+    return WIN_ROWS[min(max(inning, 1), MAX_INNING)][0 if top else 1][state][lead], RUN_ROWS[state]
+
+
+def state_win_probability(inning, top, outs, bases, away_runs, home_runs):
+    """{'home': %, 'away': %} for one game state; bases is a set of '1B'/'2B'/'3B'"""
+    bits = sum(BASE_BITS[base] for base in bases)
+    home, _ = lookup_one(inning or 1, top, outs, bits, home_runs - away_runs)
+    return {'home': round(home * 100, 1), 'away': round(100 - home * 100, 1)}
+
+
+class WinProbabilityEngine:
+    """Win probability and RE24 of every completed play of one game
+
+    The base-out-inning-score state is carried from play to play, so each new play costs one
+    state update and two table lookups. Plays that arrive together (a whole archived game on
+    first request) are looked up in one vectorized pass.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.values = []
+        self._half = None
+        self._bases = {}
+        self._outs = 0
+        self._score = (0, 0)
+
+    def ingest(self, all_plays, start=0):
+        """Add values for the completed plays not seen yet; returns how many were added
+
+        all_plays may be just the game's plays from index start on, when the engine already has
+        values for every play before start.
+        """
+        with self._lock:
+            if start > len(self.values):
+                # Reset by a shorter game in the meantime; the plays before start come next time
+                return 0
+            if not start and len(all_plays) < len(self.values):
+                self._reset()
+            states = []
+            for play in all_plays[len(self.values) - start:]:
+                if not play.get('about', {}).get('isComplete', True):
+                    break
+                states.append(self._state(play))
+            if states:
+                self.values.extend(play_values(states))
+            return len(states)
+
+    def _state(self, play):
+        """(atBatIndex, inning, top, outs, bases, lead) before and after the play, plus runs scored"""
+        about = play['about']
+        inning = about.get('inning', 1)
+        top = about.get('isTopInning', about.get('halfInning') == 'top')
+        if self._half != (inning, top):
+            self._half = (inning, top)
+            self._outs = 0
+            self._bases = {}
+            if inning >= EXTRA_INNING_RUNNER:
+                # The automatic runner shows up in the plays' runners; count it from the start
+                for runner in play.get('runners', []):
+                    if runner.get('movement', {}).get('originBase') == '2B':
+                        self._bases[runner.get('details', {}).get('runner', {}).get('id')] = '2B'
+                        break
+        before_bases = sum(BASE_BITS[base] for base in self._bases.values())
+        before_outs, (away, home) = self._outs, self._score
+
+        bases = dict(self._bases)
+        for runner in play.get('runners', []):
+            movement = runner.get('movement', {})
+            person = runner.get('details', {}).get('runner', {}).get('id')
+            bases[person] = None if movement.get('isOut') else movement.get('end')
+        self._bases = {person: base for person, base in bases.items() if base in BASE_BITS}
+        result = play.get('result', {})
+        self._score = (result.get('awayScore', away), result.get('homeScore', home))
+        self._outs = play.get('count', {}).get('outs', before_outs)
+        runs = (self._score[0] - away) if top else (self._score[1] - home)
+        after_bases = 0 if self._outs >= 3 else sum(BASE_BITS[base] for base in self._bases.values())
+        return (about.get('atBatIndex'), inning, int(top),
+                before_outs, before_bases, home - away,
+                min(self._outs, 3), after_bases, self._score[1] - self._score[0], runs)
+
+    def since(self, at_bat_index=0):
+        with self._lock:
+            return self.values[max(at_bat_index, 0):]
+
+    def __len__(self):
+        with self._lock:
+            return len(self.values)
+
+
+def _value(at_bat_index, wins_before, wins_after, runs_before, runs_after, scored):
+    home = round(wins_after * 100, 1)
+    return {
+        'atBatIndex': at_bat_index,
+        'homeTeamWinProbability': home,
+        'awayTeamWinProbability': round(100 - home, 1),
+        # + 0.0 turns the -0.0 that rounding leaves for tiny drops into 0.0
+        'homeTeamWinProbabilityAdded': round((wins_after - wins_before) * 100, 1) + 0.0,
+        're24': round(runs_after - runs_before + scored, 3) + 0.0,
+    }
+
+
+def play_values(states):
+    """Per-play values for states as built by WinProbabilityEngine, looked up in one pass"""
+    if len(states) < BATCH_SIZE:
+        values = []
+        for at_bat, inning, top, outs, bases, lead, after_outs, after_bases, after_lead, scored in states:
+            wins_before, runs_before = lookup_one(inning, top, outs, bases, lead)
+            wins_after, runs_after = lookup_one(inning, top, after_outs, after_bases, after_lead)
+            values.append(_value(at_bat, wins_before, wins_after, runs_before, runs_after, scored))
+        return values
+    states = np.array(states, dtype=np.int64)
+    inning, top = states[:, 1], states[:, 2].astype(bool)
+    wins_before, runs_before = lookup(inning, top, states[:, 3], states[:, 4], states[:, 5])
+    wins_after, runs_after = lookup(inning, top, states[:, 6], states[:, 7], states[:, 8])
+    return [_value(*row) for row in zip(states[:, 0].tolist(), wins_before.tolist(), wins_after.tolist(),
+                                        runs_before.tolist(), runs_after.tolist(), states[:, 9].tolist())]
+
+
+class WinProbabilityEngines:
+    """Win probability engines for every game being followed, keyed by data source and gamePk"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines = {}
+
+    def get(self, source, game_pk):
+        with self._lock:
+            engine = self._engines.get((source, game_pk))
+            if engine is None:
+                engine = self._engines[(source, game_pk)] = WinProbabilityEngine()
+            return engine
+
+    def discard(self, source, game_pk):
+        with self._lock:
+            self._engines.pop((source, game_pk), None)
@@ -1,77 +1,179 @@
-import requests
+import os
+import sys
 import json
-from datetime import datetime, timedelta
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MLBAPP'))
+from http_cache import HttpCache
+from schedule_service import ScheduleService
+
+# Content links and metrics persist on disk between runs, and so do schedule days
+http_cache = HttpCache()
+schedule_service = ScheduleService()
+
+BASE_URL = os.environ.get("MLB_API_BASE_URL", "https://statsapi.mlb.com")
 
 # Search back up to 14 days for a valid gamePk and guid
 max_days_back = 14
-gamePk = None
-guid = None
 
-for days_back in range(max_days_back):
-    date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
-    schedule_url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date}"
-    schedule_resp = requests.get(schedule_url)
+# Schedule, content and metrics requests in flight at once (the upstream scheduler paces them further)
+max_workers = 8
+
+# Seconds the content of a game from an earlier day is reused without asking again; its recap is settled
+PAST_CONTENT_FRESHNESS = 7 * 24 * 3600
+
+# Content link -> editorial, so a link seen twice in a run (a suspended game on two dates) is fetched once
+_editorials = {}
+_editorials_lock = threading.Lock()
+
+
+def content_editorial(link, date):
+    """The editorial of a game's content link"""
+    with _editorials_lock:
+        if link in _editorials:
+            return _editorials[link]
+    content_url = f"{BASE_URL}{link}"
+    past = date < datetime.now().strftime("%Y-%m-%d")
     try:
-        schedule_data = schedule_resp.json()
+        content_resp = http_cache.get(content_url, freshness=PAST_CONTENT_FRESHNESS if past else None)
+        editorial = content_resp.json().get("editorial", {})
+    except Exception as e:
+        print(f"    Failed to fetch content from {content_url}: {e}")
+        return {}
+    with _editorials_lock:
+        _editorials[link] = editorial
+    return editorial
+
+
+def game_guid(game, date):
+    """The recap guid of a scheduled game, fetching its content link if the schedule didn't include it"""
+    gamePk_candidate = str(game.get("gamePk"))
+    content = game.get("content", {})
+    # If 'editorial' is not in content, try fetching from the content link
+    if "editorial" not in content and "link" in content:
+        editorial = content_editorial(content["link"], date)
+    else:
+        editorial = content.get("editorial", {})
+    recap = editorial.get("recap", {})
+    mlb = recap.get("mlb", {})
+    guid_candidate = mlb.get("guid")
+    if not content:
+        problem = "no 'content' key in game"
+    elif not editorial:
+        problem = f"no 'editorial' key in content (even after fetch); content keys: {list(content.keys())}"
+    elif not recap:
+        problem = "no 'recap' key in editorial"
+    elif not mlb:
+        problem = "no 'mlb' key in recap"
+    else:
+        problem = None
+    print(f"  {date} gamePk: {gamePk_candidate}, guid: {guid_candidate}" + (f" ({problem})" if problem else ""))
+    if guid_candidate and guid_candidate != "NO_GUID_FOUND":
+        return guid_candidate
+    return None
+
+
+def find_guids(days_back=max_days_back, workers=max_workers, find_all=False, today=None):
+    """[(date, gamePk, guid)] of games with a recap guid, most recent date first
+
+    The days' schedules come from one date-range query; content links are then fetched workers at
+    a time, most recent game first. Unless find_all is set only the most recent match is wanted,
+    so once a game matches, the work queued after it (later in its day's schedule, or on earlier
+    days) is dropped and the search only waits for what could still find a more recent one.
+    """
+    recent = schedule_service.recent_games(days_back, today=today)
+    for date in sorted({date for date, _ in recent}, reverse=True):
+        print(f"{date}: Found {sum(1 for game_date, _ in recent if game_date == date)} games")
+    # Work in the order it's wanted: (position in recent, date, game)
+    queued = [(position, date, game) for position, (date, game) in enumerate(recent)]
+    found = {}
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        running = {}
+        while queued or running:
+            while queued and len(running) < workers:
+                position, date, game = queued.pop(0)
+                running[pool.submit(check_game, (date, game))] = position
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = running.pop(future)
+                if future.result():
+                    found[position] = future.result()
+            if not find_all and found:
+                best = min(found)
+                # Nothing after the best match can be the answer; what already started finishes unheard
+                queued = [entry for entry in queued if entry[0] < best]
+                for future, position in list(running.items()):
+                    if position > best:
+                        future.cancel()
+                        del running[future]
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    matches = [found[position] for position in sorted(found)]
+    return matches if find_all else matches[:1]
+
+
+def check_game(date_and_game):
+    """(date, gamePk, guid) for a scheduled game with a recap guid, or None"""
+    date, game = date_and_game
+    guid = game_guid(game, date)
+    return (date, str(game.get("gamePk")), guid) if guid else None
+
+
+def context_metrics(gamePk, guid):
+    """contextMetricsAverages of one game's play"""
+    url = f"{BASE_URL}/api/v1/game/{gamePk}/{guid}/contextMetricsAverages"
+    response = http_cache.get(url, headers={"Accept-Encoding": "gzip"})
+    try:
+        return response.json()
     except Exception:
-        continue
-    games = schedule_data.get("dates", [{}])[0].get("games", [])
-    print(f"{date}: Found {len(games)} games")
-    for game in games:
-        gamePk_candidate = str(game.get("gamePk"))
-        content = game.get("content", {})
-        guid_candidate = None
-        # If 'editorial' is not in content, try fetching from the content link
-        if "editorial" not in content and "link" in content:
-            content_url = f"https://statsapi.mlb.com{content['link']}"
-            try:
-                content_resp = requests.get(content_url)
-                content_data = content_resp.json()
-                editorial = content_data.get("editorial", {})
-            except Exception as e:
-                print(f"    Failed to fetch content from {content_url}: {e}")
-                editorial = {}
-        else:
-            editorial = content.get("editorial", {})
-        recap = editorial.get("recap", {})
-        mlb = recap.get("mlb", {})
-        guid_candidate = mlb.get("guid")
-        print(f"  gamePk: {gamePk_candidate}, guid: {guid_candidate}")
-        if not content:
-            print("    No 'content' key in game")
-        elif not editorial:
-            print("    No 'editorial' key in content (even after fetch)")
-            print("    content keys:", list(content.keys()))
-            print("    content value:", json.dumps(content, indent=2)[:1000], "... (truncated)")
-        elif not recap:
-            print("    No 'recap' key in editorial")
-        elif not mlb:
-            print("    No 'mlb' key in recap")
-        if guid_candidate and guid_candidate != "NO_GUID_FOUND":
-            gamePk = gamePk_candidate
-            guid = guid_candidate
-            print(f"Found valid gamePk and guid on {date}")
-            break
-    if gamePk and guid:
-        break
-
-if not gamePk or not guid:
-    print(f"No valid gamePk and guid found in the last {max_days_back} days.")
-    exit(1)
-
-print(f"Using gamePk: {gamePk}, guid: {guid}")
-
-url = f"https://statsapi.mlb.com/api/v1/game/{gamePk}/{guid}/contextMetricsAverages"
-headers = {"Accept-Encoding": "gzip"}
-
-response = requests.get(url, headers=headers)
-
-try:
-    data = response.json()
-    with open("context_metrics_output.json", "w") as f:
+        print(f"Failed to decode JSON for {gamePk}. Status code: {response.status_code}")
+        return None
+
+
+def batch_context_metrics(matches, workers=max_workers):
+    """{gamePk: contextMetricsAverages} for many (date, gamePk, guid) at once"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda match: context_metrics(match[1], match[2]), matches)
+        return {match[1]: data for match, data in zip(matches, results) if data is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find a recent game's recap guid and fetch its contextMetricsAverages")
+    parser.add_argument("--days", type=int, default=max_days_back)
+    parser.add_argument("--workers", type=int, default=max_workers)
+    parser.add_argument("--batch", action="store_true",
+                        help="fetch the metrics of every game with a guid in the window, not just the most recent")
+    parser.add_argument("--output", default="context_metrics_output.json")
+    args = parser.parse_args()
+
+    matches = find_guids(args.days, args.workers, find_all=args.batch)
+    if not matches:
+        print(f"No valid gamePk and guid found in the last {args.days} days.")
+        exit(1)
+
+    if args.batch:
+        print(f"Fetching contextMetricsAverages for {len(matches)} games")
+        data = batch_context_metrics(matches, args.workers)
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"Output for {len(data)} games saved to {args.output}")
+        return
+
+    date, gamePk, guid = matches[0]
+    print(f"Found valid gamePk and guid on {date}")
+    print(f"Using gamePk: {gamePk}, guid: {guid}")
+    data = context_metrics(gamePk, guid)
+    if data is None:
+        exit(1)
+    with open(args.output, "w") as f:
         json.dump(data, f, indent=2)
-    print("Output saved to context_metrics_output.json")
+    print(f"Output saved to {args.output}")
     print("Top-level fields in response:", list(data.keys()))
-except Exception as e:
-    print("Failed to decode JSON. Status code:", response.status_code)
-    print("Response text:", response.text)
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
+import os
+import sys
 import requests
-from datetime import datetime, timedelta
 import json
 
-BASE_URL = "https://statsapi.mlb.com"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MLBAPP'))
+from schedule_service import ScheduleService
+
+# The last week's schedule comes from one date-range request, cached per day on disk
+schedule_service = ScheduleService()
+
+BASE_URL = os.environ.get("MLB_API_BASE_URL", "https://statsapi.mlb.com")
 OUTPUT_FILE = "c:\\hw\\mlbfeed\\MLBStuff\\mlbtests_output.txt"
 
 def write_output(endpoint, data):
@@ -13,35 +20,29 @@ def write_output(endpoint, data):
 
 def get_most_recent_game_info():
     # Look back up to 7 days for a completed game
-    for days_ago in range(0, 7):
-        date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-        resp = requests.get(f"{BASE_URL}/api/v1/schedule?sportId=1&date={date}")
-        if resp.status_code != 200:
-            continue
-        data = resp.json()
-        for date_info in data.get("dates", []):
-            for game in date_info.get("games", []):
-                if game.get("status", {}).get("detailedState") == "Final":
-                    gamePk = game.get("gamePk")
-                    teams = game.get("teams", {})
-                    home_team = teams.get("home", {}).get("team", {})
-                    away_team = teams.get("away", {}).get("team", {})
-                    venue = game.get("venue", {})
-                    # Try to get a guid from the live feed if possible
-                    guid = None
-                    pbp_resp = requests.get(f"{BASE_URL}/api/v1/game/{gamePk}/playByPlay")
-                    if pbp_resp.status_code == 200:
-                        pbp_data = pbp_resp.json()
-                        all_plays = pbp_data.get("allPlays", [])
-                        if all_plays:
-                            guid = all_plays[0].get("playEndTime") or all_plays[0].get("playId")
-                    return {
-                        "gamePk": gamePk,
-                        "home_teamId": home_team.get("id"),
-                        "away_teamId": away_team.get("id"),
-                        "venueId": venue.get("id"),
-                        "guid": guid
-                    }
+    found = schedule_service.most_recent_final_game(days_back=7)
+    if found is not None:
+        _, game = found
+        gamePk = game.get("gamePk")
+        teams = game.get("teams", {})
+        home_team = teams.get("home", {}).get("team", {})
+        away_team = teams.get("away", {}).get("team", {})
+        venue = game.get("venue", {})
+        # Try to get a guid from the live feed if possible
+        guid = None
+        pbp_resp = requests.get(f"{BASE_URL}/api/v1/game/{gamePk}/playByPlay")
+        if pbp_resp.status_code == 200:
+            pbp_data = pbp_resp.json()
+            all_plays = pbp_data.get("allPlays", [])
+            if all_plays:
+                guid = all_plays[0].get("playEndTime") or all_plays[0].get("playId")
+        return {
+            "gamePk": gamePk,
+            "home_teamId": home_team.get("id"),
+            "away_teamId": away_team.get("id"),
+            "venueId": venue.get("id"),
+            "guid": guid
+        }
     raise Exception("No recent completed game found.")
 
 def test_schedule():
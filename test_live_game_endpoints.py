@@ -1,10 +1,11 @@
 
+import os
 import requests
 import json
 import sys
 
-# Set the base URL for the MLB StatsAPI
-BASE_URL = "https://statsapi.mlb.com"
+# Set the base URL for the MLB StatsAPI (MLB_API_BASE_URL points it at a local mock instead)
+BASE_URL = os.environ.get("MLB_API_BASE_URL", "https://statsapi.mlb.com")
 GAME_PK = "776567"
 
 headers = {